@@ -2,14 +2,22 @@
 ContractGuard AI - 기본 Agent 클래스
 모든 Agent의 공통 기능 정의
 """
-from typing import Any, Dict, Optional
-from langchain_openai import AzureChatOpenAI
-from langchain.tools import Tool
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain import hub
+import contextvars
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
 
-from config.settings import azure_config
+from config.settings import azure_config, compact_output_config, deadline_config, micro_batch_config
+from prompts.templates import PromptTemplates
 from rag.retriever import ContractRetriever
+from utils.deadline import DeadlineExceeded, StageBudget, current_stage, stage_scope, time_left
+from utils.llm_clients import get_agent_llm, get_retriever
+from utils.llm_dispatch import LLMDispatcher
+from utils.llm_usage import extract_usage, prompt_cache_stats
+from utils.micro_batch import micro_batcher
+from utils.scheduler import current_workload, llm_scheduler, workload
+from utils.tracing import tracer
 
 
 class BaseAgent:
@@ -19,22 +27,23 @@ class BaseAgent:
         self, 
         model_name: str = None,
         temperature: float = 0.1,
-        retriever: ContractRetriever = None
+        retriever: ContractRetriever = None,
+        llm: Optional[BaseChatModel] = None
     ):
         self.model_name = model_name or azure_config.gpt4o_mini
         self.temperature = temperature
-        self.retriever = retriever or ContractRetriever()
+        self.retriever = retriever or get_retriever()
+        self.name = self.__class__.__name__
+        self.last_usage: Dict[str, int] = {}
         
-        self.llm = AzureChatOpenAI(
-            azure_endpoint=azure_config.endpoint,
-            api_key=azure_config.api_key,
-            api_version=azure_config.api_version,
-            azure_deployment=self.model_name,
-            temperature=self.temperature
-        )
+        # llm을 주입하면 공용 Azure 클라이언트/분산 디스패처 대신 사용 (벤치마크/테스트용)
+        self._llm_injected = llm is not None
+        self.llm = llm or get_agent_llm(self.model_name, self.temperature)
     
     def get_tools(self) -> list:
         """Agent가 사용할 도구 정의 (하위 클래스에서 오버라이드)"""
+        from langchain.tools import Tool
+
         return [
             Tool(
                 name="search_legal_knowledge",
@@ -47,6 +56,178 @@ class BaseAgent:
         """법률 지식 검색 도구"""
         return self.retriever.get_context_for_analysis(query, "general")
     
+    def _get_context(self, query: str, context_type: str = "general") -> str:
+        """RAG 컨텍스트 검색 (노드 예산이 부족하면 잘라서 프롬프트 축소)"""
+        context = self.retriever.get_context_for_analysis(query, context_type)
+        stage = current_stage()
+        if stage is not None and stage.trim_context:
+            return context[:deadline_config.trimmed_context_chars]
+        return context
+    
+    def _select_llm(self) -> Any:
+        """노드 예산이 부족하면 대체(소형) 배포 사용 (주입된 LLM은 그대로 사용)"""
+        stage = current_stage()
+        if stage is None or not stage.small_model or self._llm_injected:
+            return self.llm
+        if deadline_config.fallback_deployment == self.model_name:
+            return self.llm
+        return get_agent_llm(deadline_config.fallback_deployment, self.temperature)
+    
+    @staticmethod
+    def _compact_enabled() -> bool:
+        """간결 출력 모드 사용 여부"""
+        return compact_output_config.enabled
+    
+    def _output_kwargs(self, template: str, item_count: int = 0) -> Dict[str, Any]:
+        """간결 출력 모드의 호출 옵션 (조항 수에 비례한 Agent별 max_tokens, 네이티브 구조화 출력)"""
+        if not self._compact_enabled():
+            return {}
+        kwargs: Dict[str, Any] = {}
+        max_tokens = compact_output_config.max_tokens.get(self.name)
+        if template.endswith("_COMPACT") and max_tokens:
+            per_clause = compact_output_config.max_tokens_per_clause.get(self.name, 0)
+            kwargs["max_tokens"] = max_tokens + per_clause * item_count
+        response_format = PromptTemplates.response_format(template)
+        if compact_output_config.structured_output and response_format:
+            kwargs["response_format"] = response_format
+        return kwargs
+    
+    @staticmethod
+    def _truncated(response: Any, parsed: Dict[str, Any]) -> bool:
+        """max_tokens에서 잘렸거나 JSON으로 파싱되지 않은 응답인지 (간결 출력 → 일반 템플릿 재시도 판단)"""
+        metadata = getattr(response, "response_metadata", None) or {}
+        return metadata.get("finish_reason") == "length" or "raw_response" in parsed
+    
+    def _invoke_llm(self, messages: List, name: Optional[str] = None, **llm_kwargs) -> Any:
+        """LLM 호출 및 토큰/프롬프트 캐시 사용량 기록
+
+        Args:
+            messages: 호출 메시지 목록
+            name: 집계용 이름 (기본값: Agent 이름)
+            **llm_kwargs: 호출 옵션 (max_tokens, response_format 등)
+        """
+        name = name or self.name
+        llm = self._select_llm()
+        # 데드라인이 있으면 남은 노드 예산을 요청 제한 시간으로 사용
+        timeout = time_left()
+        if timeout is not None and timeout <= 0:
+            raise DeadlineExceeded(f"{name}: 노드 예산을 모두 사용했습니다.")
+        
+        with tracer.span(f"llm.{name}", kind="llm") as span:
+            start = time.perf_counter()
+            try:
+                # 우선순위/테넌트별 슬롯 배정 (대기 시간도 노드 예산에 포함)
+                with llm_scheduler.slot("llm", timeout=timeout) as queue_wait:
+                    span.set(queue_wait_ms=round(queue_wait * 1000, 1))
+                    timeout = time_left()
+                    response = self._call_llm(llm, messages, name, timeout, llm_kwargs)
+            except Exception as e:
+                remaining = time_left()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(f"{name}: 노드 예산 초과") from e
+                raise
+            latency = time.perf_counter() - start
+            
+            self.last_usage = extract_usage(response)
+            model = self.model_name if llm is self.llm else deadline_config.fallback_deployment
+            span.record_usage(span.attributes.get("deployment", model), self.last_usage)
+        
+        prompt_cache_stats.record(name, self.last_usage, latency)
+        return response
+    
+    @staticmethod
+    def _call_llm(llm: Any, messages: List, name: str, timeout: Optional[float], llm_kwargs: Dict[str, Any]) -> Any:
+        """LLM 클라이언트 종류별 호출 (디스패처는 호출 유형별 헤징, 제한 시간은 요청 timeout으로 전달)"""
+        if isinstance(llm, LLMDispatcher):
+            return llm.invoke(messages, latency_key=name, timeout=timeout, **llm_kwargs)
+        if timeout is not None:
+            return llm.invoke(messages, timeout=timeout, **llm_kwargs)
+        return llm.invoke(messages, **llm_kwargs)
+    
+    def _invoke_batched(
+        self,
+        template: str,
+        texts: List[str],
+        result_key: str,
+        id_prefix: str = "p",
+        name: Optional[str] = None,
+        **format_kwargs
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """소형 작업을 다른 분석의 호환 작업과 묶어 한 요청으로 실행
+
+        템플릿 user 프롬프트의 `{items}`에 "### [ID] 항목" 목록을 채우고,
+        응답의 result_key 목록을 ID로 나누어 항목 순서대로 반환합니다.
+
+        Args:
+            template: 배치 템플릿 이름 (예: "CLAUSE_PAIR_ASSESSOR")
+            texts: 항목 텍스트 목록
+            result_key: 응답 JSON에서 항목별 결과 목록 키
+            id_prefix: 항목 ID 접두어
+            name: 집계용 이름 (기본값: Agent 이름)
+            **format_kwargs: 배치 내 모든 항목에 공통인 템플릿 변수 (호환 그룹 키에 포함)
+
+        Returns:
+            (항목별 결과(없으면 빈 dict), 배치 응답 전체 - 다른 호출자와 묶였으면 빈 dict)
+        """
+        name = name or self.name
+        
+        if not micro_batch_config.enabled:
+            results, response, _ = self._run_batch(template, texts, result_key, id_prefix, name, format_kwargs)
+            return results, response
+        
+        priority, tenant = current_workload()
+        
+        def run_as_caller(batch_texts: List[str], batch_timeout: Optional[float]):
+            # 배치에 합류한 호출자 중 가장 이른 마감을 예산으로 적용 (LLM 요청/스케줄러 슬롯 대기 제한)
+            stage = None if batch_timeout is None else StageBudget(
+                "micro_batch", batch_timeout, "full", time.monotonic() + batch_timeout
+            )
+            with workload(priority, tenant), stage_scope(stage):
+                return self._run_batch(template, batch_texts, result_key, id_prefix, name, format_kwargs)
+        
+        def execute(batch_texts: List[str], batch_timeout: Optional[float]):
+            # 배치 실행 스레드에는 호출자의 트레이스/데드라인 컨텍스트가 없도록 빈 컨텍스트에서 호출
+            # (스케줄러 우선순위 등급은 같은 등급끼리만 묶으므로 첫 호출자 것을 사용)
+            return contextvars.Context().run(run_as_caller, batch_texts, batch_timeout)
+        
+        # 같은 템플릿/공통 변수/모델/우선순위 등급의 작업만 한 배치로 묶음
+        group = (
+            template, tuple(sorted(format_kwargs.items())), self.model_name, self.temperature, id(self.llm), priority
+        )
+        timeout = time_left()
+        with tracer.span(f"llm.{name}", kind="llm") as span:
+            try:
+                results, info = micro_batcher.submit(group, texts, execute, timeout=timeout)
+            except FutureTimeoutError as e:
+                raise DeadlineExceeded(f"{name}: 배치 응답 대기 중 노드 예산 초과") from e
+            # 배치 토큰 사용량 중 이 호출자 몫(항목 수 비율)을 현재 트레이스에 기록
+            self.last_usage = info["usage"]
+            span.record_usage(self.model_name, self.last_usage)
+            span.set(batch_size=info["batch_size"], batch_callers=info["callers"])
+        return results, info["response"]
+    
+    def _run_batch(
+        self,
+        template: str,
+        texts: List[str],
+        result_key: str,
+        id_prefix: str,
+        name: str,
+        format_kwargs: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, int]]:
+        """항목 ID를 붙여 한 번 호출하고 결과를 항목 순서로 정렬"""
+        items = "\n\n".join(f"### [{id_prefix}{i + 1}] {text}" for i, text in enumerate(texts))
+        messages = PromptTemplates.build_messages(template, items=items, **format_kwargs)
+        response = self._invoke_llm(messages, name, **self._output_kwargs(template, len(texts)))
+        parsed = self._parse_json_response(response.content)
+        by_id = {
+            str(item.get("id")): item
+            for item in parsed.get(result_key, [])
+            if isinstance(item, dict)
+        } if isinstance(parsed.get(result_key), list) else {}
+        results = [by_id.get(f"{id_prefix}{i + 1}", {}) for i in range(len(texts))]
+        return results, parsed, extract_usage(response)
+    
     def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Agent 실행 (하위 클래스에서 구현)"""
         raise NotImplementedError
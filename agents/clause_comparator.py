@@ -2,11 +2,15 @@
 ContractGuard AI - 조항 비교 Agent
 표준계약서와 비교 분석
 """
-from typing import Any, Dict
-from langchain_core.messages import HumanMessage
+from typing import Any, Dict, List, Optional
 
 from .base_agent import BaseAgent
+from config.settings import app_config
 from prompts.templates import PromptTemplates
+from rag.standard_alignment import get_standard_aligner
+from storage.clause_cache import clause_fingerprint, extract_party_names, get_clause_cache, prompt_version
+from utils.compact_output import expand_comparison, render_clauses
+from utils.text_processor import TextProcessor
 
 
 class ClauseComparatorAgent(BaseAgent):
@@ -25,28 +29,224 @@ class ClauseComparatorAgent(BaseAgent):
         if not contract_text:
             return {"error": "계약서 텍스트가 없습니다."}
         
+        # 표준 템플릿과 로컬 정렬 후 변경된 조항만 LLM으로 평가
+        aligner = get_standard_aligner(self.retriever.vs_manager.embeddings)
+        alignment = aligner.align(contract_text, contract_type)
+        if alignment and alignment["coverage"] >= app_config.alignment_min_coverage:
+            return self._compare_aligned(alignment, contract_type, extract_party_names(contract_text))
+        
+        # 맞는 템플릿이 없으면 전체 비교를 LLM에 위임
+        return self._compare_with_llm(contract_text, contract_type)
+    
+    def _compare_with_llm(self, contract_text: str, contract_type: str) -> Dict[str, Any]:
+        """계약서 전체와 검색된 표준계약서를 LLM으로 비교"""
         # RAG로 표준계약서 컨텍스트 검색
-        context = self.retriever.get_context_for_analysis(
+        context = self._get_context(
             f"{contract_type} 표준계약서 조항",
             "standard"
         )
         
-        # 프롬프트 생성
-        prompt = PromptTemplates.CLAUSE_COMPARATOR.format(
-            contract_text=contract_text,
-            context=context
-        )
-        
-        # LLM 호출
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        
-        # 응답 파싱
-        result = self._parse_json_response(response.content)
+        clauses = TextProcessor.extract_clauses(contract_text)
+        result = None
+        if self._compact_enabled() and clauses:
+            # 간결 출력: 조항 ID별 상태/유불리 코드만 생성하고 현재 문구는 계약서 원문에서 복원
+            messages = PromptTemplates.build_messages(
+                "CLAUSE_COMPARATOR_COMPACT",
+                clauses=render_clauses(contract_text, clauses),
+                context=context
+            )
+            response = self._invoke_llm(messages, **self._output_kwargs("CLAUSE_COMPARATOR_COMPACT", len(clauses)))
+            parsed = self._parse_json_response(response.content)
+            # 출력이 잘렸으면 일반 템플릿으로 다시 비교
+            if not self._truncated(response, parsed):
+                result = expand_comparison(parsed, clauses)
+        if result is None:
+            # 프롬프트 생성
+            messages = PromptTemplates.build_messages(
+                "CLAUSE_COMPARATOR",
+                contract_text=contract_text,
+                context=context
+            )
+            
+            # LLM 호출
+            response = self._invoke_llm(messages)
+            
+            # 응답 파싱
+            result = self._parse_json_response(response.content)
         result["agent"] = self.name
         result["compared_with"] = f"{contract_type} 표준계약서"
         
         return result
     
+    def _compare_aligned(
+        self,
+        alignment: Dict[str, Any],
+        contract_type: str,
+        party_names: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """정렬 결과로 비교 결과 구성 (일치/추가는 결정적으로 판정)
+
+        유사도가 낮아 대응 여부를 알 수 없는 쌍은 변경 조항과 함께 LLM으로 확인하고,
+        LLM이 대응하지 않는다고 판정한 표준 조항만 누락(불리)으로, 확인하지 못한 조항은 미확인으로 둡니다.
+        """
+        pairs = alignment["changed"] + alignment["uncertain"]
+        assessments, summary, cache_hits = self._assess_changed_cached(
+            pairs, alignment["template"], contract_type, party_names or {}
+        )
+        
+        results: List[Dict[str, Any]] = []
+        for pair in alignment["matched"]:
+            results.append(self._result_item(pair, "일치", "중립"))
+        missing_articles, unconfirmed_articles = [], list(alignment["missing"])
+        extra_clauses = list(alignment["extra"])
+        changed_count = 0
+        for i, pair in enumerate(pairs):
+            assessment = assessments.get(f"p{i + 1}", {})
+            if i >= len(alignment["changed"]):
+                if not assessment:
+                    unconfirmed_articles.append(pair["article"])
+                    extra_clauses.append(pair["clause"])
+                    continue
+                if assessment.get("corresponds") is False:
+                    missing_articles.append(pair["article"])
+                    extra_clauses.append(pair["clause"])
+                    continue
+            item = self._result_item(pair, "변경", assessment.get("assessment", "중립"))
+            if assessment.get("difference"):
+                item["difference"] = assessment["difference"]
+            results.append(item)
+            changed_count += 1
+        for article in missing_articles:
+            results.append({
+                "clause_name": article["title"],
+                "status": "누락",
+                "current": "해당 조항 없음",
+                "standard": article["content"],
+                "assessment": "불리"
+            })
+        for article in unconfirmed_articles:
+            results.append({
+                "clause_name": article["title"],
+                "status": "미확인",
+                "current": "대응 조항을 찾지 못함 (다른 제목의 조항에 포함되었는지 확인 필요)",
+                "standard": article["content"],
+                "assessment": "미확인"
+            })
+        for clause in extra_clauses:
+            results.append({
+                "clause_name": clause["title"] or clause["heading"],
+                "status": "추가",
+                "current": clause["content"],
+                "standard": "표준계약서에 없는 조항",
+                "assessment": "중립"
+            })
+        
+        missing = [article["title"] for article in missing_articles]
+        unconfirmed = [article["title"] for article in unconfirmed_articles]
+        counts = (
+            f"표준 {len(alignment['matched']) + changed_count}개 조항 대응 "
+            f"(일치 {len(alignment['matched'])}, 변경 {changed_count}), "
+            f"누락 {len(missing)}, 미확인 {len(unconfirmed)}, 추가 {len(extra_clauses)}"
+        )
+        summary = f"{counts}. {summary}" if summary else counts
+        
+        return {
+            "comparison_results": results,
+            "missing_clauses": missing,
+            "unconfirmed_clauses": unconfirmed,
+            "summary": summary,
+            "agent": self.name,
+            "compared_with": f"{alignment['template']} 표준 템플릿",
+            "alignment": {
+                "coverage": round(alignment["coverage"], 3),
+                "llm_pairs": len(pairs) - cache_hits,
+                "cached_pairs": cache_hits
+            }
+        }
+    
+    @staticmethod
+    def _result_item(pair: Dict[str, Any], status: str, assessment: str) -> Dict[str, Any]:
+        return {
+            "clause_name": pair["clause_name"],
+            "status": status,
+            "current": pair["current"],
+            "standard": pair["standard"],
+            "assessment": assessment,
+            "similarity": pair["similarity"]
+        }
+    
+    def _assess_changed_cached(
+        self,
+        pairs: List[Dict[str, Any]],
+        family: str,
+        contract_type: str,
+        party_names: Dict[str, str]
+    ):
+        """이전에 평가한 (표준 조항, 계약 조항) 쌍은 캐시를 재사용하고 나머지만 LLM 평가
+
+        Returns:
+            (쌍 ID → 평가, 요약, 캐시 적중 수)
+        """
+        cache = get_clause_cache()
+        if cache is None or not pairs:
+            assessments, summary = self._assess_changed(pairs, contract_type)
+            return assessments, summary, 0
+        
+        from rag.vectorstore import get_kb_version
+        
+        version = prompt_version(PromptTemplates.get_system_prompt("CLAUSE_PAIR_ASSESSOR"), get_kb_version())
+        fingerprints = [
+            clause_fingerprint(f"{family}|{pair['clause_name']}|{pair['current']}", party_names)
+            for pair in pairs
+        ]
+        cached = cache.get_many("comparison", fingerprints, version, family)
+        
+        assessments: Dict[str, Any] = {}
+        unseen = []
+        for i, fingerprint in enumerate(fingerprints):
+            if fingerprint in cached:
+                assessments[f"p{i + 1}"] = cached[fingerprint]
+            else:
+                unseen.append(i)
+        
+        summary = ""
+        if unseen:
+            new_assessments, summary = self._assess_changed([pairs[i] for i in unseen], contract_type)
+            verdicts = {}
+            for local_index, i in enumerate(unseen):
+                assessment = new_assessments.get(f"p{local_index + 1}")
+                if assessment:
+                    assessments[f"p{i + 1}"] = assessment
+                    verdicts[fingerprints[i]] = {
+                        "corresponds": assessment.get("corresponds", True),
+                        "assessment": assessment.get("assessment", "중립"),
+                        "difference": assessment.get("difference", "")
+                    }
+            cache.put_many("comparison", verdicts, version, family)
+        return assessments, summary, len(pairs) - len(unseen)
+    
+    def _assess_changed(self, changed: List[Dict[str, Any]], contract_type: str):
+        """변경/대응 미확인 조항 쌍만 LLM으로 유리/불리 평가 (쌍 ID → 평가, 요약)"""
+        if not changed:
+            return {}, ""
+        
+        pairs = [
+            f"{pair['clause_name']}"
+            + (" (대응 확인 필요)" if "article" in pair else "")
+            + f"\n- 표준: {pair['standard']}\n"
+            f"- 계약서({pair['current_title']}): {pair['current']}"
+            for pair in changed
+        ]
+        # 같은 유형의 다른 분석에서 동시에 평가하는 쌍과 한 요청으로 묶어 실행
+        results, response = self._invoke_batched(
+            "CLAUSE_PAIR_ASSESSOR",
+            pairs,
+            result_key="assessments",
+            contract_type=contract_type
+        )
+        assessments = {f"p{i + 1}": result for i, result in enumerate(results) if result}
+        return assessments, response.get("summary", "")
+    
     def get_tools(self) -> list:
         """조항 비교 전용 도구"""
         from langchain.tools import Tool
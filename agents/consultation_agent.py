@@ -0,0 +1,78 @@
+"""
+ContractGuard AI - 상담 Agent
+분석 결과와 계약 조항을 바탕으로 다중 턴 질의응답, 오래된 대화는 누적 요약
+"""
+from typing import Any, Dict
+
+from .base_agent import BaseAgent
+from prompts.templates import PromptTemplates
+from utils.chat_memory import ChatMemory
+
+
+class ConsultationAgent(BaseAgent):
+    """대화형 상담 Agent"""
+
+    def __init__(self, temperature: float = 0.3, **kwargs):
+        super().__init__(temperature=temperature, **kwargs)
+        self.name = "Consultation"
+        self.description = "분석 결과 기반 대화형 계약서 상담"
+
+    def answer(
+        self,
+        user_question: str,
+        memory: ChatMemory,
+        analysis_summary: str = "",
+        contract_clauses: str = ""
+    ) -> str:
+        """질문에 답변하고 대화 메모리 갱신"""
+        context = self.retriever.get_context_for_analysis(user_question, "general")
+
+        # system(고정) + 최근 대화 + 이번 질문(요약/조항/컨텍스트 포함)
+        system_message, user_message = PromptTemplates.build_messages(
+            "CONSULTATION",
+            analysis_summary=analysis_summary,
+            conversation_summary=memory.summary or "없음",
+            contract_clauses=contract_clauses,
+            context=context,
+            user_question=user_question
+        )
+        messages = [system_message, *memory.window_messages(), user_message]
+
+        response = self._invoke_llm(messages)
+
+        memory.add("user", user_question)
+        memory.add("assistant", response.content)
+        self.compact_memory(memory)
+        return response.content
+
+    def compact_memory(self, memory: ChatMemory):
+        """대화 창이 예산을 넘으면 오래된 대화를 누적 요약에 병합"""
+        folded = memory.pop_overflow()
+        if not folded:
+            return
+
+        turns = ChatMemory.format_turns(folded)
+        try:
+            messages = PromptTemplates.build_messages(
+                "CHAT_SUMMARY",
+                summary=memory.summary or "없음",
+                turns=turns,
+                max_tokens=memory.summary_tokens
+            )
+            response = self._invoke_llm(messages, name="ChatSummary")
+            memory.set_summary(response.content)
+        except Exception as e:
+            # 요약 실패 시에도 메모리는 예산 안에 유지
+            print(f"⚠️ 대화 요약 실패, 원문 일부로 대체: {e}")
+            memory.set_summary(f"{memory.summary}\n{turns}")
+
+    def invoke(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """상담 실행"""
+        memory = input_data.get("memory") or ChatMemory()
+        answer = self.answer(
+            input_data.get("user_question", ""),
+            memory,
+            analysis_summary=input_data.get("analysis_summary", ""),
+            contract_clauses=input_data.get("contract_clauses", "")
+        )
+        return {"answer": answer, "agent": self.name}
@@ -3,10 +3,11 @@ ContractGuard AI - 계약 분석 Agent
 계약서 유형 파악 및 핵심 조항 추출
 """
 from typing import Any, Dict
-from langchain_core.messages import HumanMessage
 
 from .base_agent import BaseAgent
 from prompts.templates import PromptTemplates
+from utils.compact_output import expand_analysis, render_clauses
+from utils.text_processor import TextProcessor
 
 
 class ContractAnalyzerAgent(BaseAgent):
@@ -25,22 +26,38 @@ class ContractAnalyzerAgent(BaseAgent):
             return {"error": "계약서 텍스트가 없습니다."}
         
         # RAG로 컨텍스트 검색
-        context = self.retriever.get_context_for_analysis(
+        context = self._get_context(
             contract_text[:1000],  # 처음 1000자로 검색
             "general"
         )
         
-        # 프롬프트 생성
-        prompt = PromptTemplates.CONTRACT_ANALYZER.format(
-            contract_text=contract_text,
-            context=context
-        )
-        
-        # LLM 호출
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        
-        # 응답 파싱
-        result = self._parse_json_response(response.content)
+        clauses = TextProcessor.extract_clauses(contract_text)
+        result = None
+        if self._compact_enabled() and clauses:
+            # 간결 출력: 조항 ID별 요약만 생성하고 조항 제목은 로컬에서 복원
+            messages = PromptTemplates.build_messages(
+                "CONTRACT_ANALYZER_COMPACT",
+                clauses=render_clauses(contract_text, clauses),
+                context=context
+            )
+            response = self._invoke_llm(messages, **self._output_kwargs("CONTRACT_ANALYZER_COMPACT", len(clauses)))
+            parsed = self._parse_json_response(response.content)
+            # 출력이 잘렸으면 유형/당사자/핵심 조건을 잃지 않도록 일반 템플릿으로 다시 분석
+            if not self._truncated(response, parsed):
+                result = expand_analysis(parsed, clauses)
+        if result is None:
+            # 프롬프트 생성
+            messages = PromptTemplates.build_messages(
+                "CONTRACT_ANALYZER",
+                contract_text=contract_text,
+                context=context
+            )
+            
+            # LLM 호출
+            response = self._invoke_llm(messages)
+            
+            # 응답 파싱
+            result = self._parse_json_response(response.content)
         result["agent"] = self.name
         result["raw_text"] = contract_text
         
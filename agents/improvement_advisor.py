@@ -4,10 +4,11 @@ ContractGuard AI - 개선 제안 Agent
 """
 from typing import Any, Dict
 import json
-from langchain_core.messages import HumanMessage
 
 from .base_agent import BaseAgent
 from prompts.templates import PromptTemplates
+from utils.compact_output import expand_improvements, render_clauses
+from utils.text_processor import TextProcessor
 
 
 class ImprovementAdvisorAgent(BaseAgent):
@@ -22,6 +23,7 @@ class ImprovementAdvisorAgent(BaseAgent):
         """개선 제안 실행"""
         risk_result = input_data.get("risk_result", {})
         comparison_result = input_data.get("comparison_result", {})
+        contract_text = input_data.get("contract_text", "")
         
         if not risk_result and not comparison_result:
             return {"error": "분석 결과가 없습니다."}
@@ -39,20 +41,38 @@ class ImprovementAdvisorAgent(BaseAgent):
         
         # RAG로 개선 관련 컨텍스트 검색
         search_query = f"계약서 개선 제안 {risk_str[:200]}"
-        context = self.retriever.get_context_for_analysis(search_query, "standard")
+        context = self._get_context(search_query, "standard")
         
-        # 프롬프트 생성
-        prompt = PromptTemplates.IMPROVEMENT_ADVISOR.format(
-            risk_result=risk_str,
-            comparison_result=comparison_str,
-            context=context
-        )
-        
-        # LLM 호출
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        
-        # 응답 파싱
-        result = self._parse_json_response(response.content)
+        clauses = TextProcessor.extract_clauses(contract_text) if contract_text else []
+        result = None
+        if self._compact_enabled() and clauses:
+            # 간결 출력: 조항 ID로 수정 대상을 지칭하고 현재 문구는 계약서 원문에서 복원
+            messages = PromptTemplates.build_messages(
+                "IMPROVEMENT_ADVISOR_COMPACT",
+                clauses=render_clauses(contract_text, clauses, with_content=False),
+                risk_result=risk_str,
+                comparison_result=comparison_str,
+                context=context
+            )
+            response = self._invoke_llm(messages, **self._output_kwargs("IMPROVEMENT_ADVISOR_COMPACT", len(clauses)))
+            parsed = self._parse_json_response(response.content)
+            # 출력이 잘렸으면 일반 템플릿으로 다시 제안
+            if not self._truncated(response, parsed):
+                result = expand_improvements(parsed, clauses)
+        if result is None:
+            # 프롬프트 생성
+            messages = PromptTemplates.build_messages(
+                "IMPROVEMENT_ADVISOR",
+                risk_result=risk_str,
+                comparison_result=comparison_str,
+                context=context
+            )
+            
+            # LLM 호출
+            response = self._invoke_llm(messages)
+            
+            # 응답 파싱
+            result = self._parse_json_response(response.content)
         result["agent"] = self.name
         
         return result
@@ -2,12 +2,20 @@
 ContractGuard AI - 리스크 평가 Agent
 계약서의 잠재적 리스크 식별 및 평가
 """
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 import json
-from langchain_core.messages import HumanMessage
+import re
 
 from .base_agent import BaseAgent
 from prompts.templates import PromptTemplates
+from storage.clause_cache import clause_fingerprint, extract_party_names, get_clause_cache, prompt_version
+from utils.compact_output import clause_id, expand_risks, render_clauses
+from utils.text_processor import (
+    DAMAGE_RISK_INDICATORS,
+    SEVERITY_WEIGHTS,
+    TERMINATION_RISK_INDICATORS,
+    TextProcessor,
+)
 
 
 class RiskEvaluatorAgent(BaseAgent):
@@ -26,8 +34,58 @@ class RiskEvaluatorAgent(BaseAgent):
         if not contract_text:
             return {"error": "계약서 텍스트가 없습니다."}
         
+        cache = get_clause_cache()
+        clauses = TextProcessor.extract_clauses(contract_text)
+        if cache is None or not clauses:
+            return self._evaluate_with_llm(contract_text, analysis_result, clauses)
+        return self._evaluate_with_cache(cache, contract_text, clauses, analysis_result)
+    
+    @staticmethod
+    def _score(risks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """조항별 리스크 심각도 합으로 점수/수준 산출 (캐시된 판정과 새 판정을 병합할 때)"""
+        risk_score = min(100, sum(SEVERITY_WEIGHTS.get(r.get("severity"), 15) for r in risks if isinstance(r, dict)))
+        return {
+            "risk_score": risk_score,
+            "risk_level": "상" if risk_score >= 70 else "중" if risk_score >= 40 else "하",
+        }
+    
+    @staticmethod
+    def _analysis_for(analysis_result: Any, clauses: List[Dict[str, str]], indices: List[int]) -> Dict[str, Any]:
+        """일부 조항만 평가할 때 넘길 분석 결과
+
+        원문(raw_text) 등 계약서 전체를 담은 필드는 빼고, 조항 요약도 평가할 조항 것만 남깁니다.
+        """
+        if not isinstance(analysis_result, dict):
+            return {}
+        subset = {key: analysis_result[key] for key in ("contract_type", "parties", "key_terms") if key in analysis_result}
+        summaries = analysis_result.get("clauses_summary")
+        if isinstance(summaries, list):
+            titles = {clauses[i]["title"] for i in indices}
+            subset["clauses_summary"] = [
+                item for item in summaries if isinstance(item, dict) and item.get("title") in titles
+            ]
+        return subset
+    
+    def _template(self, clauses: List[Dict[str, str]]) -> str:
+        """사용할 프롬프트 템플릿 (간결 출력은 조항 ID로 지칭할 조항이 있을 때만)"""
+        return "RISK_EVALUATOR_COMPACT" if self._compact_enabled() and clauses else "RISK_EVALUATOR"
+    
+    def _evaluate_with_llm(
+        self,
+        contract_text: str,
+        analysis_result: Any,
+        clauses: Optional[List[Dict[str, str]]] = None,
+        indices: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """계약서(또는 일부 조항) 리스크를 LLM으로 평가
+
+        Args:
+            contract_text: 계약서 원문 (또는 평가할 조항만 이어 붙인 텍스트)
+            clauses: 계약서 전체 조항 목록 (간결 출력 모드의 조항 ID 기준)
+            indices: 평가할 조항 순번 (None이면 전체)
+        """
         # RAG로 리스크 관련 컨텍스트 검색
-        context = self.retriever.get_context_for_analysis(
+        context = self._get_context(
             contract_text[:1000],
             "risk"
         )
@@ -38,18 +96,35 @@ class RiskEvaluatorAgent(BaseAgent):
         else:
             analysis_str = str(analysis_result)
         
-        # 프롬프트 생성
-        prompt = PromptTemplates.RISK_EVALUATOR.format(
-            analysis_result=analysis_str,
-            contract_text=contract_text,
-            context=context
-        )
-        
-        # LLM 호출
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        
-        # 응답 파싱
-        result = self._parse_json_response(response.content)
+        result = None
+        if self._template(clauses or []) == "RISK_EVALUATOR_COMPACT":
+            # 간결 출력: 조항 ID와 짧은 판정만 생성하고 조항 제목은 로컬에서 복원
+            messages = PromptTemplates.build_messages(
+                "RISK_EVALUATOR_COMPACT",
+                analysis_result=analysis_str,
+                clauses=render_clauses(contract_text, clauses, indices),
+                context=context
+            )
+            item_count = len(indices) if indices is not None else len(clauses)
+            response = self._invoke_llm(messages, **self._output_kwargs("RISK_EVALUATOR_COMPACT", item_count))
+            parsed = self._parse_json_response(response.content)
+            # 출력이 잘렸으면 일반 템플릿으로 다시 평가
+            if not self._truncated(response, parsed):
+                result = expand_risks(parsed, clauses)
+        if result is None:
+            # 프롬프트 생성
+            messages = PromptTemplates.build_messages(
+                "RISK_EVALUATOR",
+                analysis_result=analysis_str,
+                contract_text=contract_text,
+                context=context
+            )
+            
+            # LLM 호출
+            response = self._invoke_llm(messages)
+            
+            # 응답 파싱
+            result = self._parse_json_response(response.content)
         result["agent"] = self.name
         
         # 리스크 점수 검증
@@ -58,6 +133,117 @@ class RiskEvaluatorAgent(BaseAgent):
         
         return result
     
+    def _evaluate_with_cache(
+        self,
+        cache,
+        contract_text: str,
+        clauses: List[Dict[str, str]],
+        analysis_result: Any
+    ) -> Dict[str, Any]:
+        """이전 분석에서 본 조항은 캐시된 판정을 재사용하고 처음 보는 조항만 LLM으로 평가"""
+        from rag.standard_alignment import get_standard_aligner
+        from rag.vectorstore import get_kb_version
+        
+        contract_type = analysis_result.get("contract_type", "") if isinstance(analysis_result, dict) else ""
+        family = get_standard_aligner().family_of(contract_type)
+        version = prompt_version(PromptTemplates.get_system_prompt(self._template(clauses)), get_kb_version())
+        party_names = extract_party_names(contract_text)
+        fingerprints = [clause_fingerprint(clause["content"], party_names) for clause in clauses]
+        
+        cached = cache.get_many("risk", fingerprints, version, family)
+        unseen = [i for i, fingerprint in enumerate(fingerprints) if fingerprint not in cached]
+        if not cached:
+            # 캐시 적중이 없으면 기존과 동일하게 전체 계약서를 평가
+            result = self._evaluate_with_llm(contract_text, analysis_result, clauses)
+            cache.put_many("risk", self._clause_verdicts(result, clauses, fingerprints, unseen), version, family)
+            return result
+        
+        llm_result: Dict[str, Any] = {}
+        if unseen:
+            unseen_text = "\n\n".join(
+                f"{clauses[i]['title']}\n{clauses[i]['content']}" for i in unseen
+            )
+            # 처음 보는 조항만 보내도록 분석 결과에서도 계약서 전체 필드를 제외
+            llm_result = self._evaluate_with_llm(
+                unseen_text, self._analysis_for(analysis_result, clauses, unseen), clauses, unseen
+            )
+            cache.put_many("risk", self._clause_verdicts(llm_result, clauses, fingerprints, unseen), version, family)
+        
+        # 캐시된 판정 + 새 판정 병합 (조항 제목은 현재 계약서 기준)
+        risks, safe_clauses = [], []
+        for i, clause in enumerate(clauses):
+            verdict = cached.get(fingerprints[i])
+            if verdict is None:
+                continue
+            for risk in verdict["risks"]:
+                risks.append({**risk, "clause": clause["title"], "clause_id": clause_id(i), "cached": True})
+            if not verdict["risks"]:
+                safe_clauses.append(clause["title"])
+        risks.extend(llm_result.get("risks", []) if isinstance(llm_result.get("risks"), list) else [])
+        safe_clauses.extend(llm_result.get("safe_clauses", []) if isinstance(llm_result.get("safe_clauses"), list) else [])
+        
+        return {
+            **self._score(risks),
+            "risks": risks,
+            "safe_clauses": safe_clauses,
+            "agent": self.name,
+            "clause_cache": {"hits": len(clauses) - len(unseen), "evaluated": len(unseen)}
+        }
+    
+    @staticmethod
+    def _match_clause(label: str, clauses: List[Dict[str, str]], candidates: List[int]) -> Optional[int]:
+        """LLM이 적은 조항 표기(제N조, 제목)로 조항 위치 찾기"""
+        number = re.search(r'제\s*(\d+)\s*조', label or "")
+        for i in candidates:
+            title = clauses[i]["title"]
+            if number and re.match(rf'제\s*{number.group(1)}\s*조', title):
+                return i
+            if label and (label in title or title in label):
+                return i
+        return None
+    
+    def _clause_verdicts(
+        self,
+        result: Dict[str, Any],
+        clauses: List[Dict[str, str]],
+        fingerprints: List[str],
+        evaluated: List[int]
+    ) -> Dict[str, Any]:
+        """LLM 결과를 조항별 판정으로 분해
+
+        리스크가 지목된 조항과 safe_clauses에 명시된 조항만 저장하고,
+        어느 쪽에도 특정되지 않은 조항은 다음 분석에서 다시 평가합니다.
+        """
+        if "raw_response" in result or "error" in result or not isinstance(result.get("risks"), list):
+            return {}
+        
+        # 간결 출력 모드는 조항 ID로 정확히 대응, 그 외에는 조항 표기로 추정
+        id_to_index = {clause_id(i): i for i in evaluated}
+        per_clause: Dict[int, List[Dict[str, Any]]] = {}
+        for risk in result["risks"]:
+            if not isinstance(risk, dict):
+                continue
+            index = id_to_index.get(risk.get("clause_id"))
+            if index is None:
+                index = self._match_clause(str(risk.get("clause", "")), clauses, evaluated)
+            if index is not None:
+                per_clause.setdefault(index, []).append(
+                    {k: v for k, v in risk.items() if k not in ("clause", "clause_id")}
+                )
+        
+        if isinstance(result.get("safe_clause_ids"), list):
+            for ref in result["safe_clause_ids"]:
+                if ref in id_to_index:
+                    per_clause.setdefault(id_to_index[ref], [])
+        else:
+            safe = result.get("safe_clauses") if isinstance(result.get("safe_clauses"), list) else []
+            for label in safe:
+                index = self._match_clause(str(label), clauses, evaluated)
+                if index is not None:
+                    per_clause.setdefault(index, [])
+        
+        return {fingerprints[i]: {"risks": risks} for i, risks in per_clause.items()}
+    
     def get_tools(self) -> list:
         """리스크 평가 전용 도구"""
         from langchain.tools import Tool
@@ -79,15 +265,8 @@ class RiskEvaluatorAgent(BaseAgent):
     
     def _check_damage_clause(self, text: str) -> str:
         """손해배상 조항 체크"""
-        risk_indicators = [
-            ("무제한", "손해배상 한도 없음 - 고위험"),
-            ("간접손해", "간접손해 포함 - 주의 필요"),
-            ("특별손해", "특별손해 포함 - 주의 필요"),
-            ("예정액", "위약금 예정액 확인 필요"),
-        ]
-        
         found_risks = []
-        for indicator, description in risk_indicators:
+        for indicator, description, _ in DAMAGE_RISK_INDICATORS:
             if indicator in text:
                 found_risks.append(description)
         
@@ -95,14 +274,8 @@ class RiskEvaluatorAgent(BaseAgent):
     
     def _check_termination_clause(self, text: str) -> str:
         """계약해지 조항 체크"""
-        risk_indicators = [
-            ("일방적", "일방적 해지권 - 주의 필요"),
-            ("즉시", "즉시 해지 가능 - 고위험"),
-            ("사전 통지 없이", "사전 통지 없는 해지 - 고위험"),
-        ]
-        
         found_risks = []
-        for indicator, description in risk_indicators:
+        for indicator, description, _ in TERMINATION_RISK_INDICATORS:
             if indicator in text:
                 found_risks.append(description)
         
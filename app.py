@@ -2,34 +2,11 @@
 ContractGuard AI - 메인 애플리케이션
 AI 기반 계약서 리스크 분석 어시스턴트
 """
-# 필수 패키지 자동 설치
-import subprocess
-import sys
-
-def install_package(package):
-    """패키지가 없으면 자동 설치"""
-    try:
-        __import__(package.split('[')[0])
-    except ImportError:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
-# 필수 패키지 확인 및 설치
-try:
-    import PyPDF2
-except ImportError:
-    install_package("PyPDF2")
-    import PyPDF2
-
-try:
-    import docx
-except ImportError:
-    install_package("python-docx")
-    import docx
-
 import streamlit as st
 from typing import Dict, Any
 import json
 import os
+import time
 
 # 페이지 설정
 st.set_page_config(
@@ -44,10 +21,16 @@ def initialize_session_state():
     """세션 상태 초기화"""
     if "analysis_result" not in st.session_state:
         st.session_state.analysis_result = None
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+    if "chat_memory" not in st.session_state:
+        from utils.chat_memory import ChatMemory
+        st.session_state.chat_memory = ChatMemory()
     if "contract_text" not in st.session_state:
         st.session_state.contract_text = ""
+    if "reuse_offer" not in st.session_state:
+        st.session_state.reuse_offer = None
+    if "session_id" not in st.session_state:
+        import uuid
+        st.session_state.session_id = uuid.uuid4().hex
 
 
 def render_sidebar():
@@ -67,6 +50,9 @@ def render_sidebar():
             help="계약서 파일을 업로드하면 AI가 자동으로 분석합니다."
         )
 
+        # 업로드 즉시 선행 분석 시작 (분석 시작 버튼이 진행 중인 작업에 합류)
+        start_speculation(uploaded_file)
+
         # 또는 직접 입력
         st.subheader("✏️ 또는 직접 입력")
         manual_input = st.text_area(
@@ -86,14 +72,124 @@ def render_sidebar():
 
         # 초기화 버튼
         if st.button("🔄 새로운 분석", use_container_width=True):
+            from rag.clause_index import clause_index_registry
+
+            from graph.speculative import speculative_executor
+
+            clause_index_registry.evict(st.session_state.session_id)
+            speculative_executor.cancel(st.session_state.session_id)
             st.session_state.analysis_result = None
-            st.session_state.chat_history = []
+            st.session_state.reuse_offer = None
+            st.session_state.chat_memory.clear()
             st.session_state.contract_text = ""
             st.rerun()
 
+        render_prompt_cache_stats()
+
         return uploaded_file, manual_input, analyze_button
 
 
+def uploaded_file_key(uploaded_file) -> str:
+    """업로드 파일 식별자 (같은 파일 재렌더링 시 선행 분석 재사용)"""
+    return f"{getattr(uploaded_file, 'file_id', '')}:{uploaded_file.name}:{uploaded_file.size}"
+
+
+def start_speculation(uploaded_file):
+    """업로드된 파일의 선행 분석 시작 (파일이 제거되면 취소)"""
+    from config.settings import app_config
+    from graph.speculative import speculative_executor
+
+    if not app_config.speculative_enabled:
+        return
+    if uploaded_file is None:
+        speculative_executor.cancel(st.session_state.session_id)
+        return
+    speculative_executor.start(
+        st.session_state.session_id,
+        uploaded_file_key(uploaded_file),
+        uploaded_file.getvalue(),
+        uploaded_file.name
+    )
+
+
+def render_prompt_cache_stats():
+    """프롬프트 캐시 재사용률 표시"""
+    from rag.semantic_cache import semantic_answer_cache
+    from utils.llm_usage import prompt_cache_stats
+
+    from storage.clause_cache import get_clause_cache
+
+    from graph.speculative import speculative_executor
+    from utils.http_pool import connection_stats
+    from utils.micro_batch import micro_batcher
+    from utils.scheduler import llm_scheduler
+
+    stats = prompt_cache_stats.summary()
+    answer_cache = semantic_answer_cache.summary()
+    clause_cache = get_clause_cache()
+    family_stats = clause_cache.family_stats() if clause_cache else []
+    speculation = speculative_executor.summary()
+    if not stats and not family_stats and not (answer_cache["hits"] + answer_cache["misses"]) \
+            and not speculation["started"]:
+        return
+
+    with st.expander("📈 프롬프트 캐시 통계"):
+        connections = connection_stats.summary()
+        if connections["requests"]:
+            st.write(f"**HTTP 연결 풀** ({connections['requests']}회 요청)")
+            st.caption(
+                f"연결 재사용률 {connections['reuse_rate']:.0%} · "
+                f"새 연결 {connections['new_connections']}회 · "
+                f"평균 연결 수립 {connections['avg_connect_ms']:.0f}ms"
+            )
+        scheduling = llm_scheduler.summary()
+        if any(item["granted"] for item in scheduling["classes"].values()):
+            st.write(f"**호출 스케줄러** (동시 {scheduling['max_concurrent']}, 일괄 처리 최대 {scheduling['batch_limit']})")
+            class_names = {"chat": "상담", "analysis": "분석", "batch": "일괄"}
+            for priority, item in scheduling["classes"].items():
+                if item["granted"] or item["rejected"]:
+                    st.caption(
+                        f"{class_names[priority]} · 대기 p50 {item['wait_p50_ms']:.0f}ms / "
+                        f"p95 {item['wait_p95_ms']:.0f}ms · 대기열 {item['queued']} · "
+                        f"실행 중 {item['in_flight']} · 거절 {item['rejected']}"
+                    )
+        batching = micro_batcher.summary()
+        if batching["batches"]:
+            st.write(f"**마이크로 배치** ({batching['batches']}회 요청)")
+            st.caption(
+                f"배치당 평균 분석 {batching['avg_callers']:.1f}건 · "
+                f"항목 {batching['items']}개 · 절약한 요청 {batching['requests_saved']}회"
+            )
+        if speculation["started"]:
+            st.write(f"**업로드 선행 분석** ({speculation['started']}회 시작)")
+            st.caption(
+                f"합류 {speculation['attached']} · 취소 {speculation['cancelled']} · 만료 {speculation['expired']} "
+                f"(버려진 LLM 단계 {speculation['discarded_llm_stages']}) · "
+                f"누적 선행 시간 {speculation['head_start_sec']:.1f}s"
+            )
+        if answer_cache["hits"] + answer_cache["misses"]:
+            st.write(f"**상담 답변 캐시** ({answer_cache['entries']}개 저장)")
+            st.caption(
+                f"적중률 {answer_cache['hit_rate']:.0%} · "
+                f"히트 {answer_cache['hits']} / 미스 {answer_cache['misses']}"
+            )
+        if family_stats:
+            st.write("**조항 판정 캐시** (템플릿 계열별)")
+            stage_names = {"risk": "리스크", "comparison": "비교"}
+            for item in family_stats:
+                st.caption(
+                    f"{item['family']} · {stage_names.get(item['stage'], item['stage'])} "
+                    f"적중률 {item['hit_rate']:.0%} ({item['hits']}/{item['hits'] + item['misses']} 조항)"
+                )
+        for agent, item in stats.items():
+            st.write(f"**{agent}** ({item['calls']}회 호출)")
+            st.caption(
+                f"재사용률 {item['reuse_rate']:.0%} · "
+                f"캐시 {item['cached_tokens']:,}/{item['prompt_tokens']:,} 토큰 · "
+                f"평균 지연 히트 {item['avg_latency_hit']:.2f}s / 미스 {item['avg_latency_miss']:.2f}s"
+            )
+
+
 def process_uploaded_file(uploaded_file) -> str:
     """업로드된 파일 처리"""
     from utils.document_loader import DocumentLoader
@@ -107,12 +203,153 @@ def process_uploaded_file(uploaded_file) -> str:
         return ""
 
 
-def run_analysis(contract_text: str) -> Dict[str, Any]:
-    """계약서 분석 실행"""
+def run_analysis(
+    contract_text: str,
+    reuse: Dict[str, Any] = None,
+    speculation: Dict[str, Any] = None,
+    sla_sec: float = None
+) -> Dict[str, Any]:
+    """계약서 분석 실행
+
+    Args:
+        contract_text: 계약서 원문
+        reuse: 재사용할 유사 계약서 정보 {"match": ..., "report": ...}
+        speculation: 업로드 직후 선행 분석 결과 (1단계 분석, 조항 인덱스)
+        sla_sec: 남은 분석 제한 시간 (None이면 기본 SLA)
+    """
+    from graph.workflow import ContractAnalysisWorkflow
+
+    from rag.clause_index import clause_index_registry
+    from storage.near_duplicate import get_near_duplicate_index
+    from storage.result_store import get_result_store
+    from utils.scheduler import workload
+
+    workflow = ContractAnalysisWorkflow()
+    speculation = speculation if speculation and speculation.get("contract_text") == contract_text else {}
+    # 대화형 분석 등급, 세션별 공정 큐로 스케줄링
+    with workload("analysis", st.session_state.session_id):
+        if reuse:
+            result = workflow.run_with_prior(
+                contract_text, reuse["report"], reuse["match"],
+                sla_sec=sla_sec, analysis_result=speculation.get("analysis_result")
+            )
+        elif speculation.get("analysis_result"):
+            result = workflow.run_from_analysis(contract_text, speculation["analysis_result"], sla_sec=sla_sec)
+        else:
+            result = workflow.run(contract_text, sla_sec=sla_sec)
+
+    # 성공한 분석 결과는 분석 이력 저장소에 보관
+    store = get_result_store()
+    if store is not None and "error" not in result:
+        store.save(result, contract_text)
+
+    # 다음 유사 계약서 탐지를 위해 성공한 분석 결과를 인덱스에 추가 (제한 시간으로 생략된 부분 리포트 제외)
+    index = get_near_duplicate_index()
+    if index is not None and "error" not in result and not result.get("partial") \
+            and not (reuse and reuse["match"].get("identical")):
+        index.add(
+            contract_text,
+            {k: v for k, v in result.items() if k not in ("thread_id", "performance", "reused_from", "deadline")}
+        )
+
+    # 채팅용 조항 인덱스는 분석 시점에 한 번만 구축 (선행 분석에서 만들었으면 등록만)
+    if speculation.get("clause_index") is not None:
+        clause_index_registry.register(st.session_state.session_id, speculation["clause_index"])
+    else:
+        clause_index_registry.build(
+            st.session_state.session_id,
+            contract_text,
+            workflow.retriever.vs_manager.embeddings
+        )
+    return result
+
+
+def find_prior_analysis(contract_text: str) -> Dict[str, Any]:
+    """이전에 분석한 거의 같은 계약서와 그 분석 결과 조회 (없으면 None)"""
+    from rag.vectorstore import get_kb_version
+    from storage.near_duplicate import get_near_duplicate_index
+
+    index = get_near_duplicate_index()
+    if index is None:
+        return None
+    kb_version = get_kb_version()
+    for match in index.query(contract_text, k=3):
+        report = index.get_report(match["contract_id"])
+        # 다른 지식 베이스 버전으로 분석한 결과는 재사용하지 않음
+        if report and report.get("kb_version") == kb_version:
+            return {"match": match, "report": report}
+    return None
+
+
+def analyze_contract(contract_text: str, speculation: Dict[str, Any] = None, sla_sec: float = None):
+    """유사 계약서가 있으면 재사용(자동 적용 또는 제안), 없으면 전체 분석
+
+    sla_sec: 선행 분석 대기 후 남은 분석 제한 시간 (None이면 기본 SLA)
+    """
+    from config.settings import near_duplicate_config
+
+    reuse = find_prior_analysis(contract_text)
+    if reuse and near_duplicate_config.auto_apply and \
+            reuse["match"]["similarity"] >= near_duplicate_config.auto_threshold:
+        with st.spinner("♻️ 거의 같은 이전 계약서의 분석을 재사용합니다..."):
+            st.session_state.analysis_result = run_analysis(contract_text, reuse, sla_sec=sla_sec)
+    elif reuse:
+        # 사용자에게 재사용 여부를 묻고 결정은 다음 실행에서 처리
+        st.session_state.reuse_offer = reuse
+        st.session_state.analysis_result = None
+    else:
+        with st.spinner("🔍 계약서를 분석중입니다... (약 1-2분 소요)"):
+            st.session_state.analysis_result = run_analysis(contract_text, speculation=speculation, sla_sec=sla_sec)
+
+
+def render_reuse_offer():
+    """유사 계약서 분석 재사용 제안"""
+    offer = st.session_state.reuse_offer
+    match = offer["match"]
+    st.info(
+        f"♻️ 이전에 분석한 계약서와 {match['similarity']:.0%} 유사합니다. "
+        f"바뀐 조항 {len(match['changed_clauses'])}개만 다시 분석할 수 있습니다."
+    )
+    if match["changed_clauses"]:
+        st.caption("바뀐 조항: " + ", ".join(match["changed_clauses"][:10]))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        reuse_clicked = st.button("♻️ 이전 분석 재사용", type="primary", use_container_width=True)
+    with col2:
+        full_clicked = st.button("🔍 전체 분석", use_container_width=True)
+
+    if reuse_clicked or full_clicked:
+        st.session_state.reuse_offer = None
+        with st.spinner("🔍 계약서를 분석중입니다..."):
+            st.session_state.analysis_result = run_analysis(
+                st.session_state.contract_text, offer if reuse_clicked else None
+            )
+        st.rerun()
+
+
+def get_clause_index():
+    """현재 세션의 조항 인덱스 (만료되었으면 재구축)"""
+    from rag.clause_index import clause_index_registry
+
+    index = clause_index_registry.get(st.session_state.session_id)
+    if index is None and st.session_state.contract_text:
+        from utils.llm_clients import get_embeddings
+
+        index = clause_index_registry.build(
+            st.session_state.session_id, st.session_state.contract_text, get_embeddings()
+        )
+    return index
+
+
+def resume_analysis(thread_id: str) -> Dict[str, Any]:
+    """실패한 분석을 마지막 성공 단계부터 재개"""
     from graph.workflow import ContractAnalysisWorkflow
+    from utils.scheduler import workload
 
     workflow = ContractAnalysisWorkflow()
-    return workflow.run(contract_text)
+    with workload("analysis", st.session_state.session_id):
+        return workflow.resume(thread_id)
 
 
 def render_risk_score(score: int):
@@ -144,6 +381,13 @@ def render_analysis_result(result: Dict[str, Any]):
     """분석 결과 렌더링"""
     if "error" in result:
         st.error(f"분석 오류: {result['error']}")
+        if result.get("resumable") and result.get("thread_id"):
+            completed = result.get("last_node") or "없음"
+            st.caption(f"마지막 완료 단계: {completed} · 실패 단계: {result.get('failed_node')}")
+            if st.button("🔁 실패한 단계부터 다시 시도"):
+                with st.spinner("🔍 중단된 단계부터 분석을 재개합니다..."):
+                    st.session_state.analysis_result = resume_analysis(result["thread_id"])
+                st.rerun()
         return
 
     summary = result.get("summary", {})
@@ -151,6 +395,26 @@ def render_analysis_result(result: Dict[str, Any]):
     # 요약 정보
     st.header("📊 분석 결과 요약")
 
+    reused = result.get("reused_from")
+    if reused:
+        if reused.get("mode") == "identical":
+            st.caption(f"♻️ 조항이 모두 같은 이전 분석 결과를 재사용했습니다. (유사도 {reused['similarity']:.0%})")
+        else:
+            st.caption(
+                f"♻️ 유사 계약서(유사도 {reused['similarity']:.0%})의 조항 판정을 재사용하고 "
+                f"바뀐 조항 {len(reused.get('changed_clauses', []))}개를 다시 평가했습니다."
+            )
+
+    deadline = result.get("deadline", {})
+    if deadline.get("partial"):
+        skipped = ", ".join(deadline.get("skipped", []) + deadline.get("timed_out", []))
+        st.warning(
+            f"⏳ 제한 시간({deadline['sla_sec']:.0f}초) 안에 결과를 제공하기 위해 일부 단계를 생략한 "
+            f"부분 리포트입니다. (생략/시간 초과: {skipped})"
+        )
+    elif deadline.get("degradations"):
+        st.caption("⏳ 제한 시간을 지키기 위해 일부 단계는 소형 모델 또는 축소된 컨텍스트로 분석했습니다.")
+
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("📋 계약 유형", summary.get("contract_type", "알 수 없음"))
@@ -167,7 +431,7 @@ def render_analysis_result(result: Dict[str, Any]):
     st.divider()
 
     # 탭으로 상세 정보 표시
-    tab1, tab2, tab3, tab4 = st.tabs(["🔍 리스크 분석", "📑 조항 비교", "💡 개선 제안", "📝 원문 분석"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔍 리스크 분석", "📑 조항 비교", "💡 개선 제안", "📝 원문 분석", "⏱️ 성능"])
 
     with tab1:
         render_risk_tab(result.get("risks", {}))
@@ -181,6 +445,9 @@ def render_analysis_result(result: Dict[str, Any]):
     with tab4:
         render_analysis_tab(result.get("analysis", {}))
 
+    with tab5:
+        render_performance_tab(result.get("performance", {}))
+
 
 def render_risk_tab(risks: Dict[str, Any]):
     """리스크 분석 탭"""
@@ -215,7 +482,7 @@ def render_comparison_tab(comparison: Dict[str, Any]):
     if isinstance(results, list) and results:
         for item in results:
             status = item.get("status", "")
-            icon = {"일치": "✅", "변경": "⚠️", "누락": "❌", "추가": "➕"}.get(status, "📌")
+            icon = {"일치": "✅", "변경": "⚠️", "누락": "❌", "미확인": "❔", "추가": "➕"}.get(status, "📌")
             assessment = item.get("assessment", "중립")
 
             with st.expander(f"{icon} {item.get('clause_name', '조항')} - {status}"):
@@ -237,17 +504,28 @@ def render_comparison_tab(comparison: Dict[str, Any]):
         for clause in missing:
             st.write(f"- {clause}")
 
+    # 정렬로 대응 조항을 찾지 못했고 LLM으로도 확인하지 못한 표준 조항
+    unconfirmed = comparison.get("unconfirmed_clauses", [])
+    if unconfirmed:
+        st.info("❔ 대응 여부를 확인하지 못한 표준 조항 (다른 제목의 조항에 포함되었을 수 있음)")
+        for clause in unconfirmed:
+            st.write(f"- {clause}")
+
 
 def render_improvement_tab(improvements: Dict[str, Any]):
     """개선 제안 탭"""
     st.subheader("💡 개선 제안사항")
 
+    if improvements.get("skipped") or improvements.get("timed_out"):
+        st.info(improvements.get("reason") or improvements.get("error"))
+        return
+
     priority_items = improvements.get("priority_improvements", [])
     if isinstance(priority_items, list) and priority_items:
         for item in priority_items:
             priority = item.get("priority", 3)
 
-            with st.expander(f"우선순위 {priority}: 조항 수정 제안"):
+            with st.expander(f"우선순위 {priority}: {item.get('clause_name', '조항')} 수정 제안"):
                 st.write("**현재 문구:**")
                 st.code(item.get("current_clause", "N/A"))
                 st.write("**제안 문구:**")
@@ -292,48 +570,115 @@ def render_analysis_tab(analysis: Dict[str, Any]):
             st.write(f"- **{clause.get('title', '')}**: {clause.get('summary', '')}")
 
 
+def render_performance_tab(performance: Dict[str, Any]):
+    """성능 탭 (현재 분석의 구간별 타임라인)"""
+    st.subheader("⏱️ 분석 성능")
+
+    spans = performance.get("spans", [])
+    if not spans:
+        st.info("성능 정보가 없습니다.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("총 소요시간", f"{performance.get('total_latency', 0):.1f}s")
+    with col2:
+        st.metric(
+            "토큰 (입력/출력)",
+            f"{performance.get('prompt_tokens', 0):,} / {performance.get('completion_tokens', 0):,}"
+        )
+    with col3:
+        st.metric(
+            "캐시 히트",
+            f"{performance.get('cache_hits', 0)}/{performance.get('llm_calls', 0)}회",
+            help=f"캐시된 토큰 {performance.get('cached_tokens', 0):,}"
+        )
+    with col4:
+        st.metric("예상 비용", f"${performance.get('cost_usd', 0):.4f}")
+
+    # 타임라인 (간트 차트)
+    import altair as alt
+
+    rows = [
+        {
+            "구간": f"{span['kind']} · {span['name']}",
+            "시작": span["start"],
+            "종료": span["start"] + span["duration"],
+            "소요(s)": span["duration"],
+            "유형": span["kind"],
+        }
+        for span in spans
+        if span["kind"] != "root"
+    ]
+    chart = alt.Chart(alt.Data(values=rows)).mark_bar().encode(
+        x=alt.X("시작:Q", title="경과 시간(초)"),
+        x2="종료:Q",
+        y=alt.Y("구간:N", sort=None, title=None),
+        color="유형:N",
+        tooltip=["구간:N", "소요(s):Q"]
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    # 노드별 상세
+    with st.expander("구간별 상세"):
+        for span in spans:
+            attributes = span.get("attributes", {})
+            detail = ", ".join(f"{k}={v}" for k, v in attributes.items())
+            st.write(f"- **{span['name']}** ({span['kind']}) {span['duration']:.2f}s {detail}")
+
+
 def render_chat_interface():
     """대화형 상담 인터페이스"""
     st.header("💬 AI 상담")
     st.write("분석 결과에 대해 추가로 궁금한 점을 질문하세요.")
 
-    # 채팅 히스토리 표시
-    for message in st.session_state.chat_history:
+    # 채팅 히스토리 표시 (최근 메시지만 보관)
+    for message in st.session_state.chat_memory.display:
         with st.chat_message(message["role"]):
             st.write(message["content"])
+            if message.get("cached"):
+                st.caption("⚡ 유사한 이전 질문의 답변을 재사용했습니다.")
 
     # 사용자 입력
     user_input = st.chat_input("질문을 입력하세요...")
 
     if user_input:
-        # 사용자 메시지 추가
-        st.session_state.chat_history.append({"role": "user", "content": user_input})
-
-        # AI 응답 생성
-        with st.spinner("답변을 생성중입니다..."):
-            response = generate_chat_response(user_input)
+        from rag.kb_snapshot import kb_scope
+        from utils.scheduler import workload
 
-        # AI 응답 추가
-        st.session_state.chat_history.append({"role": "assistant", "content": response})
+        # AI 응답 생성 (질문/답변은 대화 메모리에 함께 기록, 상담은 최우선 등급으로 스케줄링,
+        # 답변 캐시 키와 검색이 같은 지식 베이스 버전을 사용)
+        with st.spinner("답변을 생성중입니다..."), workload("chat", st.session_state.session_id), kb_scope():
+            generate_chat_response(user_input)
         st.rerun()
 
 
 def generate_chat_response(user_question: str) -> str:
     """채팅 응답 생성"""
-    from langchain_openai import AzureChatOpenAI
-    from langchain.schema import HumanMessage
-    from config.settings import azure_config
-    from prompts.templates import PromptTemplates
-    from rag.retriever import ContractRetriever
+    from agents.consultation_agent import ConsultationAgent
+    from config.settings import app_config
+    from rag.clause_index import ContractClauseIndex
 
+    memory = st.session_state.chat_memory
     try:
-        llm = AzureChatOpenAI(
-            azure_endpoint=azure_config.endpoint,
-            api_key=azure_config.api_key,
-            api_version=azure_config.api_version,
-            azure_deployment=azure_config.gpt4o_mini,
-            temperature=0.3
-        )
+        # 공용 LLM 클라이언트/Retriever를 재사용하는 상담 Agent
+        agent = ConsultationAgent()
+
+        # 같은 계약서·지식 베이스 버전에서 유사 질문의 답변이 있으면 재사용
+        cache_hit, question_vector, scope, kb_version = None, None, None, None
+        if app_config.semantic_cache_enabled:
+            from rag.semantic_cache import contract_hash, semantic_answer_cache
+            from rag.vectorstore import get_kb_version
+
+            scope = contract_hash(st.session_state.contract_text)
+            kb_version = get_kb_version()
+            cache_hit, question_vector = semantic_answer_cache.lookup(user_question, scope, kb_version)
+
+        if cache_hit:
+            memory.add("user", user_question)
+            memory.add("assistant", cache_hit["answer"], cached=True)
+            agent.compact_memory(memory)
+            return cache_hit["answer"]
 
         # 분석 결과 요약
         analysis_summary = ""
@@ -341,20 +686,25 @@ def generate_chat_response(user_question: str) -> str:
             summary = st.session_state.analysis_result.get("summary", {})
             analysis_summary = f"계약유형: {summary.get('contract_type', 'N/A')}, 리스크점수: {summary.get('risk_score', 'N/A')}"
 
-        # RAG 컨텍스트
-        retriever = ContractRetriever()
-        context = retriever.get_context_for_analysis(user_question, "general")
+        # 업로드한 계약서에서 질문과 관련된 조항만 검색
+        clause_index = get_clause_index()
+        clauses = clause_index.search(user_question, k=app_config.chat_clause_k) if clause_index else []
+        contract_clauses = ContractClauseIndex.format_context(clauses)
 
-        prompt = PromptTemplates.CONSULTATION.format(
+        answer = agent.answer(
+            user_question,
+            memory,
             analysis_summary=analysis_summary,
-            user_question=user_question,
-            context=context
+            contract_clauses=contract_clauses
         )
-
-        response = llm.invoke([HumanMessage(content=prompt)])
-        return response.content
+        if app_config.semantic_cache_enabled:
+            semantic_answer_cache.store(user_question, answer, scope, kb_version, question_vector)
+        return answer
     except Exception as e:
-        return f"죄송합니다. 응답 생성 중 오류가 발생했습니다: {str(e)}"
+        response = f"죄송합니다. 응답 생성 중 오류가 발생했습니다: {str(e)}"
+        memory.display.append({"role": "user", "content": user_question})
+        memory.display.append({"role": "assistant", "content": response})
+        return response
 
 
 def main():
@@ -371,27 +721,52 @@ def main():
 
     # 분석 실행
     if analyze_button:
-        contract_text = ""
-
-        if uploaded_file:
-            contract_text = process_uploaded_file(uploaded_file)
-        elif manual_input:
-            contract_text = manual_input
+        from config.settings import deadline_config
+        from utils.tracing import tracer
+
+        from graph.speculative import speculative_executor
+
+        with tracer.start_trace("analysis_request"):
+            contract_text = ""
+            speculation = None
+            # 선행 분석 대기 시간도 분석 SLA에 포함
+            request_start = time.monotonic()
+            sla_sec = deadline_config.default_sla_sec \
+                if deadline_config.enabled and deadline_config.default_sla_sec > 0 else None
+
+            if uploaded_file:
+                # 업로드 직후 시작한 선행 분석에 합류 (없으면 직접 추출, SLA 안에 끝나지 않으면 취소)
+                speculation = speculative_executor.attach(
+                    st.session_state.session_id, uploaded_file_key(uploaded_file), timeout=sla_sec
+                )
+                if speculation and speculation.get("contract_text"):
+                    contract_text = speculation["contract_text"]
+                else:
+                    contract_text = process_uploaded_file(uploaded_file)
+            elif manual_input:
+                speculative_executor.cancel(st.session_state.session_id)
+                contract_text = manual_input
+
+            if contract_text:
+                st.session_state.contract_text = contract_text
+
+                remaining = None
+                if sla_sec is not None:
+                    # 0은 제한 없음으로 처리되므로 남은 시간이 없으면 최소값으로 (모든 단계 생략, 부분 리포트)
+                    remaining = max(0.001, sla_sec - (time.monotonic() - request_start))
+                analyze_contract(contract_text, speculation, sla_sec=remaining)
 
         if contract_text:
-            st.session_state.contract_text = contract_text
-
-            with st.spinner("🔍 계약서를 분석중입니다... (약 1-2분 소요)"):
-                result = run_analysis(contract_text)
-                st.session_state.analysis_result = result
-
-            st.success("✅ 분석이 완료되었습니다!")
+            if st.session_state.analysis_result:
+                st.success("✅ 분석이 완료되었습니다!")
             st.rerun()
         else:
             st.warning("⚠️ 계약서를 업로드하거나 내용을 입력해주세요.")
 
     # 결과 표시
-    if st.session_state.analysis_result:
+    if st.session_state.reuse_offer:
+        render_reuse_offer()
+    elif st.session_state.analysis_result:
         render_analysis_result(st.session_state.analysis_result)
         st.divider()
         render_chat_interface()
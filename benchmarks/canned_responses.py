@@ -0,0 +1,217 @@
+"""
+ContractGuard AI - 벤치마크용 고정 응답 모듈
+PromptTemplates 출력 스키마에 맞는 결정적(deterministic) JSON 응답 생성
+"""
+import hashlib
+import json
+import math
+import re
+from typing import Any, Dict, List
+
+from prompts.templates import PromptTemplates
+
+
+# 시스템 프롬프트 → 템플릿 이름 판별 순서
+TEMPLATE_NAMES = [
+    "CONTRACT_ANALYZER_COMPACT",
+    "RISK_EVALUATOR_COMPACT",
+    "CLAUSE_COMPARATOR_COMPACT",
+    "IMPROVEMENT_ADVISOR_COMPACT",
+    "CONTRACT_ANALYZER",
+    "RISK_EVALUATOR",
+    "CLAUSE_COMPARATOR",
+    "CLAUSE_PAIR_ASSESSOR",
+    "IMPROVEMENT_ADVISOR",
+    "CONSULTATION",
+    "CHAT_SUMMARY",
+]
+
+
+def detect_template(system_prompt: str) -> str:
+    """시스템 프롬프트로부터 템플릿 이름 판별"""
+    for name in TEMPLATE_NAMES:
+        if getattr(PromptTemplates, f"{name}_SYSTEM") in system_prompt:
+            return name
+    return "UNKNOWN"
+
+
+def _article_titles(text: str) -> List[str]:
+    """프롬프트 본문에서 조항 제목 추출"""
+    return re.findall(r'제\s*\d+\s*조\s*\([^)\n]*\)', text)
+
+
+def _clause_refs(text: str) -> List[tuple]:
+    """간결 출력 프롬프트의 (조항 ID, 조항 제목) 목록"""
+    return re.findall(r'\[(c\d+)\]\s*(제\s*\d+\s*조[^\n]*)', text)
+
+
+def hash_embedding(text: str, dimensions: int) -> List[float]:
+    """문자 bigram 해싱 기반 결정적 임베딩 (비슷한 문장은 비슷한 벡터)"""
+    vector = [0.0] * dimensions
+    compact = "".join(text.split())
+    for i in range(len(compact) - 1):
+        digest = hashlib.md5(compact[i:i + 2].encode("utf-8")).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _as_json_block(payload: Dict[str, Any]) -> str:
+    return "```json\n" + json.dumps(payload, ensure_ascii=False, indent=2) + "\n```"
+
+
+def _compact_response(name: str, user_prompt: str) -> str:
+    """간결 출력 템플릿 응답 (네이티브 구조화 출력처럼 코드 블록 없는 JSON)"""
+    refs = _clause_refs(user_prompt)
+    risky = [cid for cid, title in refs if any(k in title for k in ("손해배상", "해지", "지식재산권", "위약금"))]
+
+    if name == "CONTRACT_ANALYZER_COMPACT":
+        payload = {
+            "contract_type": "용역계약",
+            "party_a": "갑", "party_b": "을",
+            "amount": "금 오천만원", "period": "6개월", "subject": "소프트웨어 개발 용역",
+            "clauses": [{"id": cid, "summary": "당사자 의무 규정"} for cid, _ in refs],
+        }
+    elif name == "RISK_EVALUATOR_COMPACT":
+        payload = {
+            "risk_score": min(100, 30 + 10 * len(risky)),
+            "risk_level": "상" if len(risky) >= 3 else "중",
+            "risks": [
+                {
+                    "id": cid,
+                    "risk_type": "불리한 조항",
+                    "severity": "상" if "손해배상" in title else "중",
+                    "description": "을에게 불리하게 작성됨",
+                    "legal_basis": "민법 제393조"
+                }
+                for cid, title in refs if cid in risky
+            ],
+            "safe": [cid for cid, _ in refs if cid not in risky][:10],
+        }
+    elif name == "CLAUSE_COMPARATOR_COMPACT":
+        payload = {
+            "results": [
+                {
+                    "id": cid,
+                    "status": "변경" if i % 3 == 0 else "일치",
+                    "assessment": "불리" if i % 3 == 0 else "중립",
+                    "standard": "표준 문구 대비 의무 확대" if i % 3 == 0 else "표준과 동일",
+                }
+                for i, (cid, _) in enumerate(refs)
+            ],
+            "missing": ["불가항력"],
+            "summary": f"{len(refs)}개 조항 비교 완료",
+        }
+    else:
+        payload = {
+            "items": [
+                {
+                    "priority": 1,
+                    "id": risky[0] if risky else None,
+                    "suggested_clause": "손해배상은 계약금액을 한도로 한다.",
+                    "reason": "무제한 손해배상 위험",
+                    "tip": "업계 관행상 계약금액 한도를 제안"
+                }
+            ],
+            "must_change": risky[:1],
+            "negotiable": ["비밀유지 기간"],
+            "overall": "손해배상 및 해지 조항 수정 후 서명을 권고합니다.",
+        }
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def canned_response(system_prompt: str, user_prompt: str) -> str:
+    """템플릿별 스키마에 맞는 응답 생성 (입력 크기에 비례해 출력 크기도 증가)"""
+    name = detect_template(system_prompt)
+    titles = _article_titles(user_prompt)
+
+    if name.endswith("_COMPACT"):
+        return _compact_response(name, user_prompt)
+
+    if name == "CONTRACT_ANALYZER":
+        return _as_json_block({
+            "contract_type": "용역계약",
+            "parties": {"party_a": "갑", "party_b": "을"},
+            "key_terms": {
+                "amount": "금 오천만원",
+                "period": "6개월",
+                "subject": "소프트웨어 개발 용역"
+            },
+            "clauses_summary": [
+                {"title": title, "summary": f"{title}에 관한 사항"} for title in titles
+            ]
+        })
+
+    if name == "RISK_EVALUATOR":
+        risky = [t for t in titles if any(k in t for k in ("손해배상", "해지", "지식재산권", "위약금"))]
+        return _as_json_block({
+            "risk_score": min(100, 30 + 10 * len(risky)),
+            "risk_level": "상" if len(risky) >= 3 else "중",
+            "risks": [
+                {
+                    "clause": title,
+                    "risk_type": "불리한 조항",
+                    "severity": "상" if "손해배상" in title else "중",
+                    "description": f"{title}이 을에게 불리하게 작성됨",
+                    "legal_basis": "민법 제393조"
+                }
+                for title in risky
+            ],
+            "safe_clauses": [t for t in titles if t not in risky][:10]
+        })
+
+    if name == "CLAUSE_COMPARATOR":
+        return _as_json_block({
+            "comparison_results": [
+                {
+                    "clause_name": title,
+                    "status": "변경" if i % 3 == 0 else "일치",
+                    "current": f"{title} 현재 문구",
+                    "standard": f"{title} 표준 문구",
+                    "assessment": "불리" if i % 3 == 0 else "중립"
+                }
+                for i, title in enumerate(titles)
+            ],
+            "missing_clauses": ["불가항력"],
+            "summary": f"{len(titles)}개 조항 비교 완료"
+        })
+
+    if name == "CLAUSE_PAIR_ASSESSOR":
+        pair_ids = re.findall(r'\[(p\d+)\]', user_prompt)
+        return _as_json_block({
+            "assessments": [
+                {
+                    "id": pair_id,
+                    "corresponds": True,
+                    "assessment": "불리" if i % 2 == 0 else "중립",
+                    "difference": "표준 대비 을의 책임이 확대됨"
+                }
+                for i, pair_id in enumerate(pair_ids)
+            ],
+            "summary": f"변경 조항 {len(pair_ids)}개 평가 완료"
+        })
+
+    if name == "IMPROVEMENT_ADVISOR":
+        return _as_json_block({
+            "priority_improvements": [
+                {
+                    "priority": 1,
+                    "current_clause": "손해배상의 한도는 없다.",
+                    "suggested_clause": "손해배상은 계약금액을 한도로 한다.",
+                    "reason": "무제한 손해배상 위험",
+                    "negotiation_tip": "업계 관행상 계약금액 한도를 제안"
+                }
+            ],
+            "must_change": ["손해배상 한도"],
+            "negotiable": ["비밀유지 기간"],
+            "overall_recommendation": "손해배상 및 해지 조항 수정 후 서명을 권고합니다."
+        })
+
+    if name == "CONSULTATION":
+        return "해당 조항은 을에게 불리할 수 있으므로 수정 협상을 권장합니다. 실제 법률 판단은 변호사와 상담하세요."
+
+    if name == "CHAT_SUMMARY":
+        return f"- 사용자가 {', '.join(titles) or '계약 조항'}에 대해 질문함\n- 불리한 조항은 수정 협상을 권고함"
+
+    return _as_json_block({"result": "ok"})
@@ -0,0 +1,90 @@
+"""
+ContractGuard AI - 합성 계약서 생성 모듈
+벤치마크용 한국어 계약서를 1~200개 조항 규모로 결정적으로 생성
+"""
+import random
+from typing import List, Tuple
+
+
+# (조항명, 본문 후보) - 일부는 리스크 지표를 포함
+ARTICLE_POOL: List[Tuple[str, List[str]]] = [
+    ("목적", [
+        '"갑"은 "을"에게 {subject} 용역을 위탁하고, "을"은 이를 성실히 수행한다.',
+    ]),
+    ("용역 내용", [
+        "1. 프로젝트명: {subject}\n2. 수행 범위: 요구사항 분석, 설계, 개발, 테스트 및 운영 이관",
+    ]),
+    ("계약 금액", [
+        "1. 총 용역대금은 금 {amount}원으로 한다.\n2. 대금 지급: 착수금 30%, 중도금 30%, 잔금 40%",
+        "총 용역대금은 금 {amount}원(부가세 별도)으로 하며 검수 완료 후 일시 지급한다.",
+    ]),
+    ("계약 기간", [
+        "계약기간은 {year}년 1월 1일부터 {year}년 12월 31일까지로 한다.",
+    ]),
+    ("손해배상", [
+        '"을"이 본 계약을 위반하여 "갑"에게 손해를 입힌 경우, 직접손해, 간접손해, 특별손해를 포함한 모든 손해를 배상한다. 손해배상의 한도는 없다.',
+        "각 당사자는 상대방에게 발생한 통상손해를 배상하며, 배상액은 계약금액을 한도로 한다.",
+    ]),
+    ("비밀유지", [
+        "쌍방은 본 계약과 관련하여 알게 된 상대방의 비밀정보를 {years}년간 유지하여야 한다.",
+    ]),
+    ("계약해지", [
+        '"갑"은 사전 통지 없이 언제든지 본 계약을 해지할 수 있다.',
+        "당사자 일방이 계약을 위반한 경우 상대방은 14일 이상의 기간을 정하여 시정을 최고하고, 시정되지 않으면 계약을 해지할 수 있다.",
+    ]),
+    ("지식재산권", [
+        '본 계약에 따른 모든 성과물과 "을"의 기존 기술을 포함한 모든 지식재산권은 "갑"에게 귀속된다.',
+        '성과물의 지식재산권은 "갑"에게 귀속되며, "을"의 기존 기술은 "을"에게 유보된다.',
+    ]),
+    ("위약금", [
+        '"을"이 납기를 지연하는 경우 지연일수 1일당 계약금액의 {penalty}%를 위약금으로 지급한다.',
+    ]),
+    ("검수", [
+        '"갑"은 성과물 인도일로부터 14일 이내에 검수를 완료하여야 한다.',
+    ]),
+    ("하자보수", [
+        '"을"은 검수 완료일로부터 12개월간 무상으로 하자를 보수한다.',
+    ]),
+    ("재위탁 금지", [
+        '"을"은 "갑"의 사전 서면 동의 없이 용역의 전부 또는 일부를 제3자에게 재위탁할 수 없다.',
+    ]),
+    ("불가항력", [
+        "천재지변 등 불가항력으로 인한 의무 불이행에 대하여는 책임을 지지 아니한다.",
+    ]),
+    ("분쟁해결", [
+        '본 계약에 관한 분쟁은 "갑"의 본사 소재지 관할법원을 전속관할로 한다.',
+        "본 계약에 관한 분쟁은 대한상사중재원의 중재에 의하여 최종 해결한다.",
+    ]),
+]
+
+
+def generate_contract(num_articles: int, seed: int = 0) -> str:
+    """합성 용역계약서 생성
+
+    Args:
+        num_articles: 조항 수 (1~200)
+        seed: 난수 시드 (같은 시드는 같은 계약서 생성)
+    """
+    rng = random.Random(seed)
+    values = {
+        "subject": rng.choice(["AI 챗봇 시스템 개발", "ERP 고도화", "모바일 앱 구축", "데이터 플랫폼 구축"]),
+        "amount": f"{rng.randint(10, 900) * 1_000_000:,}",
+        "year": rng.randint(2023, 2026),
+        "years": rng.choice([3, 5, 10]),
+        "penalty": rng.choice(["0.1", "0.3", "1"]),
+    }
+
+    lines = ["용역계약서", ""]
+    for number in range(1, num_articles + 1):
+        if number <= len(ARTICLE_POOL):
+            title, bodies = ARTICLE_POOL[number - 1]
+        else:
+            # 풀을 넘어서는 조항은 세부 조건 조항으로 채움
+            base_title, bodies = ARTICLE_POOL[rng.randrange(len(ARTICLE_POOL))]
+            title = f"{base_title} 세부사항 {number}"
+        body = rng.choice(bodies).format(**values)
+        lines.append(f"제{number}조 ({title})")
+        lines.append(body)
+        lines.append("")
+
+    return "\n".join(lines).strip()
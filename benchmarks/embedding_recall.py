@@ -0,0 +1,170 @@
+"""
+ContractGuard AI - 임베딩 차원/양자화 벤치마크
+지식 베이스 청크 + 생성 계약서 조항 코퍼스에서 차원 축소와 int8/이진 양자화 조합별로
+전체 차원 float 인덱스 대비 recall@k, 검색 스캔 메모리, 질의 지연을 측정
+
+차원 축소는 전체 차원 임베딩의 앞쪽 차원을 잘라 재정규화하여 재현합니다.
+(text-embedding-3 모델에 dimensions를 요청한 결과와 같으므로 조합마다 다시 임베딩하지 않음)
+
+사용법:
+    python -m benchmarks.embedding_recall --corpus 5000 --queries 200 --k 5
+    python -m benchmarks.embedding_recall --embeddings azure --dimensions 3072 1024 512 256
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.contract_generator import generate_contract
+from benchmarks.fakes import FakeEmbeddings
+from benchmarks.run_benchmark import percentile
+
+
+def build_texts(corpus_size: int, query_count: int, seed: int) -> Tuple[List[str], List[str]]:
+    """코퍼스(지식 베이스 청크 + 계약서 조항)와 질의(다른 시드의 계약서 조항) 텍스트"""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    from config.settings import app_config
+    from rag.vectorstore import load_knowledge_documents
+    from utils.text_processor import TextProcessor
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=app_config.chunk_size, chunk_overlap=app_config.chunk_overlap
+    )
+    corpus = [chunk.page_content for chunk in splitter.split_documents(load_knowledge_documents())]
+
+    def clauses(count: int, base_seed: int) -> List[str]:
+        texts: List[str] = []
+        contract_seed = base_seed
+        while len(texts) < count:
+            for clause in TextProcessor.extract_clauses(generate_contract(50, seed=contract_seed)):
+                texts.append(f"{clause['title']}\n{clause['content']}")
+            contract_seed += 1
+        return texts[:count]
+
+    corpus += clauses(max(0, corpus_size - len(corpus)), seed)
+    # 생성기는 같은 조항 문구를 반복하므로 중복 제거 (동점 순위로 recall이 흔들리지 않도록)
+    corpus = list(dict.fromkeys(corpus))
+    known = set(corpus)
+    queries = [text for text in dict.fromkeys(clauses(query_count * 20, seed + 100_000)) if text not in known]
+    return corpus, queries[:query_count]
+
+
+def embed(texts: List[str], backend: str, batch_size: int = 256) -> np.ndarray:
+    """전체 차원 임베딩 (fake: 3072차원 해싱 임베딩, azure: 설정된 임베딩 배포 기본 차원)"""
+    if backend == "azure":
+        from langchain_openai import AzureOpenAIEmbeddings
+
+        from config.settings import azure_config
+
+        embeddings = AzureOpenAIEmbeddings(
+            azure_endpoint=azure_config.endpoint,
+            api_key=azure_config.api_key,
+            api_version=azure_config.api_version,
+            azure_deployment=azure_config.embed_large
+        )
+    else:
+        embeddings = FakeEmbeddings(dimensions=3072, latency=0.0)
+
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(embeddings.embed_documents(texts[start:start + batch_size]))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def evaluate(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    dimensions: List[int],
+    quantizations: List[str],
+    k: int,
+    rescore_factor: int
+) -> List[Dict[str, Any]]:
+    """조합별 recall@k (전체 차원 float 인덱스의 top-k 기준), 스캔 메모리, 질의 지연"""
+    from rag.vector_index import VectorIndex, normalize, truncate_dimensions
+
+    k = min(k, corpus.shape[0])
+    # 정답: 전체 차원 float 점수의 k번째 값 이상인 문서 (동점 문서는 어느 것을 골라도 정답)
+    reference_scores = normalize(queries) @ normalize(corpus).T
+    thresholds = -np.partition(-reference_scores, k - 1, axis=1)[:, k - 1] - 1e-6
+
+    rows = []
+    for dims in dimensions:
+        dims = min(dims, corpus.shape[1])
+        corpus_vectors = truncate_dimensions(corpus, dims)
+        query_vectors = truncate_dimensions(queries, dims)
+        for quantization in quantizations:
+            index = VectorIndex(corpus_vectors, quantization, rescore_factor=rescore_factor)
+            hits, latencies = 0, []
+            for i, query in enumerate(query_vectors):
+                start = time.perf_counter()
+                found = index.search(query, k)
+                latencies.append(time.perf_counter() - start)
+                hits += int(np.count_nonzero(reference_scores[i, found] >= thresholds[i]))
+            rows.append({
+                "dimensions": dims,
+                "quantization": quantization,
+                f"recall@{k}": hits / (len(query_vectors) * k),
+                "scan_mb": index.memory_bytes() / (1024 * 1024),
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI 임베딩 차원/양자화 recall 벤치마크")
+    parser.add_argument("--embeddings", choices=["fake", "azure"], default="fake",
+                        help="fake: 오프라인 해싱 임베딩, azure: 실제 임베딩 배포 (권장)")
+    parser.add_argument("--corpus", type=int, default=5000, help="최대 코퍼스 크기 (중복 제거 전 청크/조항 수)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[3072, 1536, 1024, 512, 256])
+    parser.add_argument("--quantization", nargs="+", default=["none", "int8", "binary"],
+                        choices=["none", "int8", "binary"])
+    parser.add_argument("--rescore-factor", type=int, default=4, help="float 재채점 후보 배수 (top-k × 배수)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    corpus_texts, query_texts = build_texts(args.corpus, args.queries, args.seed)
+    start = time.perf_counter()
+    vectors = embed(corpus_texts + query_texts, args.embeddings)
+    print(f"📐 {len(corpus_texts):,}개 코퍼스 + {len(query_texts):,}개 질의 임베딩 "
+          f"({vectors.shape[1]}차원, {time.perf_counter() - start:.1f}초)")
+
+    rows = evaluate(
+        vectors[:len(corpus_texts)],
+        vectors[len(corpus_texts):],
+        args.dimensions,
+        args.quantization,
+        args.k,
+        args.rescore_factor
+    )
+
+    if args.embeddings == "fake":
+        print("ℹ️ 해싱 임베딩은 앞쪽 차원에 정보가 몰려 있지 않아 차원 축소 recall은 실제 모델보다 낮게 나옵니다. "
+              "차원 선택은 --embeddings azure 결과를 기준으로 하세요.")
+
+    recall_key = f"recall@{args.k}"
+    print(f"\n{'차원':>6s} {'양자화':>8s} {recall_key:>10s} {'스캔 MB':>9s} {'p50 ms':>8s} {'p95 ms':>8s}")
+    for row in rows:
+        print(
+            f"{row['dimensions']:6d} {row['quantization']:>8s} {row[recall_key]:10.3f} "
+            f"{row['scan_mb']:9.2f} {row['p50_ms']:8.3f} {row['p95_ms']:8.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+ContractGuard AI - 벤치마크용 가짜 LLM/임베딩 모듈
+Azure 호출 없이 결정적 응답과 설정 가능한 지연시간을 제공
+"""
+import hashlib
+import random
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from utils.text_processor import TextProcessor
+from .canned_responses import canned_response, hash_embedding
+
+
+# Azure 프롬프트 캐시 동작 모사: 1024 토큰 이상, 128 토큰 단위로 캐시
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+class FakeChatModel(BaseChatModel):
+    """AzureChatOpenAI 대체용 결정적 Chat 모델"""
+
+    latency: float = 0.05
+    """호출당 기본 지연시간(초)"""
+    per_token_latency: float = 0.0
+    """출력 토큰당 추가 지연시간(초)"""
+    jitter: float = 0.0
+    """지연시간 변동 비율 (0.1 = ±10%)"""
+    seed: int = 42
+
+    _rng: random.Random = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _seen_prefixes: set = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-azure-chat"
+
+    def _sleep(self, completion_tokens: int):
+        with self._lock:
+            factor = 1 + self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 1
+        delay = (self.latency + self.per_token_latency * completion_tokens) * factor
+        if delay > 0:
+            time.sleep(delay)
+
+    def _cached_tokens(self, system_prompt: str, system_tokens: int) -> int:
+        """동일 시스템 프리픽스 재사용 시 캐시 토큰 수 계산"""
+        key = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+        if not seen or system_tokens < CACHE_MIN_TOKENS:
+            return 0
+        return system_tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        system_prompt = "".join(m.content for m in messages if isinstance(m, SystemMessage))
+        user_prompt = "".join(m.content for m in messages if not isinstance(m, SystemMessage))
+        content = canned_response(system_prompt, user_prompt)
+
+        system_tokens = TextProcessor.count_tokens_approx(system_prompt)
+        prompt_tokens = system_tokens + TextProcessor.count_tokens_approx(user_prompt)
+        completion_tokens = TextProcessor.count_tokens_approx(content)
+        cached_tokens = self._cached_tokens(system_prompt, system_tokens)
+
+        self._sleep(completion_tokens)
+
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_token_details": {"cache_read": cached_tokens},
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeEmbeddings(Embeddings):
+    """AzureOpenAIEmbeddings 대체용 결정적 임베딩 (문자 bigram 해싱)"""
+
+    def __init__(self, dimensions: int = 256, latency: float = 0.01, per_text_latency: float = 0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency + self.per_text_latency * len(texts))
+        return [hash_embedding(text, self.dimensions) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return hash_embedding(text, self.dimensions)
@@ -0,0 +1,118 @@
+"""
+ContractGuard AI - import 시간 프로파일러
+새 Python 프로세스에서 진입 모듈을 `-X importtime`으로 import하여
+콜드 스타트(워커 생성) 비용과 가장 무거운 의존성, 시작 시 로드되면 안 되는 모듈을 보고
+
+사용법:
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --modules graph.workflow --top 30
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 앱/워커 시작 시 로드되는 진입 모듈
+DEFAULT_MODULES = [
+    "config.settings",
+    "utils.document_loader",
+    "rag.vectorstore",
+    "agents.base_agent",
+    "graph.workflow",
+]
+
+# 시작 시 로드되면 안 되는 모듈 (실제로 사용할 때 지연 로드)
+LAZY_MODULES = [
+    "PyPDF2",
+    "docx",
+    "chromadb",
+    "langchain_openai",
+    "langchain.agents",
+    "langchain.hub",
+]
+
+
+def profile_module(module: str) -> Dict[str, Any]:
+    """새 프로세스에서 모듈 하나를 import하고 모듈별 누적 import 시간(μs) 수집"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": PROJECT_ROOT},
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{completed.stderr[-2000:]}")
+
+    # 형식: "import time: self [us] | cumulative | imported package"
+    imports: List[Tuple[str, int, int]] = []  # (모듈, 자체 μs, 누적 μs)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        imports.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+
+    cumulative = {name: cum for name, _, cum in imports}
+    return {
+        "module": module,
+        "wall_ms": wall * 1000,
+        "import_ms": cumulative.get(module, 0) / 1000,
+        "imports": imports,
+        "loaded": set(cumulative),
+    }
+
+
+def heaviest_packages(imports: List[Tuple[str, int, int]], top: int) -> List[Tuple[str, float]]:
+    """최상위 패키지별 자체 import 시간 합계(ms) 상위 목록 (하위 모듈 포함, 다른 패키지 제외)"""
+    packages: Dict[str, float] = {}
+    for name, self_us, _ in imports:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0.0) + self_us / 1000
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def bench_imports(modules: List[str] = None) -> Dict[str, float]:
+    """진입 모듈별 콜드 import 시간(ms) (run_benchmark 기준선 비교용)"""
+    metrics = {}
+    for module in modules or DEFAULT_MODULES:
+        result = profile_module(module)
+        metrics[f"startup.{module}.import_ms"] = result["import_ms"]
+        metrics[f"startup.{module}.process_ms"] = result["wall_ms"]
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI import 시간 프로파일")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="프로파일할 진입 모듈")
+    parser.add_argument("--top", type=int, default=10, help="모듈별로 보여줄 무거운 패키지 수")
+    args = parser.parse_args()
+
+    violations = []
+    for module in args.modules:
+        result = profile_module(module)
+        print(f"\n{module}: import {result['import_ms']:.0f}ms (프로세스 전체 {result['wall_ms']:.0f}ms)")
+        for package, ms in heaviest_packages(result["imports"], args.top):
+            print(f"  {package:40s} {ms:8.1f}ms")
+        eager = [name for name in LAZY_MODULES if name in result["loaded"]]
+        if eager:
+            violations.append(f"{module}: {', '.join(eager)}")
+
+    if violations:
+        print("\n⚠️ 시작 시 로드되면 안 되는 모듈:")
+        for violation in violations:
+            print(f"  - {violation}")
+        sys.exit(1)
+    print("\n✅ 지연 로드 대상 모듈이 시작 시 로드되지 않음")
+
+
+if __name__ == "__main__":
+    main()
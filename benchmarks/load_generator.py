@@ -0,0 +1,152 @@
+"""
+ContractGuard AI - 동시 사용자 부하 생성기
+로컬 Azure OpenAI 대체 서버를 띄우고 N명의 사용자가 동시에
+ContractAnalysisWorkflow.run을 호출하는 상황을 재현하여 처리량/꼬리 지연 측정
+
+사용법:
+    python -m benchmarks.load_generator --users 20 --requests 5 --latency lognormal:-1,0.5 --tpm 200000
+    python -m benchmarks.load_generator --endpoint http://127.0.0.1:8765/   # 이미 떠 있는 서버 사용
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.contract_generator import generate_contract
+from benchmarks.mock_azure_server import add_server_arguments, build_mock, start_server
+from benchmarks.run_benchmark import percentile
+
+
+def configure_endpoint(endpoint: str, workdir: str):
+    """Azure 설정을 로컬 서버로 전환하고 임시 지식 베이스 구축"""
+    from config.settings import (
+        app_config, azure_config, checkpoint_config, clause_cache_config, result_store_config
+    )
+    from rag.vectorstore import VectorStoreManager, initialize_knowledge_base
+
+    azure_config.endpoint = endpoint
+    azure_config.api_key = "mock-api-key"
+    app_config.vectorstore_dir = os.path.join(workdir, "vectorstore")
+    checkpoint_config.db_path = os.path.join(workdir, "checkpoints.db")
+    clause_cache_config.db_path = os.path.join(workdir, "clause_cache.db")
+    result_store_config.db_path = os.path.join(workdir, "results.db")
+    initialize_knowledge_base(VectorStoreManager())
+
+
+def simulate_user(user_id: int, args: argparse.Namespace, results: List[Dict[str, Any]], lock: threading.Lock):
+    """사용자 1명: 분석 버튼을 누를 때마다 새 워크플로우로 분석 실행 (Streamlit 흐름과 동일)"""
+    from graph.workflow import ContractAnalysisWorkflow
+
+    rng = random.Random(args.seed + user_id)
+    for request_index in range(args.requests):
+        size = rng.choice(args.sizes)
+        contract = generate_contract(size, seed=rng.randrange(1_000_000))
+
+        start = time.perf_counter()
+        workflow = ContractAnalysisWorkflow()
+        report = workflow.run(contract, thread_id=f"load-{user_id}-{request_index}")
+        latency = time.perf_counter() - start
+
+        with lock:
+            results.append({
+                "user": user_id,
+                "articles": size,
+                "latency": latency,
+                "error": report.get("error"),
+            })
+
+        if args.think_time:
+            time.sleep(rng.uniform(0, args.think_time))
+
+
+def fetch_server_stats(endpoint: str) -> Dict[str, Any]:
+    """대체 서버 통계 조회"""
+    try:
+        with urllib.request.urlopen(endpoint.rstrip("/") + "/stats", timeout=5) as response:
+            return json.loads(response.read())
+    except OSError:
+        return {}
+
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """처리량 및 꼬리 지연 요약"""
+    succeeded = [r["latency"] for r in results if not r["error"]]
+    return {
+        "requests": len(results),
+        "errors": sum(1 for r in results if r["error"]),
+        "elapsed_sec": elapsed,
+        "throughput_per_min": len(succeeded) / elapsed * 60 if elapsed else 0.0,
+        "latency_p50": percentile(succeeded, 50),
+        "latency_p95": percentile(succeeded, 95),
+        "latency_p99": percentile(succeeded, 99),
+        "latency_max": max(succeeded, default=0.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI 동시 사용자 부하 생성기")
+    parser.add_argument("--users", type=int, default=10, help="동시 사용자 수")
+    parser.add_argument("--requests", type=int, default=3, help="사용자당 분석 요청 수")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 20, 50], help="계약서 조항 수 후보")
+    parser.add_argument("--think-time", type=float, default=0.0, help="요청 사이 최대 대기(초)")
+    parser.add_argument("--endpoint", help="외부 대체 서버 주소 (미지정 시 내장 서버 실행)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    from utils.tracing import tracer
+    tracer.enabled = False
+
+    server = None
+    endpoint = args.endpoint
+    if not endpoint:
+        server, _ = start_server(mock=build_mock(args))
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}/"
+        print(f"🚀 내장 Mock Azure OpenAI 서버: {endpoint}")
+
+    results: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_endpoint(endpoint, workdir)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            futures = [
+                executor.submit(simulate_user, user_id, args, results, lock)
+                for user_id in range(args.users)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+    summary = summarize(results, elapsed)
+    summary["server"] = fetch_server_stats(endpoint)
+
+    print(f"\n👥 사용자 {args.users}명 × 요청 {args.requests}회")
+    for key, value in summary.items():
+        if key != "server":
+            print(f"  {key:20s} {value:,.3f}" if isinstance(value, float) else f"  {key:20s} {value}")
+    if summary["server"]:
+        print("  server:", json.dumps(summary["server"], ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+ContractGuard AI - 로컬 Azure OpenAI 대체 서버
+chat/completions, embeddings 프로토콜을 모사하여 할당량 소모 없이 부하 테스트
+
+사용법:
+    python -m benchmarks.mock_azure_server --port 8765 --latency lognormal:-0.7,0.4 --error-rate 0.02
+    # 앱/워크플로우를 서버에 연결
+    AOAI_ENDPOINT=http://127.0.0.1:8765/ AOAI_API_KEY=dummy streamlit run app.py
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.canned_responses import canned_response, hash_embedding
+from utils.text_processor import TextProcessor
+
+
+ROUTE_PATTERN = re.compile(r"^/openai/deployments/([^/]+)/(chat/completions|embeddings)$")
+
+# Azure 프롬프트 캐시 동작 모사: 1024 토큰 이상, 128 토큰 단위로 캐시
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+class LatencyModel:
+    """응답 지연시간 분포
+
+    spec 형식:
+        fixed:0.5              고정 0.5초
+        uniform:0.2,0.8        균등분포
+        normal:0.5,0.1         정규분포 (평균, 표준편차)
+        lognormal:-0.7,0.4     로그정규분포 (mu, sigma)
+    """
+
+    def __init__(self, spec: str = "fixed:0", per_token: float = 0.0, seed: int = 42):
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self.per_token = per_token
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, completion_tokens: int = 0) -> float:
+        with self._lock:
+            if self.kind == "uniform":
+                base = self._rng.uniform(*self.params)
+            elif self.kind == "normal":
+                base = self._rng.gauss(*self.params)
+            elif self.kind == "lognormal":
+                base = self._rng.lognormvariate(*self.params)
+            else:
+                base = self.params[0] if self.params else 0.0
+        return max(0.0, base + self.per_token * completion_tokens)
+
+
+class RateLimiter:
+    """배포별 분당 요청/토큰 한도 (토큰 버킷)"""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, deployment: str, tokens: int) -> Optional[float]:
+        """한도 내면 None, 초과 시 재시도까지 대기할 초 반환"""
+        if not self.rpm and not self.tpm:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(
+                deployment, {"requests": self.rpm, "tokens": self.tpm, "updated": now}
+            )
+            elapsed = now - bucket["updated"]
+            bucket["updated"] = now
+            if self.rpm:
+                bucket["requests"] = min(self.rpm, bucket["requests"] + elapsed * self.rpm / 60)
+            if self.tpm:
+                bucket["tokens"] = min(self.tpm, bucket["tokens"] + elapsed * self.tpm / 60)
+
+            waits = []
+            if self.rpm and bucket["requests"] < 1:
+                waits.append((1 - bucket["requests"]) * 60 / self.rpm)
+            if self.tpm and bucket["tokens"] < tokens:
+                waits.append((tokens - bucket["tokens"]) * 60 / self.tpm)
+            if waits:
+                return max(waits)
+
+            if self.rpm:
+                bucket["requests"] -= 1
+            if self.tpm:
+                bucket["tokens"] -= tokens
+        return None
+
+
+class MockAzureOpenAI:
+    """서버 동작 설정 및 통계"""
+
+    def __init__(
+        self,
+        latency: LatencyModel,
+        rate_limiter: RateLimiter,
+        error_rate: float = 0.0,
+        embedding_dimensions: int = 256,
+        seed: int = 42
+    ):
+        self.latency = latency
+        self.rate_limiter = rate_limiter
+        self.error_rate = error_rate
+        self.embedding_dimensions = embedding_dimensions
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+        self.stats = {
+            "requests": 0,
+            "chat_requests": 0,
+            "embedding_requests": 0,
+            "rate_limited": 0,
+            "injected_errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+        }
+
+    def count(self, **increments: int):
+        with self._lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def inject_error(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def cached_tokens(self, system_prompt: str, system_tokens: int) -> int:
+        key = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+        if not seen or system_tokens < CACHE_MIN_TOKENS:
+            return 0
+        return system_tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+
+    def chat_completion(self, deployment: str, body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """chat/completions 응답 본문과 출력 토큰 수"""
+        messages = body.get("messages", [])
+        system_prompt = "".join(_content_text(m) for m in messages if m.get("role") == "system")
+        user_prompt = "".join(_content_text(m) for m in messages if m.get("role") != "system")
+        content = canned_response(system_prompt, user_prompt)
+
+        system_tokens = TextProcessor.count_tokens_approx(system_prompt)
+        prompt_tokens = system_tokens + TextProcessor.count_tokens_approx(user_prompt)
+        completion_tokens = TextProcessor.count_tokens_approx(content)
+        cached = self.cached_tokens(system_prompt, system_tokens)
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": deployment,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }, completion_tokens
+
+    def embeddings(self, deployment: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """embeddings 응답 본문 (토큰 ID 배열 입력 및 base64 인코딩 지원)"""
+        inputs = body.get("input", [])
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or self.embedding_dimensions
+        encoding = body.get("encoding_format", "float")
+
+        data = []
+        total_tokens = 0
+        for index, item in enumerate(inputs):
+            text = item if isinstance(item, str) else _decode_tokens(item)
+            total_tokens += len(item) if isinstance(item, list) else TextProcessor.count_tokens_approx(item)
+            vector = hash_embedding(text, dimensions)
+            embedding: Any = vector
+            if encoding == "base64":
+                embedding = base64.b64encode(array("f", vector).tobytes()).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        return {
+            "object": "list",
+            "data": data,
+            "model": deployment,
+            "usage": {"prompt_tokens": total_tokens, "total_tokens": total_tokens},
+        }
+
+
+def _content_text(message: Dict[str, Any]) -> str:
+    content = message.get("content", "")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _decode_tokens(tokens: List[int]) -> str:
+    """langchain-openai가 보내는 토큰 ID 배열을 텍스트로 복원 (tiktoken 없으면 ID 문자열)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base").decode(tokens)
+    except Exception:
+        return " ".join(str(t) for t in tokens)
+
+
+def make_handler(mock: MockAzureOpenAI):
+    """요청 핸들러 클래스 생성"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _too_many_requests(self, retry_after: float):
+            self._send_json(429, {
+                "error": {
+                    "code": "429",
+                    "message": "Requests to the deployment have exceeded the rate limit. "
+                               f"Please retry after {retry_after:.1f} seconds."
+                }
+            }, {"Retry-After": str(max(1, int(retry_after + 0.999))),
+                "retry-after-ms": str(int(retry_after * 1000))})
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, dict(mock.stats))
+            else:
+                self._send_json(404, {"error": {"code": "404", "message": "Not Found"}})
+
+        def do_POST(self):
+            path = self.path.split("?", 1)[0]
+            match = ROUTE_PATTERN.match(path)
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length) if length else b"{}"
+            if not match:
+                self._send_json(404, {"error": {"code": "404", "message": "Resource not found"}})
+                return
+
+            deployment, operation = match.groups()
+            body = json.loads(raw or b"{}")
+            mock.count(requests=1)
+
+            if mock.inject_error():
+                mock.count(injected_errors=1)
+                self._too_many_requests(1.0)
+                return
+
+            if operation == "embeddings":
+                mock.count(embedding_requests=1)
+                payload = mock.embeddings(deployment, body)
+                completion_tokens = 0
+                tokens = payload["usage"]["prompt_tokens"]
+            else:
+                if body.get("stream"):
+                    self._send_json(400, {"error": {"code": "400", "message": "stream is not supported"}})
+                    return
+                mock.count(chat_requests=1)
+                payload, completion_tokens = mock.chat_completion(deployment, body)
+                tokens = payload["usage"]["total_tokens"]
+
+            retry_after = mock.rate_limiter.acquire(deployment, tokens)
+            if retry_after is not None:
+                mock.count(rate_limited=1)
+                self._too_many_requests(retry_after)
+                return
+
+            usage = payload["usage"]
+            mock.count(
+                prompt_tokens=usage["prompt_tokens"],
+                completion_tokens=completion_tokens,
+                cached_tokens=usage.get("prompt_tokens_details", {}).get("cached_tokens", 0)
+            )
+
+            time.sleep(mock.latency.sample(completion_tokens))
+            self._send_json(200, payload)
+
+    return Handler
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    mock: Optional[MockAzureOpenAI] = None
+) -> Tuple[ThreadingHTTPServer, MockAzureOpenAI]:
+    """백그라운드 스레드에서 서버 시작 (port=0이면 임의 포트)"""
+    mock = mock or MockAzureOpenAI(LatencyModel(), RateLimiter())
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, mock
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """서버 동작 관련 CLI 인자"""
+    parser.add_argument("--latency", default="fixed:0.2", help="지연 분포 (fixed/uniform/normal/lognormal)")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="출력 토큰당 추가 지연(초)")
+    parser.add_argument("--rpm", type=int, default=0, help="배포별 분당 요청 한도 (0=무제한)")
+    parser.add_argument("--tpm", type=int, default=0, help="배포별 분당 토큰 한도 (0=무제한)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 주입 비율")
+    parser.add_argument("--embedding-dimensions", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def build_mock(args: argparse.Namespace) -> MockAzureOpenAI:
+    """CLI 인자로부터 서버 설정 생성"""
+    return MockAzureOpenAI(
+        latency=LatencyModel(args.latency, args.token_latency, args.seed),
+        rate_limiter=RateLimiter(args.rpm, args.tpm),
+        error_rate=args.error_rate,
+        embedding_dimensions=args.embedding_dimensions,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Azure OpenAI 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(build_mock(args)))
+    server.daemon_threads = True
+    print(f"🚀 Mock Azure OpenAI: http://{args.host}:{args.port}/ (통계: /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+ContractGuard AI - 오프라인 벤치마크
+가짜 LLM/임베딩으로 분석 파이프라인 성능 측정 및 기준선 비교
+
+사용법:
+    python -m benchmarks.run_benchmark --sizes 1 10 50 200 --iterations 5
+    python -m benchmarks.run_benchmark --save-baseline      # 기준선 저장
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.contract_generator import generate_contract
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from benchmarks.import_profile import bench_imports
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 값이 클수록 좋은 지표 (그 외는 작을수록 좋음)
+HIGHER_IS_BETTER_SUFFIXES = ("chars_per_sec", "articles_per_sec")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def build_fake_stack(args: argparse.Namespace, workdir: str) -> Tuple[Any, Any]:
+    """가짜 LLM/임베딩 기반 워크플로우와 Retriever 구성"""
+    from config.settings import app_config, clause_cache_config, result_store_config
+    from graph.checkpoint import CheckpointStore
+    from graph.workflow import ContractAnalysisWorkflow
+    from rag.retriever import ContractRetriever
+    from rag.vectorstore import VectorStoreManager, initialize_knowledge_base
+
+    clause_cache_config.db_path = os.path.join(workdir, "clause_cache.db")
+    result_store_config.db_path = os.path.join(workdir, "results.db")
+    # 캐시 키의 지식 베이스 버전도 벤치마크용 스냅샷 기준으로
+    app_config.vectorstore_dir = os.path.join(workdir, "vectorstore")
+    embeddings = FakeEmbeddings(latency=args.embed_latency)
+    manager = VectorStoreManager(embeddings=embeddings)
+    initialize_knowledge_base(manager)
+
+    llm = FakeChatModel(
+        latency=args.llm_latency,
+        per_token_latency=args.llm_token_latency,
+        jitter=args.jitter,
+        seed=args.seed
+    )
+    retriever = ContractRetriever(manager)
+    checkpoint_store = CheckpointStore(db_path=os.path.join(workdir, "checkpoints.db"))
+    workflow = ContractAnalysisWorkflow(llm=llm, retriever=retriever, checkpoint_store=checkpoint_store)
+    return workflow, retriever
+
+
+def bench_end_to_end(workflow, sizes: List[int], iterations: int) -> Dict[str, float]:
+    """조항 수별 종단 지연시간 백분위수 및 노드별 오버헤드 측정"""
+    metrics: Dict[str, float] = {}
+    for size in sizes:
+        contract = generate_contract(size, seed=size)
+        latencies = []
+        overheads: Dict[str, List[float]] = {}
+
+        for i in range(iterations):
+            start = time.perf_counter()
+            report = workflow.run(contract, thread_id=f"bench-{size}-{i}")
+            latencies.append(time.perf_counter() - start)
+            if "error" in report:
+                raise RuntimeError(f"분석 실패 (조항 {size}개): {report['error']}")
+
+            # 노드 오버헤드 = 노드 시간 - (LLM 호출 + 검색) 시간
+            # (선행 조항 비교는 노드와 병렬로 도는 early_compare 구간 아래에 기록되므로 빼지 않음)
+            spans = report["performance"]["spans"]
+            for node in (s for s in spans if s["kind"] == "node"):
+                child_time = sum(
+                    s["duration"] for s in spans
+                    if s["parent_id"] == node["span_id"] and s["kind"] in ("llm", "retrieval")
+                )
+                overheads.setdefault(node["name"], []).append(node["duration"] - child_time)
+
+        prefix = f"e2e.articles_{size}"
+        metrics[f"{prefix}.p50"] = percentile(latencies, 50)
+        metrics[f"{prefix}.p95"] = percentile(latencies, 95)
+        metrics[f"{prefix}.p99"] = percentile(latencies, 99)
+        for node, values in overheads.items():
+            metrics[f"node_overhead.articles_{size}.{node}"] = statistics.mean(values)
+    return metrics
+
+
+def bench_retrieval(retriever, iterations: int) -> Dict[str, float]:
+    """분석 유형별 검색 지연시간 측정 (같은 질의를 반복하므로 컨텍스트 LRU를 거치지 않고 실제 검색만 측정)"""
+    queries = {
+        "general": "소프트웨어 개발 용역계약 손해배상",
+        "risk": "손해배상 한도 없음 간접손해 포함",
+        "standard": "용역계약 표준계약서 조항",
+        "legal": "사전 통지 없는 계약 해지",
+    }
+    metrics = {}
+    for analysis_type, query in queries.items():
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            retriever._build_context(query, analysis_type)
+            latencies.append(time.perf_counter() - start)
+        metrics[f"retrieval.{analysis_type}.p50"] = percentile(latencies, 50)
+        metrics[f"retrieval.{analysis_type}.p95"] = percentile(latencies, 95)
+    return metrics
+
+
+def _make_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def bench_parsing(sizes: List[int], iterations: int) -> Dict[str, float]:
+    """문서 로드 및 조항 추출 처리량 측정"""
+    from utils.document_loader import DocumentLoader
+    from utils.text_processor import TextProcessor
+
+    metrics = {}
+    for size in sizes:
+        text = generate_contract(size, seed=size)
+        payloads = {
+            "txt": text.encode("utf-8"),
+            "docx": _make_docx(text),
+        }
+        for file_type, payload in payloads.items():
+            start = time.perf_counter()
+            for _ in range(iterations):
+                DocumentLoader.load(io.BytesIO(payload), file_type)
+            elapsed = time.perf_counter() - start
+            metrics[f"parse.{file_type}.articles_{size}.chars_per_sec"] = len(text) * iterations / elapsed
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            TextProcessor.extract_clauses(text)
+        elapsed = time.perf_counter() - start
+        metrics[f"parse.clauses.articles_{size}.articles_per_sec"] = size * iterations / elapsed
+    return metrics
+
+
+def bench_memory(workflow, size: int) -> Dict[str, float]:
+    """단일 분석의 최대 메모리 사용량(MB) 측정"""
+    contract = generate_contract(size, seed=size)
+    tracemalloc.start()
+    try:
+        workflow.run(contract, thread_id=f"bench-memory-{size}")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {f"memory.articles_{size}.peak_mb": peak / (1024 * 1024)}
+
+
+def compare_with_baseline(
+    metrics: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float
+) -> List[str]:
+    """기준선 대비 허용치를 넘는 성능 저하 목록 반환"""
+    regressions = []
+    for key, value in sorted(metrics.items()):
+        if key not in baseline or not baseline[key]:
+            continue
+        change = (value - baseline[key]) / baseline[key]
+        if key.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{key}: {baseline[key]:.4f} → {value:.4f} ({change:+.1%})")
+    return regressions
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    """전체 벤치마크 실행"""
+    from utils.tracing import tracer
+
+    # 벤치마크 트레이스는 파일로 내보내지 않음
+    tracer.enabled = False
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workflow, retriever = build_fake_stack(args, workdir)
+
+        metrics: Dict[str, float] = {}
+        metrics.update(bench_end_to_end(workflow, args.sizes, args.iterations))
+        metrics.update(bench_retrieval(retriever, args.iterations))
+        metrics.update(bench_parsing(args.sizes, args.iterations))
+        metrics.update(bench_memory(workflow, max(args.sizes)))
+    # 콜드 스타트 비용 (새 프로세스에서 진입 모듈 import)
+    metrics.update(bench_imports())
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI 오프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200],
+                        help="계약서 조항 수 (1~200)")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="LLM 호출당 지연(초)")
+    parser.add_argument("--llm-token-latency", type=float, default=0.0, help="출력 토큰당 지연(초)")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="임베딩 호출당 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 변동 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 저하 비율")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if any(size < 1 or size > 200 for size in args.sizes):
+        parser.error("조항 수는 1~200 범위여야 합니다.")
+
+    metrics = run(args)
+
+    for key, value in sorted(metrics.items()):
+        print(f"{key:60s} {value:12.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"✅ 기준선 저장: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(metrics, baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ 기준선 대비 성능 저하:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅ 기준선 대비 성능 저하 없음")
+    else:
+        print("\nℹ️ 기준선이 없습니다. --save-baseline으로 저장하세요.")
+
+
+if __name__ == "__main__":
+    main()
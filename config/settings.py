@@ -4,6 +4,7 @@ ContractGuard AI - 설정 관리 모듈
 """
 import os
 from dotenv import load_dotenv
+from typing import Dict
 from pydantic import BaseModel
 
 # 환경변수 로드
@@ -14,13 +15,16 @@ class AzureOpenAIConfig(BaseModel):
     """Azure OpenAI 설정"""
     endpoint: str = os.getenv("AOAI_ENDPOINT", "")
     api_key: str = os.getenv("AOAI_API_KEY", "")
-    api_version: str = "2024-02-15-preview"
+    # 프롬프트 캐시 사용량(cached_tokens)은 2024-10-01-preview 이후 버전에서 반환
+    api_version: str = os.getenv("AOAI_API_VERSION", "2024-10-21")
     
     # 배포 모델명
     gpt4o_mini: str = os.getenv("AOAI_DEPLOY_GPT4O_MINI", "gpt-4o-mini")
     gpt4o: str = os.getenv("AOAI_DEPLOY_GPT4O", "gpt-4o")
     embed_large: str = os.getenv("AOAI_DEPLOY_EMBED_3_LARGE", "text-embedding-3-large")
     embed_small: str = os.getenv("AOAI_DEPLOY_EMBED_3_SMALL", "text-embedding-3-small")
+    # 임베딩 차원 축소 요청 (0이면 모델 기본 차원, 예: 3-large 3072 → 1024)
+    embed_dimensions: int = int(os.getenv("AOAI_EMBED_DIMENSIONS", "0"))
 
 
 class AppConfig(BaseModel):
@@ -33,15 +37,239 @@ class AppConfig(BaseModel):
     chunk_size: int = 1000
     chunk_overlap: int = 200
     retriever_k: int = 5
+    retriever_context_cache_size: int = 256
+    
+    # 프롬프트 컨텍스트 조립 (후보 검색 → 인접 청크 병합 → 관련도 컷 → MMR → 토큰 예산)
+    retriever_fetch_k: int = 20
+    context_relevance_ratio: float = 0.75  # 최고 관련도 대비 이 비율 미만 후보 제외
+    context_min_relevance: float = 0.0
+    context_mmr_lambda: float = 0.7  # 1.0이면 관련도만, 낮을수록 다양성 우선
+    context_token_budget: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+    
+    # 업로드 즉시 선행 분석 (텍스트 추출/조항 파싱/규칙 선별/검색 예열, 선택적으로 1단계 LLM)
+    speculative_enabled: bool = os.getenv("SPECULATIVE_ENABLED", "true").lower() == "true"
+    speculative_llm_stage: bool = os.getenv("SPECULATIVE_LLM_STAGE", "false").lower() == "true"
+    speculative_workers: int = 4
+    speculative_ttl_sec: int = 900  # 분석하지 않고 떠난 세션의 선행 분석 결과 보존 시간
+    
+    # 계약서 조항 인덱스 (채팅용)
+    clause_index_max_sessions: int = 200
+    clause_index_ttl_sec: int = 3600
+    chat_clause_k: int = 3
+    
+    # 대화 메모리 (최근 대화 창 + 누적 요약)
+    chat_window_tokens: int = 3000
+    chat_summary_tokens: int = 600
+    chat_display_messages: int = 100
+    
+    # 상담 답변 의미 캐시
+    semantic_cache_enabled: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_entries: int = 2000
+    semantic_cache_ttl_sec: int = 86400
+    
+    # 표준계약서 로컬 정렬 (조항 비교)
+    alignment_embedding_weight: float = 0.6
+    alignment_match_threshold: float = 0.35
+    alignment_unchanged_threshold: float = 0.9
+    alignment_min_coverage: float = 0.3
+    
+    # 계약 유형 로컬 분류 (신뢰도가 높으면 조항 비교를 1단계와 병렬로 시작)
+    early_comparison_enabled: bool = os.getenv("EARLY_COMPARISON_ENABLED", "true").lower() == "true"
+    classifier_confidence_threshold: float = 0.8
+    early_comparison_max_sec: float = 300.0  # 분석 데드라인이 없을 때 선행 비교 최대 시간
+    classifier_retrain_every: int = 50
     
     # 경로 설정
     data_dir: str = "data"
     vectorstore_dir: str = "data/vectorstore"
 
 
+class TraceConfig(BaseModel):
+    """트레이싱/비용 집계 설정"""
+    enabled: bool = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    export_dir: str = os.getenv("TRACE_EXPORT_DIR", "data/traces")
+    
+    # 배포별 100만 토큰당 가격 (USD)
+    pricing: Dict[str, Dict[str, float]] = {
+        os.getenv("AOAI_DEPLOY_GPT4O_MINI", "gpt-4o-mini"): {
+            "input": 0.15, "cached_input": 0.075, "output": 0.60
+        },
+        os.getenv("AOAI_DEPLOY_GPT4O", "gpt-4o"): {
+            "input": 2.50, "cached_input": 1.25, "output": 10.00
+        },
+        os.getenv("AOAI_DEPLOY_EMBED_3_LARGE", "text-embedding-3-large"): {
+            "input": 0.13
+        },
+        os.getenv("AOAI_DEPLOY_EMBED_3_SMALL", "text-embedding-3-small"): {
+            "input": 0.02
+        },
+    }
+
+
+class CheckpointConfig(BaseModel):
+    """워크플로우 체크포인트 설정"""
+    db_path: str = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints/checkpoints.db")
+    retention_hours: float = float(os.getenv("CHECKPOINT_RETENTION_HOURS", "24"))
+    max_threads: int = int(os.getenv("CHECKPOINT_MAX_THREADS", "1000"))
+    prune_interval_sec: int = 600
+
+
+class ClauseCacheConfig(BaseModel):
+    """조항 판정 캐시 설정"""
+    enabled: bool = os.getenv("CLAUSE_CACHE_ENABLED", "true").lower() == "true"
+    db_path: str = os.getenv("CLAUSE_CACHE_DB_PATH", "data/cache/clause_cache.db")
+    max_entries: int = 100000
+
+
+class NearDuplicateConfig(BaseModel):
+    """유사 계약서 탐지(MinHash LSH) 설정"""
+    enabled: bool = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+    db_path: str = os.getenv("NEAR_DUPLICATE_DB_PATH", "data/cache/near_duplicates.db")
+    num_perm: int = 128
+    bands: int = 16
+    # 이 유사도 이상이면 재사용을 제안, auto_threshold 이상이면 자동 적용
+    offer_threshold: float = 0.8
+    auto_threshold: float = 0.95
+    auto_apply: bool = os.getenv("NEAR_DUPLICATE_AUTO_APPLY", "true").lower() == "true"
+
+
+class ResultStoreConfig(BaseModel):
+    """분석 결과 저장소 설정"""
+    enabled: bool = os.getenv("RESULT_STORE_ENABLED", "true").lower() == "true"
+    db_path: str = os.getenv("RESULT_STORE_DB_PATH", "data/results/results.db")
+
+
+class HttpPoolConfig(BaseModel):
+    """Azure OpenAI 공용 HTTP 연결 풀 설정"""
+    max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    keepalive_expiry_sec: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SEC", "60"))
+    connect_timeout_sec: float = 10.0
+    read_timeout_sec: float = 120.0
+    # h2 패키지가 설치된 경우에만 적용
+    http2: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+
+class DispatchConfig(BaseModel):
+    """다중 배포 분산/헤징 요청 설정
+
+    AOAI_BACKENDS 예시 (JSON 목록, 미지정 시 기본 Azure 설정 1개):
+    [{"name": "koreacentral", "endpoint": "https://a.openai.azure.com/", "api_key": "...",
+      "deployments": {"gpt-4o-mini": "gpt-4o-mini-kc"}}]
+    """
+    enabled: bool = os.getenv("DISPATCH_ENABLED", "true").lower() == "true"
+    backends_json: str = os.getenv("AOAI_BACKENDS", "")
+    # 학습된 p95를 넘으면 다른 배포(없으면 같은 배포)로 중복 요청
+    hedging_enabled: bool = os.getenv("DISPATCH_HEDGING", "true").lower() == "true"
+    hedge_percentile: float = 95.0
+    hedge_min_delay_sec: float = 1.0
+    hedge_min_samples: int = 20
+    latency_window: int = 200
+    # 배포 선택: 부하 점수 역수 비례 가중 무작위 (느린 배포도 일부 요청을 받아 지연 추정이 갱신되도록)
+    # 지연 추정은 마지막 측정 이후 반감기마다 절반으로 감쇠, 점수 계산 시 최소 지연을 적용
+    latency_decay_sec: float = 30.0
+    balance_min_latency_sec: float = 0.05
+    # 연속 실패 시 배포 차단, reset 후 시험 요청 1건 허용
+    breaker_failure_threshold: int = 3
+    breaker_reset_sec: float = 30.0
+
+
+class DeadlineConfig(BaseModel):
+    """분석 전체 SLA와 노드별 예산/단계적 품질 저하 설정"""
+    enabled: bool = os.getenv("DEADLINE_ENABLED", "true").lower() == "true"
+    # 호출자가 SLA를 지정하지 않을 때의 전체 제한 시간 (초)
+    default_sla_sec: float = float(os.getenv("ANALYSIS_SLA_SEC", "120"))
+    # 노드별 예상 소요시간 초기값 (전체 품질로 실행한 실측치로 갱신), 남은 시간을 이 비율로 배분
+    node_estimates: Dict[str, float] = {
+        "analyze": 15.0,
+        "evaluate_risk": 20.0,
+        "compare_clauses": 15.0,
+        "suggest_improvements": 15.0,
+        "generate_report": 0.1,
+    }
+    # 남은 시간 / 남은 노드 예상 시간 비율이 아래로 떨어지면 단계적으로 품질 저하
+    small_model_ratio: float = 1.0
+    trim_context_ratio: float = 0.75
+    skip_optional_ratio: float = 0.5
+    fallback_deployment: str = os.getenv(
+        "DEADLINE_FALLBACK_DEPLOYMENT", os.getenv("AOAI_DEPLOY_GPT4O_MINI", "gpt-4o-mini")
+    )
+    trimmed_context_chars: int = 1500
+    # 리포트 생성용으로 남겨 두는 시간
+    report_reserve_sec: float = 0.5
+
+
+class CompactOutputConfig(BaseModel):
+    """간결 출력 모드 설정 (조항 ID/짧은 코드만 생성하고 원문 필드는 로컬에서 복원)"""
+    enabled: bool = os.getenv("COMPACT_OUTPUT_ENABLED", "false").lower() == "true"
+    # 네이티브 구조화 출력 (json_schema strict) - 지원하지 않는 배포/API 버전이면 끄기
+    structured_output: bool = os.getenv("STRUCTURED_OUTPUT_ENABLED", "true").lower() == "true"
+    # 간결 출력 모드의 Agent별 최대 출력 토큰 = 기본 + 조항(항목) 수 × 조항당 토큰
+    # (조항별 요약/판정 목록이 긴 계약서에서 JSON 중간에 잘리지 않도록)
+    max_tokens: Dict[str, int] = {
+        "ContractAnalyzer": 700,
+        "RiskEvaluator": 800,
+        "ClauseComparator": 700,
+        "ImprovementAdvisor": 900,
+    }
+    max_tokens_per_clause: Dict[str, int] = {
+        "ContractAnalyzer": 60,
+        "RiskEvaluator": 80,
+        "ClauseComparator": 60,
+        "ImprovementAdvisor": 80,
+    }
+
+
+class MicroBatchConfig(BaseModel):
+    """요청 간 소형 LLM 작업 마이크로 배치 설정"""
+    enabled: bool = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+    # 그룹의 첫 작업 이후 더 모을 시간과 배치당 최대 항목 수
+    window_ms: float = float(os.getenv("MICRO_BATCH_WINDOW_MS", "50"))
+    max_items: int = int(os.getenv("MICRO_BATCH_MAX_ITEMS", "40"))
+    workers: int = 4
+
+
+class SchedulerConfig(BaseModel):
+    """LLM/임베딩 호출 우선순위 스케줄러 설정"""
+    enabled: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    # 프로세스 전체 동시 Azure 호출 수와 일괄 처리 등급이 쓸 수 있는 비율
+    max_concurrent: int = int(os.getenv("SCHEDULER_MAX_CONCURRENT", "16"))
+    batch_max_share: float = float(os.getenv("SCHEDULER_BATCH_MAX_SHARE", "0.5"))
+    # 등급별 최대 대기열 길이 (넘으면 즉시 거절)
+    queue_limits: Dict[str, int] = {"chat": 100, "analysis": 200, "batch": 2000}
+    # 테넌트(세션/사용자)별 WFQ 가중치 (미지정 테넌트는 1.0)
+    tenant_weights: Dict[str, float] = {}
+    metrics_window: int = 1000
+
+
+class KBSnapshotConfig(BaseModel):
+    """버전별 지식 베이스 스냅샷 설정 (app_config.vectorstore_dir 아래에 저장)"""
+    enabled: bool = os.getenv("KB_SNAPSHOTS_ENABLED", "true").lower() == "true"
+    # 활성 버전 포인터를 다시 확인하는 주기 (다른 프로세스에서 전환한 버전 반영)
+    check_interval_sec: float = float(os.getenv("KB_SNAPSHOT_CHECK_SEC", "5"))
+    # 정리 시 남길 최근 스냅샷 수 (활성 버전은 항상 유지)
+    keep_versions: int = int(os.getenv("KB_SNAPSHOT_KEEP", "3"))
+    # 검색용 양자화 ("none" | "int8" | "binary")와 float 재채점 후보 배수 (top-k × 배수)
+    quantization: str = os.getenv("KB_QUANTIZATION", "none")
+    rescore_factor: int = int(os.getenv("KB_RESCORE_FACTOR", "4"))
+
+
 # 전역 설정 인스턴스
 azure_config = AzureOpenAIConfig()
 app_config = AppConfig()
+trace_config = TraceConfig()
+checkpoint_config = CheckpointConfig()
+clause_cache_config = ClauseCacheConfig()
+near_duplicate_config = NearDuplicateConfig()
+result_store_config = ResultStoreConfig()
+http_pool_config = HttpPoolConfig()
+dispatch_config = DispatchConfig()
+deadline_config = DeadlineConfig()
+compact_output_config = CompactOutputConfig()
+micro_batch_config = MicroBatchConfig()
+scheduler_config = SchedulerConfig()
+kb_snapshot_config = KBSnapshotConfig()
 
 
 def validate_config() -> bool:
@@ -0,0 +1,178 @@
+"""
+ContractGuard AI - 워크플로우 체크포인트 저장소
+SQLite 기반 영속 체크포인터, 분석별 스레드 관리, 보존기간 기반 정리
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config.settings import checkpoint_config
+
+
+class CheckpointStore:
+    """SQLite 체크포인터 + 분석 스레드 레지스트리
+
+    - 분석마다 고유 thread_id를 발급하여 사용자 간 상태 공유를 방지
+    - 완료된 스레드는 마지막 체크포인트만 남기고 압축
+    - 보존기간이 지났거나 최대 스레드 수를 넘는 오래된 스레드를 삭제
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        retention_hours: Optional[float] = None,
+        max_threads: Optional[int] = None
+    ):
+        self.db_path = db_path or checkpoint_config.db_path
+        self.retention_hours = retention_hours or checkpoint_config.retention_hours
+        self.max_threads = max_threads or checkpoint_config.max_threads
+        self._last_prune = 0.0
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        self.saver = SqliteSaver(self.conn)
+        self.saver.setup()
+        self._lock = self.saver.lock
+        self._setup_registry()
+
+    def _setup_registry(self):
+        """분석 스레드 레지스트리 테이블 생성"""
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS analysis_threads (
+                    thread_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    last_node TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_analysis_threads_updated
+                    ON analysis_threads(updated_at);
+            """)
+            self.conn.commit()
+
+    def new_thread_id(self) -> str:
+        """새 분석용 고유 thread_id 발급 및 등록"""
+        thread_id = f"analysis-{uuid.uuid4().hex}"
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO analysis_threads VALUES (?, 'running', NULL, NULL, ?, ?)",
+                (thread_id, now, now)
+            )
+            self.conn.commit()
+        self.prune_if_due()
+        return thread_id
+
+    def mark(self, thread_id: str, status: str, last_node: Optional[str] = None, error: Optional[str] = None):
+        """스레드 상태 갱신 (running/failed/completed)"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO analysis_threads VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(thread_id) DO UPDATE SET
+                    status = excluded.status,
+                    last_node = COALESCE(excluded.last_node, last_node),
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (thread_id, status, last_node, error, now, now)
+            )
+            self.conn.commit()
+
+    def get_thread(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """스레드 정보 조회"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT thread_id, status, last_node, error, created_at, updated_at "
+                "FROM analysis_threads WHERE thread_id = ?",
+                (thread_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("thread_id", "status", "last_node", "error", "created_at", "updated_at")
+        return dict(zip(keys, row))
+
+    def compact(self, thread_id: str):
+        """마지막 체크포인트만 남기고 이전 체크포인트/쓰기 기록 삭제"""
+        with self._lock:
+            latest = self.conn.execute(
+                "SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ?",
+                (thread_id,)
+            ).fetchone()[0]
+            if latest is None:
+                return
+            self.conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id <> ?",
+                (thread_id, latest)
+            )
+            self.conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_id <> ?",
+                (thread_id, latest)
+            )
+            self.conn.commit()
+
+    def delete_thread(self, thread_id: str):
+        """스레드의 모든 체크포인트 삭제"""
+        with self._lock:
+            self._delete_threads([thread_id])
+            self.conn.commit()
+
+    def _delete_threads(self, thread_ids):
+        for table in ("checkpoints", "writes", "analysis_threads"):
+            self.conn.executemany(
+                f"DELETE FROM {table} WHERE thread_id = ?",
+                [(thread_id,) for thread_id in thread_ids]
+            )
+
+    def prune(self) -> int:
+        """보존기간 초과 및 최대 스레드 수 초과분 삭제, 삭제된 스레드 수 반환"""
+        cutoff = time.time() - self.retention_hours * 3600
+        with self._lock:
+            expired = [row[0] for row in self.conn.execute(
+                "SELECT thread_id FROM analysis_threads WHERE updated_at < ?", (cutoff,)
+            )]
+            overflow = [row[0] for row in self.conn.execute(
+                "SELECT thread_id FROM analysis_threads WHERE updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                (cutoff, self.max_threads)
+            )]
+            # 레지스트리에서 빠진 체크포인트(삭제 도중 중단 등) 정리
+            orphans = [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT thread_id FROM checkpoints "
+                "WHERE thread_id NOT IN (SELECT thread_id FROM analysis_threads)"
+            )]
+            targets = expired + overflow + orphans
+            if targets:
+                self._delete_threads(targets)
+                self.conn.commit()
+        self._last_prune = time.time()
+        return len(targets)
+
+    def prune_if_due(self):
+        """정리 주기가 지났으면 정리 실행"""
+        if time.time() - self._last_prune >= checkpoint_config.prune_interval_sec:
+            self.prune()
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """프로세스 공용 체크포인트 저장소 반환 (Streamlit 세션 간 공유)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
@@ -0,0 +1,215 @@
+"""
+ContractGuard AI - 선행 분석 모듈
+파일 업로드 직후 '분석 시작' 전까지의 대기 시간에 텍스트 추출, 조항 파싱, 규칙 선별,
+검색 예열(선택적으로 1단계 LLM 분석)을 백그라운드에서 미리 실행
+"""
+import io
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+from config.settings import app_config
+
+
+class SpeculationCancelled(Exception):
+    """선행 분석이 취소됨 (단계 사이에서 확인)"""
+
+
+class Speculation:
+    """세션 하나의 진행 중인 선행 분석"""
+
+    def __init__(self, owner: str, key: str, include_llm: bool):
+        self.owner = owner
+        self.key = key
+        self.include_llm = include_llm
+        self.started_at = time.time()
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self.completed_stages = []
+
+    def checkpoint(self, stage: str):
+        """단계 완료 기록 (취소되었으면 다음 단계로 진행하지 않음)"""
+        self.completed_stages.append(stage)
+        if self.cancel_event.is_set():
+            raise SpeculationCancelled(stage)
+
+    def cancel(self) -> bool:
+        """취소 요청 (아직 시작 전이면 실행 자체를 취소)"""
+        self.cancel_event.set()
+        return self.future.cancel() if self.future else False
+
+
+class SpeculativeExecutor:
+    """세션별 선행 분석 실행기
+
+    - start(): 업로드 파일마다 한 번 제출 (같은 파일로 다시 호출하면 기존 작업 유지)
+    - attach(): '분석 시작' 시 진행 중인 작업에 합류하여 결과 사용
+    - 다른 파일 업로드, 입력 변경, 초기화로 버려진 작업은 취소하고 집계
+    - 분석하지 않고 닫힌 세션의 작업은 speculative_ttl_sec 후 start()/summary()에서 정리
+      (계약서 원문과 조항 인덱스를 프로세스 수명 동안 붙잡지 않도록)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or app_config.speculative_workers,
+            thread_name_prefix="speculative"
+        )
+        self._speculations: Dict[str, Speculation] = {}
+        # 취소 시 이미 끝난 작업의 완료 콜백이 즉시 호출되므로 재진입 가능한 락 사용
+        self._lock = threading.RLock()
+        self.stats = {
+            "started": 0,
+            "attached": 0,
+            "cancelled": 0,
+            "expired": 0,
+            "discarded_llm_stages": 0,
+            "head_start_sec": 0.0,
+        }
+
+    def start(
+        self,
+        owner: str,
+        key: str,
+        file_bytes: bytes,
+        file_name: str,
+        include_llm: Optional[bool] = None
+    ) -> Speculation:
+        """업로드 파일의 선행 분석 시작
+
+        Args:
+            owner: 세션 ID
+            key: 업로드 파일 식별자 (같은 파일이면 기존 작업 재사용)
+            file_bytes: 파일 내용 (Streamlit 업로드 객체는 백그라운드 스레드에 넘기지 않음)
+            file_name: 파일 이름 (확장자로 로더 선택)
+            include_llm: 1단계(계약서 분석) LLM 호출까지 미리 실행할지 여부
+        """
+        include_llm = app_config.speculative_llm_stage if include_llm is None else include_llm
+        with self._lock:
+            self._sweep_locked()
+            current = self._speculations.get(owner)
+            if current is not None and current.key == key:
+                return current
+            if current is not None:
+                self._cancel_locked(current)
+
+            speculation = Speculation(owner, key, include_llm)
+            speculation.future = self._executor.submit(self._run, speculation, file_bytes, file_name)
+            self._speculations[owner] = speculation
+            self.stats["started"] += 1
+            return speculation
+
+    def attach(self, owner: str, key: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """진행 중인 선행 분석 결과 사용 (없거나 다른 파일이면 취소 후 None)
+
+        timeout: 최대 대기 시간 (남은 분석 SLA) - 넘기면 선행 분석을 취소하고 None
+        """
+        with self._lock:
+            speculation = self._speculations.pop(owner, None)
+            if speculation is None:
+                return None
+            if speculation.key != key:
+                self._cancel_locked(speculation)
+                return None
+            self.stats["attached"] += 1
+            self.stats["head_start_sec"] += time.time() - speculation.started_at
+
+        try:
+            return speculation.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._cancel_locked(speculation)
+            return None
+        except (CancelledError, SpeculationCancelled):
+            return None
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cancel(self, owner: str):
+        """세션의 선행 분석 취소 (초기화, 파일 제거, 직접 입력 분석 시)"""
+        with self._lock:
+            speculation = self._speculations.pop(owner, None)
+            if speculation is not None:
+                self._cancel_locked(speculation)
+
+    def _cancel_locked(self, speculation: Speculation, reason: str = "cancelled"):
+        speculation.cancel()
+        self.stats[reason] += 1
+        # 이미 끝났거나 진행 중인 LLM 단계는 비용이 발생했으므로 별도 집계
+        if speculation.include_llm and not speculation.future.cancelled():
+            speculation.future.add_done_callback(lambda f, s=speculation: self._count_discarded(s))
+
+    def _sweep_locked(self):
+        """보존 시간이 지난 작업 정리 (끝났으면 결과를 버리고, 아직 실행 중이면 취소)"""
+        cutoff = time.time() - app_config.speculative_ttl_sec
+        for owner, speculation in list(self._speculations.items()):
+            if speculation.started_at >= cutoff:
+                continue
+            del self._speculations[owner]
+            self._cancel_locked(speculation, "expired")
+
+    def _count_discarded(self, speculation: Speculation):
+        if "analyze" in speculation.completed_stages:
+            with self._lock:
+                self.stats["discarded_llm_stages"] += 1
+
+    def _run(self, speculation: Speculation, file_bytes: bytes, file_name: str) -> Dict[str, Any]:
+        """선행 분석 단계 실행 (업로드한 세션의 분석 등급으로 스케줄링)"""
+        from utils.scheduler import workload
+
+        with workload("analysis", speculation.owner):
+            return self._run_stages(speculation, file_bytes, file_name)
+
+    def _run_stages(self, speculation: Speculation, file_bytes: bytes, file_name: str) -> Dict[str, Any]:
+        """선행 분석 단계 실행 (각 단계 사이에서 취소 확인)"""
+        from rag.clause_index import ContractClauseIndex
+        from utils.bulk_screening import screen_text
+        from utils.document_loader import DocumentLoader
+        from utils.llm_clients import get_retriever
+        from utils.text_processor import TextProcessor
+
+        start = time.perf_counter()
+        result: Dict[str, Any] = {"key": speculation.key}
+
+        file = io.BytesIO(file_bytes)
+        file.name = file_name
+        contract_text = DocumentLoader.load(file)
+        result["contract_text"] = contract_text
+        speculation.checkpoint("extract")
+
+        result["screening"] = screen_text(contract_text)
+        speculation.checkpoint("screen")
+
+        # 1~3단계 Agent가 요청할 검색을 미리 실행하여 Retriever 컨텍스트 LRU에 적재
+        retriever = get_retriever()
+        contract_type = TextProcessor.identify_contract_type(contract_text)
+        retriever.get_context_for_analysis(contract_text[:1000], "general")
+        retriever.get_context_for_analysis(contract_text[:1000], "risk")
+        retriever.get_context_for_analysis(f"{contract_type} 표준계약서 조항", "standard")
+        speculation.checkpoint("retrieval")
+
+        # 채팅용 조항 인덱스 (조항 파싱 + 임베딩)
+        result["clause_index"] = ContractClauseIndex(contract_text, retriever.vs_manager.embeddings)
+        speculation.checkpoint("clause_index")
+
+        if speculation.include_llm:
+            from agents.contract_analyzer import ContractAnalyzerAgent
+
+            analysis = ContractAnalyzerAgent().invoke({"contract_text": contract_text})
+            if "error" not in analysis:
+                result["analysis_result"] = analysis
+            speculation.checkpoint("analyze")
+
+        result["stages"] = list(speculation.completed_stages)
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """선행 분석 통계"""
+        with self._lock:
+            self._sweep_locked()
+            return {**self.stats, "in_flight": len(self._speculations)}
+
+
+# 전역 인스턴스 (Streamlit 세션 간 공유, 세션 ID로 분리)
+speculative_executor = SpeculativeExecutor()
@@ -2,11 +2,14 @@
 ContractGuard AI - LangGraph 워크플로우
 Multi-Agent 협업 오케스트레이션
 """
+import contextvars
 import sys
 import os
-from typing import TypedDict, Annotated, Sequence, Dict, Any
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import TypedDict, Annotated, Sequence, Dict, Any, Callable, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,6 +18,38 @@ from agents.contract_analyzer import ContractAnalyzerAgent
 from agents.risk_evaluator import RiskEvaluatorAgent
 from agents.clause_comparator import ClauseComparatorAgent
 from agents.improvement_advisor import ImprovementAdvisorAgent
+from config.settings import app_config, deadline_config
+from graph.checkpoint import CheckpointStore, get_checkpoint_store
+from rag.contract_classifier import normalize_contract_type, predict_contract_type
+from rag.kb_snapshot import kb_scope
+from rag.retriever import ContractRetriever
+from rag.vectorstore import get_kb_version
+from utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    StageBudget,
+    current_deadline,
+    deadline_scope,
+    stage_scope,
+    time_left,
+)
+from utils.llm_clients import get_retriever
+from utils.tracing import tracer
+
+
+# 로컬 분류 결과로 1단계와 병렬 실행하는 조항 비교 (워크플로우 인스턴스 간 공유)
+_early_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="early-compare")
+
+# 실행 중인 분석의 thread_id (노드에서 선행 조항 비교를 분석별로 구분)
+_current_thread_id: contextvars.ContextVar = contextvars.ContextVar("workflow_thread_id", default=None)
+
+# 노드별 결과 상태 키 (예산 초과/생략 시 부분 결과 기록용)
+NODE_RESULT_KEYS = {
+    "analyze": "analysis_result",
+    "evaluate_risk": "risk_result",
+    "compare_clauses": "comparison_result",
+    "suggest_improvements": "improvement_result",
+}
 
 
 class ContractAnalysisState(TypedDict):
@@ -32,15 +67,27 @@ class ContractAnalysisState(TypedDict):
 class ContractAnalysisWorkflow:
     """계약서 분석 워크플로우"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        llm: Optional[BaseChatModel] = None,
+        retriever: Optional[ContractRetriever] = None,
+        checkpoint_store: Optional[CheckpointStore] = None
+    ):
+        # 모든 Agent가 하나의 Retriever(Vector Store 연결)를 공유
+        self.retriever = retriever or get_retriever()
+        agent_kwargs = {"retriever": self.retriever, "llm": llm}
+        
         # Agent 초기화
-        self.contract_analyzer = ContractAnalyzerAgent()
-        self.risk_evaluator = RiskEvaluatorAgent()
-        self.clause_comparator = ClauseComparatorAgent()
-        self.improvement_advisor = ImprovementAdvisorAgent()
+        self.contract_analyzer = ContractAnalyzerAgent(**agent_kwargs)
+        self.risk_evaluator = RiskEvaluatorAgent(**agent_kwargs)
+        self.clause_comparator = ClauseComparatorAgent(**agent_kwargs)
+        self.improvement_advisor = ImprovementAdvisorAgent(**agent_kwargs)
+
+        # thread_id → (로컬 예측, 선행 조항 비교 Future, 선행 비교 예산 - 만료시키면 남은 LLM 호출 중단)
+        self._early_comparisons: Dict[str, Tuple[Dict[str, Any], Future, StageBudget]] = {}
 
-        # 메모리 (멀티턴 대화용) - 그래프 생성 전에 초기화
-        self.memory = MemorySaver()
+        # 영속 체크포인터 (SQLite) - 그래프 생성 전에 초기화
+        self.checkpoints = checkpoint_store or get_checkpoint_store()
 
         # 그래프 생성
         self.graph = self._build_graph()
@@ -49,12 +96,12 @@ class ContractAnalysisWorkflow:
         """워크플로우 그래프 구성"""
         workflow = StateGraph(ContractAnalysisState)
         
-        # 노드 추가
-        workflow.add_node("analyze", self._analyze_contract)
-        workflow.add_node("evaluate_risk", self._evaluate_risk)
-        workflow.add_node("compare_clauses", self._compare_clauses)
-        workflow.add_node("suggest_improvements", self._suggest_improvements)
-        workflow.add_node("generate_report", self._generate_report)
+        # 노드 추가 (노드별 트레이스 스팬 기록)
+        workflow.add_node("analyze", self._traced("analyze", self._analyze_contract))
+        workflow.add_node("evaluate_risk", self._traced("evaluate_risk", self._evaluate_risk))
+        workflow.add_node("compare_clauses", self._traced("compare_clauses", self._compare_clauses))
+        workflow.add_node("suggest_improvements", self._traced("suggest_improvements", self._suggest_improvements))
+        workflow.add_node("generate_report", self._traced("generate_report", self._generate_report))
         
         # 엣지 연결 (순차 실행)
         workflow.set_entry_point("analyze")
@@ -64,10 +111,101 @@ class ContractAnalysisWorkflow:
         workflow.add_edge("suggest_improvements", "generate_report")
         workflow.add_edge("generate_report", END)
         
-        return workflow.compile(checkpointer=self.memory)
+        return workflow.compile(checkpointer=self.checkpoints.saver)
+    
+    @staticmethod
+    def _traced(node_name: str, func: Callable) -> Callable:
+        """노드 실행을 트레이스 스팬으로 감싸기 (데드라인이 있으면 노드 예산 적용)"""
+        def wrapper(state: ContractAnalysisState) -> Dict[str, Any]:
+            with tracer.span(node_name, kind="node") as span:
+                deadline = current_deadline()
+                if deadline is None:
+                    return func(state)
+                return ContractAnalysisWorkflow._run_with_budget(deadline, node_name, func, state, span)
+        return wrapper
+    
+    @staticmethod
+    def _run_with_budget(
+        deadline: Deadline,
+        node_name: str,
+        func: Callable,
+        state: ContractAnalysisState,
+        span: Any
+    ) -> Dict[str, Any]:
+        """노드 예산 안에서 실행 (시간이 부족하면 생략, 초과하면 부분 결과로 계속 진행)"""
+        stage = deadline.plan(node_name)
+        span.set(budget_sec=round(stage.budget, 2), degradation=stage.level)
+        result_key = NODE_RESULT_KEYS.get(node_name)
+        
+        if stage.skip and result_key:
+            deadline.record(stage, 0.0, "skipped")
+            return {
+                result_key: {"skipped": True, "reason": "분석 제한 시간이 부족하여 생략되었습니다."},
+                "current_step": node_name
+            }
+        
+        start = time.perf_counter()
+        try:
+            with stage_scope(stage):
+                update = func(state)
+            outcome = "completed"
+        except DeadlineExceeded as e:
+            if not result_key:
+                raise
+            update = {
+                result_key: {"error": f"제한 시간 초과: {e}", "timed_out": True},
+                "current_step": node_name
+            }
+            outcome = "timed_out"
+        deadline.record(stage, time.perf_counter() - start, outcome)
+        span.set(outcome=outcome)
+        return update
+    
+    def _start_early_comparison(self, contract_text: str):
+        """로컬 분류 신뢰도가 높으면 LLM 분석을 기다리지 않고 조항 비교 시작"""
+        thread_id = _current_thread_id.get()
+        if not app_config.early_comparison_enabled or thread_id is None:
+            return
+        prediction = predict_contract_type(contract_text)
+        if not prediction["confident"]:
+            return
+        # 1단계 노드 예산이 아닌 전체 데드라인까지의 예산 (데드라인이 없으면 최대 시간, 취소 시 즉시 만료)
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline is not None else app_config.early_comparison_max_sec
+        stage = StageBudget("early_comparison", remaining, "full", time.monotonic() + remaining)
+        # 트레이스 컨텍스트를 넘겨 선행 비교 구간도 같은 트레이스에 기록
+        context = contextvars.copy_context()
+        future = _early_executor.submit(
+            context.run,
+            self._run_early_comparison,
+            {"contract_text": contract_text, "contract_type": prediction["contract_type"]},
+            stage
+        )
+        self._early_comparisons[thread_id] = (prediction, future, stage)
+    
+    def _run_early_comparison(self, input_data: Dict[str, Any], stage: StageBudget) -> Dict[str, Any]:
+        """선행 조항 비교 (예산이 만료되면 다음 LLM 호출에서 DeadlineExceeded로 중단)
+
+        analyze 노드와 병렬로 실행되고 노드보다 오래 걸릴 수 있으므로,
+        노드 구간이 아닌 트레이스 최상위 구간 아래 별도 구간(early_compare)으로 기록합니다.
+        """
+        trace = tracer.current_trace()
+        with tracer.span("early_comparison", kind="early_compare", parent=trace.root if trace else None), \
+                stage_scope(stage):
+            return self.clause_comparator.invoke(input_data)
+    
+    def _cancel_early_comparison(self, thread_id: str):
+        """사용하지 않을 선행 비교 취소 (시작 전이면 실행하지 않고, 진행 중이면 남은 LLM 호출 중단)"""
+        early = self._early_comparisons.pop(thread_id, None)
+        if early is None:
+            return
+        _, future, stage = early
+        future.cancel()
+        stage.ends_at = time.monotonic()
     
     def _analyze_contract(self, state: ContractAnalysisState) -> Dict[str, Any]:
         """1단계: 계약서 분석"""
+        self._start_early_comparison(state["contract_text"])
         result = self.contract_analyzer.invoke({
             "contract_text": state["contract_text"]
         })
@@ -90,10 +228,36 @@ class ContractAnalysisWorkflow:
     def _compare_clauses(self, state: ContractAnalysisState) -> Dict[str, Any]:
         """3단계: 조항 비교"""
         contract_type = state["analysis_result"].get("contract_type", "일반계약")
+        thread_id = _current_thread_id.get()
+        early = self._early_comparisons.pop(thread_id, None) if thread_id is not None else None
+        if early:
+            prediction, future, stage = early
+            early_start = {**prediction, "used": False}
+            # 로컬 예측과 LLM 판정 유형이 같으면 선행 비교 결과 사용, 다르면 다시 비교
+            if normalize_contract_type(prediction["contract_type"]) == normalize_contract_type(contract_type):
+                try:
+                    result = future.result(timeout=time_left())
+                    result["early_start"] = {**early_start, "used": True}
+                    return {
+                        "comparison_result": result,
+                        "current_step": "compare_clauses"
+                    }
+                except FutureTimeoutError:
+                    future.cancel()
+                    stage.ends_at = time.monotonic()
+                    raise DeadlineExceeded("선행 조항 비교가 노드 예산 안에 끝나지 않았습니다.")
+                except Exception as e:
+                    print(f"⚠️ 선행 조항 비교 실패, 다시 비교합니다: {e}")
+            else:
+                future.cancel()
+                stage.ends_at = time.monotonic()
+        
         result = self.clause_comparator.invoke({
             "contract_text": state["contract_text"],
             "contract_type": contract_type
         })
+        if early:
+            result["early_start"] = early_start
         return {
             "comparison_result": result,
             "current_step": "compare_clauses"
@@ -102,6 +266,7 @@ class ContractAnalysisWorkflow:
     def _suggest_improvements(self, state: ContractAnalysisState) -> Dict[str, Any]:
         """4단계: 개선 제안"""
         result = self.improvement_advisor.invoke({
+            "contract_text": state["contract_text"],
             "risk_result": state["risk_result"],
             "comparison_result": state["comparison_result"]
         })
@@ -121,15 +286,33 @@ class ContractAnalysisWorkflow:
             "analysis": state["analysis_result"],
             "risks": state["risk_result"],
             "comparison": state["comparison_result"],
-            "improvements": state["improvement_result"]
+            "improvements": state["improvement_result"],
+            # 분석에 사용한 지식 베이스 버전 (버전이 바뀌면 이전 분석을 재사용하지 않음)
+            "kb_version": get_kb_version()
         }
+        # 데드라인 적용 시 SLA 준수 여부와 품질 저하/생략 내역 (생략·시간 초과가 있으면 부분 리포트)
+        deadline = current_deadline()
+        if deadline is not None:
+            report["deadline"] = deadline.summary()
+            report["partial"] = report["deadline"]["partial"]
         return {
             "final_report": report,
             "current_step": "complete"
         }
     
-    def run(self, contract_text: str, thread_id: str = "default") -> Dict[str, Any]:
-        """워크플로우 실행"""
+    def run(
+        self,
+        contract_text: str,
+        thread_id: Optional[str] = None,
+        sla_sec: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """워크플로우 실행 (분석마다 고유 thread_id 사용)
+        
+        sla_sec: 전체 제한 시간 (기본값: ANALYSIS_SLA_SEC, 0이면 제한 없음)
+        """
+        thread_id = thread_id or self.checkpoints.new_thread_id()
+        self.checkpoints.mark(thread_id, "running")
+        
         initial_state = {
             "contract_text": contract_text,
             "analysis_result": {},
@@ -140,12 +323,126 @@ class ContractAnalysisWorkflow:
             "current_step": "start",
             "error": ""
         }
+        return self._execute(initial_state, thread_id, sla_sec)
+    
+    def run_with_prior(
+        self,
+        contract_text: str,
+        prior_report: Dict[str, Any],
+        match: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        sla_sec: Optional[float] = None,
+        analysis_result: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """거의 같은 이전 계약서의 분석 결과를 재사용하여 변경분만 재분석
+        
+        - 조항이 모두 같으면 이전 리포트를 그대로 반환
+        - 그 외에는 현재 계약서로 1단계 분석을 다시 실행 (당사자/핵심 조건/원문은 계약서마다 다름)
+          리스크 평가부터는 조항 판정 캐시로 바뀐 조항만 LLM이 평가
+        
+        analysis_result: 현재 계약서의 1단계 분석 결과가 이미 있으면 (업로드 직후 선행 분석) 재사용
+        """
+        reused_from = {
+            "contract_id": match["contract_id"],
+            "similarity": round(match["similarity"], 3),
+            "changed_clauses": match.get("changed_clauses", []),
+        }
+        if match.get("identical"):
+            report = {k: v for k, v in prior_report.items() if k not in ("thread_id", "performance")}
+            report["reused_from"] = {**reused_from, "mode": "identical"}
+            return report
+        
+        if analysis_result:
+            report = self.run_from_analysis(contract_text, analysis_result, thread_id, sla_sec)
+        else:
+            report = self.run(contract_text, thread_id, sla_sec)
+        report["reused_from"] = {**reused_from, "mode": "patch"}
+        return report
+    
+    def run_from_analysis(
+        self,
+        contract_text: str,
+        analysis_result: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        sla_sec: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """이미 구한 계약서 분석(1단계) 결과로 리스크 평가부터 실행
+        
+        업로드 직후 선행 실행한 현재 계약서의 1단계 결과에 사용합니다.
+        """
+        thread_id = thread_id or self.checkpoints.new_thread_id()
+        self.checkpoints.mark(thread_id, "running", "analyze")
+        
+        config = {"configurable": {"thread_id": thread_id}}
+        self.graph.update_state(config, {
+            "contract_text": contract_text,
+            "analysis_result": analysis_result,
+            "risk_result": {},
+            "comparison_result": {},
+            "improvement_result": {},
+            "final_report": {},
+            "current_step": "analyze",
+            "error": ""
+        }, as_node="analyze")
+        
+        return self._execute(None, thread_id, sla_sec)
+    
+    def resume(self, thread_id: str, sla_sec: Optional[float] = None) -> Dict[str, Any]:
+        """실패한 분석을 마지막으로 성공한 노드 이후부터 재실행"""
+        thread = self.checkpoints.get_thread(thread_id)
+        if thread is None:
+            return {"error": "재개할 분석 기록이 없습니다. (보존기간 만료 또는 삭제)"}
         
         config = {"configurable": {"thread_id": thread_id}}
+        if thread["status"] == "completed":
+            snapshot = self.graph.get_state(config)
+            report = dict(snapshot.values.get("final_report", {}))
+            report["thread_id"] = thread_id
+            return report
+        
+        self.checkpoints.mark(thread_id, "running")
+        # 입력 없이 호출하면 마지막 체크포인트에서 이어서 실행 (남은 노드에 새 SLA 적용)
+        return self._execute(None, thread_id, sla_sec)
+    
+    def _execute(
+        self,
+        graph_input: Optional[Dict[str, Any]],
+        thread_id: str,
+        sla_sec: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """그래프 실행 및 체크포인트 상태 기록"""
+        config = {"configurable": {"thread_id": thread_id}}
+        sla_sec = deadline_config.default_sla_sec if sla_sec is None else sla_sec
         
+        # 분석 도중 지식 베이스 버전이 바뀌어도 모든 노드가 시작 시점 스냅샷을 사용
+        with tracer.start_trace("contract_analysis") as trace, deadline_scope(sla_sec), kb_scope():
+            token = _current_thread_id.set(thread_id)
+            try:
+                result = self.graph.invoke(graph_input, config)
+                report = dict(result["final_report"])
+                self.checkpoints.mark(thread_id, "completed", "generate_report")
+                self.checkpoints.compact(thread_id)
+            except Exception as e:
+                report = {"error": str(e), **self._failure_info(config)}
+                self.checkpoints.mark(thread_id, "failed", report.get("last_node"), str(e))
+            finally:
+                # 분석 실패/시간 초과 등으로 조항 비교 단계에 도달하지 못한 선행 비교 정리
+                self._cancel_early_comparison(thread_id)
+                _current_thread_id.reset(token)
+        
+        report["thread_id"] = thread_id
+        report["performance"] = trace.summary()
+        return report
+    
+    def _failure_info(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """실패 시점의 마지막 성공 노드와 실패 노드"""
         try:
-            result = self.graph.invoke(initial_state, config)
-            return result["final_report"]
-        except Exception as e:
-            return {"error": str(e)}
-
+            snapshot = self.graph.get_state(config)
+        except Exception:
+            return {"resumable": False}
+        last_node = snapshot.values.get("current_step")
+        return {
+            "last_node": None if last_node == "start" else last_node,
+            "failed_node": snapshot.next[0] if snapshot.next else None,
+            "resumable": bool(snapshot.next),
+        }
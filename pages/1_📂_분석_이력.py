@@ -0,0 +1,121 @@
+"""
+ContractGuard AI - 분석 이력 페이지
+저장된 분석 결과를 계약 유형/리스크 점수/리스크 유형/전문 검색으로 조회
+"""
+import json
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from storage.result_store import get_result_store
+
+st.set_page_config(
+    page_title="분석 이력 - ContractGuard AI",
+    page_icon="📂",
+    layout="wide"
+)
+
+
+def render_filters(store) -> dict:
+    """검색 조건 입력"""
+    facets = store.facets()
+    with st.sidebar:
+        st.subheader("🔎 검색 조건")
+        contract_type = st.selectbox("계약 유형", ["전체"] + facets["contract_types"])
+        score_range = st.slider("리스크 점수", 0, 100, (0, 100))
+        risk_levels = st.multiselect("리스크 수준", ["상", "중", "하"])
+        flags = st.multiselect("리스크 유형 (모두 포함)", facets["flags"])
+        text = st.text_input("전문 검색", placeholder="예: 간접손해, 관할 법원")
+        limit = st.number_input("최대 건수", min_value=10, max_value=1000, value=100, step=10)
+    return {
+        "contract_type": None if contract_type == "전체" else contract_type,
+        "min_score": score_range[0] if score_range[0] > 0 else None,
+        "max_score": score_range[1] if score_range[1] < 100 else None,
+        "risk_levels": risk_levels,
+        "flags": flags,
+        "text": text,
+        "limit": int(limit),
+    }
+
+
+def render_report(report: dict):
+    """선택한 분석 결과 요약"""
+    summary = report.get("summary", {})
+    if report.get("partial"):
+        st.warning("⏱️ 분석 제한 시간으로 일부 단계가 생략되거나 중단된 부분 리포트입니다.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📋 계약 유형", summary.get("contract_type", "알 수 없음"))
+    with col2:
+        st.metric("⚠️ 리스크 점수", f"{summary.get('risk_score', 'N/A')}/100")
+    with col3:
+        st.metric("📊 리스크 수준", summary.get("risk_level", "N/A"))
+
+    risks = report.get("risks", {}).get("risks", [])
+    if isinstance(risks, list) and risks:
+        st.write("**주요 리스크**")
+        for risk in risks:
+            if isinstance(risk, dict):
+                st.write(
+                    f"- [{risk.get('severity', '중')}] {risk.get('clause', '')} · "
+                    f"{risk.get('risk_type', '')}: {risk.get('description', '')}"
+                )
+
+    recommendation = report.get("improvements", {}).get("overall_recommendation")
+    if recommendation:
+        st.write(f"**종합 권고:** {recommendation}")
+
+    with st.expander("원본 리포트 (JSON)"):
+        st.code(json.dumps(report, ensure_ascii=False, indent=2), language="json")
+
+
+def main():
+    st.title("📂 분석 이력")
+
+    store = get_result_store()
+    if store is None:
+        st.info("분석 결과 저장소가 비활성화되어 있습니다. (RESULT_STORE_ENABLED)")
+        return
+
+    filters = render_filters(store)
+
+    start = time.perf_counter()
+    rows = store.query(**filters)
+    elapsed = (time.perf_counter() - start) * 1000
+    st.caption(f"전체 {store.count():,}건 중 {len(rows):,}건 · 조회 {elapsed:.1f}ms")
+
+    if not rows:
+        st.info("조건에 맞는 분석 결과가 없습니다.")
+        return
+
+    st.dataframe(
+        [
+            {
+                "분석일시": datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M"),
+                "제목": row["title"],
+                "계약 유형": row["contract_type"],
+                "리스크 점수": row["risk_score"],
+                "리스크 수준": row["risk_level"],
+                # 분석 제한 시간으로 일부 단계가 생략/중단된 리포트
+                "상태": "⚠️ 부분" if row["partial"] else "완료",
+            }
+            for row in rows
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    labels = {
+        row["analysis_id"]: f"{datetime.fromtimestamp(row['created_at']):%m-%d %H:%M} · {row['title']}"
+                            + (" (부분)" if row["partial"] else "")
+        for row in rows
+    }
+    selected = st.selectbox("상세 보기", list(labels), format_func=labels.get)
+    if selected:
+        report = store.get(selected)
+        if report:
+            render_report(report)
+
+
+main()
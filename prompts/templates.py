@@ -1,13 +1,34 @@
 """
 ContractGuard AI - 프롬프트 템플릿 모듈
 역할부여, Chain-of-Thought, Few-shot 프롬프팅 적용
+
+프롬프트는 프로바이더 측 프롬프트 캐시를 활용할 수 있도록
+'고정 프리픽스(system)' + '가변 서픽스(user)' 구조로 구성합니다.
+- system: 공통 프리픽스 + Agent별 역할/CoT/출력 형식/Few-shot (호출마다 동일)
+- user: 계약서 원문, 검색 컨텍스트 등 호출마다 달라지는 값만 포함
 """
+from typing import Any, Dict, List, Optional
+
 
 class PromptTemplates:
     """프롬프트 템플릿 관리"""
-    
+
+    # 모든 Agent가 공유하는 고정 프리픽스 (캐시 공유 구간)
+    SHARED_PREFIX = """# ContractGuard AI 계약서 분석 시스템
+당신은 ContractGuard AI의 Multi-Agent 계약서 분석 시스템을 구성하는 전문 Agent입니다.
+
+## 공통 원칙
+- 모든 답변은 한국어로 작성합니다
+- 계약서 원문과 참조 지식에 근거하여 판단하고, 추측은 추측임을 밝힙니다
+- "갑"은 계약을 위탁/발주하는 당사자, "을"은 수탁/수급하는 당사자로 해석합니다
+- JSON 출력이 요구되면 ```json 코드 블록 하나만 출력합니다
+- 실제 법률 자문을 대체하지 않으며, 중요한 판단은 변호사 검토가 필요함을 전제로 합니다
+
+"""
+
     # 계약 분석 Agent 프롬프트
-    CONTRACT_ANALYZER = """당신은 10년 경력의 전문 계약서 분석가입니다.
+    CONTRACT_ANALYZER_SYSTEM = """## 역할
+당신은 10년 경력의 전문 계약서 분석가입니다.
 계약서를 체계적으로 분석하여 핵심 정보를 추출하는 역할을 담당합니다.
 
 ## 분석 방법 (Chain-of-Thought)
@@ -20,26 +41,26 @@ class PromptTemplates:
 ## 출력 형식
 다음 JSON 형식으로 응답해주세요:
 ```json
-{{
+{
     "contract_type": "계약 유형",
-    "parties": {{"party_a": "갑", "party_b": "을"}},
-    "key_terms": {{
+    "parties": {"party_a": "갑", "party_b": "을"},
+    "key_terms": {
         "amount": "계약 금액",
         "period": "계약 기간",
         "subject": "계약 목적물/대상"
-    }},
+    },
     "clauses_summary": [
-        {{"title": "조항명", "summary": "요약"}}
+        {"title": "조항명", "summary": "요약"}
     ]
-}}
+}
 ```
 
 ## 분석 예시 (Few-shot)
 입력: "제1조 목적: 갑은 을에게 소프트웨어 개발 용역을 위탁한다. 제2조 대금: 금 5천만원"
-출력: {{"contract_type": "용역계약", "key_terms": {{"amount": "5천만원", "subject": "소프트웨어 개발"}}}}
+출력: {"contract_type": "용역계약", "key_terms": {"amount": "5천만원", "subject": "소프트웨어 개발"}}
+"""
 
----
-## 분석할 계약서
+    CONTRACT_ANALYZER_USER = """## 분석할 계약서
 {contract_text}
 
 ## 참조 지식
@@ -47,7 +68,8 @@ class PromptTemplates:
 """
 
     # 리스크 평가 Agent 프롬프트
-    RISK_EVALUATOR = """당신은 기업 법무팀의 리스크 관리 전문가입니다.
+    RISK_EVALUATOR_SYSTEM = """## 역할
+당신은 기업 법무팀의 리스크 관리 전문가입니다.
 계약서의 잠재적 리스크를 식별하고 평가하는 역할을 담당합니다.
 
 ## 분석 방법 (Chain-of-Thought)
@@ -68,39 +90,40 @@ class PromptTemplates:
 
 ## 출력 형식
 ```json
-{{
+{
     "risk_score": 0-100,
     "risk_level": "상/중/하",
     "risks": [
-        {{
+        {
             "clause": "해당 조항",
             "risk_type": "리스크 유형",
             "severity": "상/중/하",
             "description": "리스크 설명",
             "legal_basis": "법적 근거"
-        }}
+        }
     ],
     "safe_clauses": ["안전한 조항 목록"]
-}}
+}
 ```
 
 ## 평가 예시 (Few-shot)
 입력: "손해배상은 직접손해, 간접손해, 특별손해를 포함하며 한도 없이 배상한다"
-출력: {{"risk_type": "무제한 손해배상", "severity": "상", "description": "손해배상 한도 없음"}}
+출력: {"risk_type": "무제한 손해배상", "severity": "상", "description": "손해배상 한도 없음"}
+"""
+
+    RISK_EVALUATOR_USER = """## 원본 계약서
+{contract_text}
 
----
 ## 계약서 분석 결과
 {analysis_result}
 
-## 원본 계약서
-{contract_text}
-
 ## 참조 법률 지식
 {context}
 """
 
-    # 조항 비교 Agent 프롬프트  
-    CLAUSE_COMPARATOR = """당신은 표준계약서 비교 분석 전문가입니다.
+    # 조항 비교 Agent 프롬프트
+    CLAUSE_COMPARATOR_SYSTEM = """## 역할
+당신은 표준계약서 비교 분석 전문가입니다.
 분석 대상 계약서를 표준계약서와 비교하여 차이점을 식별합니다.
 
 ## 비교 방법 (Chain-of-Thought)
@@ -112,31 +135,62 @@ class PromptTemplates:
 
 ## 출력 형식
 ```json
-{{
+{
     "comparison_results": [
-        {{
+        {
             "clause_name": "조항명",
             "status": "일치/변경/누락/추가",
             "current": "현재 계약서 내용",
             "standard": "표준계약서 내용",
             "assessment": "유리/불리/중립"
-        }}
+        }
     ],
     "missing_clauses": ["누락된 표준 조항"],
     "summary": "비교 요약"
-}}
+}
 ```
+"""
 
----
-## 분석 대상 계약서
+    CLAUSE_COMPARATOR_USER = """## 분석 대상 계약서
 {contract_text}
 
 ## 표준계약서 참조
 {context}
+"""
+
+    # 조항 쌍 평가 프롬프트 (로컬 정렬 후 변경된 조항만 평가)
+    CLAUSE_PAIR_ASSESSOR_SYSTEM = """## 역할
+당신은 표준계약서 비교 분석 전문가입니다.
+표준 조항과 대응되는 계약서 조항 쌍이 주어지면, 변경 내용이 "을"에게 유리한지 불리한지 평가합니다.
+
+## 평가 방법 (Chain-of-Thought)
+1. "(대응 확인 필요)"로 표시된 쌍은 먼저 계약서 조항이 표준 조항과 같은 사항을 다루는지 판단합니다
+   (제목이 달라도 내용이 같으면 대응, 다른 사항이면 corresponds를 false로 합니다)
+2. 표준 문구 대비 추가/삭제/수정된 의무, 기간, 금액, 비율을 찾습니다
+3. 변경이 책임·위험을 어느 당사자에게 옮기는지 판단합니다
+4. 실질적 차이가 없으면 "중립"으로 평가합니다
+
+## 출력 형식
+```json
+{
+    "assessments": [
+        {"id": "쌍 ID", "corresponds": true, "assessment": "유리/불리/중립", "difference": "핵심 차이 한 문장"}
+    ],
+    "summary": "비교 요약"
+}
+```
+"""
+
+    CLAUSE_PAIR_ASSESSOR_USER = """## 계약 유형
+{contract_type}
+
+## 평가할 조항 쌍
+{items}
 """
 
     # 개선 제안 Agent 프롬프트
-    IMPROVEMENT_ADVISOR = """당신은 계약 협상 전문 변호사입니다.
+    IMPROVEMENT_ADVISOR_SYSTEM = """## 역할
+당신은 계약 협상 전문 변호사입니다.
 리스크 분석과 비교 결과를 바탕으로 구체적인 개선안을 제시합니다.
 
 ## 제안 방법 (Chain-of-Thought)
@@ -147,23 +201,133 @@ class PromptTemplates:
 
 ## 출력 형식
 ```json
-{{
+{
     "priority_improvements": [
-        {{
+        {
             "priority": 1-5,
             "current_clause": "현재 문구",
             "suggested_clause": "제안 수정 문구",
             "reason": "수정 이유",
             "negotiation_tip": "협상 포인트"
-        }}
+        }
     ],
     "must_change": ["반드시 수정 필요 항목"],
     "negotiable": ["협상 가능 항목"],
     "overall_recommendation": "종합 권고사항"
-}}
+}
 ```
+"""
+
+    IMPROVEMENT_ADVISOR_USER = """## 리스크 평가 결과
+{risk_result}
+
+## 조항 비교 결과
+{comparison_result}
+
+## 참조 지식
+{context}
+"""
+
+    # ---- 간결 출력 모드 (조항 ID/짧은 코드만 출력, 원문 필드는 로컬 조항 인덱스로 복원) ----
+    COMPACT_RULES = """## 간결 출력 규칙
+- 계약서 조항은 [c1], [c2] 형식의 조항 ID로만 지칭하고 조항 제목이나 원문을 다시 쓰지 않습니다
+- 설명 필드는 한 문장(40자 이내)으로 작성합니다
+- 지정된 JSON 스키마의 필드만 출력합니다
+"""
+
+    CONTRACT_ANALYZER_COMPACT_SYSTEM = """## 역할
+당신은 10년 경력의 전문 계약서 분석가입니다.
+계약서 유형, 당사자, 핵심 조건을 추출하고 각 조항을 한 문장으로 요약합니다.
+
+## 출력 형식
+```json
+{
+    "contract_type": "계약 유형 (용역계약/임대차계약/비밀유지계약 등)",
+    "party_a": "갑", "party_b": "을",
+    "amount": "계약 금액", "period": "계약 기간", "subject": "계약 대상",
+    "clauses": [{"id": "c1", "summary": "요약"}]
+}
+```
+"""
+
+    CONTRACT_ANALYZER_COMPACT_USER = """## 분석할 계약서 (조항 ID 포함)
+{clauses}
+
+## 참조 지식
+{context}
+"""
+
+    RISK_EVALUATOR_COMPACT_SYSTEM = """## 역할
+당신은 기업 법무팀의 리스크 관리 전문가입니다.
+각 조항에서 "을"에게 불리하거나 위험한 요소를 찾아 심각도(상/중/하)와 법적 근거를 제시합니다.
+
+## 주요 리스크 체크포인트
+손해배상 범위·한도, 위약금 비율, 일방적 해지권, 지식재산권 귀속, 비밀유지 기간, 분쟁해결, 책임제한
+
+## 출력 형식
+```json
+{
+    "risk_score": 0-100,
+    "risk_level": "상/중/하",
+    "risks": [{"id": "c5", "risk_type": "리스크 유형", "severity": "상/중/하",
+               "description": "리스크 설명", "legal_basis": "법적 근거"}],
+    "safe": ["리스크가 없는 조항 ID"]
+}
+```
+"""
+
+    RISK_EVALUATOR_COMPACT_USER = """## 평가할 조항 (조항 ID 포함)
+{clauses}
+
+## 계약서 분석 결과
+{analysis_result}
+
+## 참조 법률 지식
+{context}
+"""
+
+    CLAUSE_COMPARATOR_COMPACT_SYSTEM = """## 역할
+당신은 표준계약서 비교 분석 전문가입니다.
+각 조항을 표준계약서와 비교하여 상태(일치/변경/추가)와 "을" 기준 유불리를 판정하고,
+표준계약서에 있으나 계약서에 없는 조항을 찾습니다.
+
+## 출력 형식
+```json
+{
+    "results": [{"id": "c3", "status": "일치/변경/추가", "assessment": "유리/불리/중립",
+                 "standard": "대응 표준 조항의 요지"}],
+    "missing": ["누락된 표준 조항명"],
+    "summary": "비교 요약"
+}
+```
+"""
+
+    CLAUSE_COMPARATOR_COMPACT_USER = """## 분석 대상 계약서 (조항 ID 포함)
+{clauses}
+
+## 표준계약서 참조
+{context}
+"""
+
+    IMPROVEMENT_ADVISOR_COMPACT_SYSTEM = """## 역할
+당신은 계약 협상 전문 변호사입니다.
+리스크 분석과 비교 결과를 바탕으로 우선순위별 수정 문구와 협상 전략을 제시합니다.
+
+## 출력 형식
+```json
+{
+    "items": [{"priority": 1-5, "id": "수정할 조항 ID (새 조항이면 null)",
+               "suggested_clause": "제안 수정 문구", "reason": "수정 이유", "tip": "협상 포인트"}],
+    "must_change": ["반드시 수정할 조항 ID 또는 항목"],
+    "negotiable": ["협상 가능한 조항 ID 또는 항목"],
+    "overall": "종합 권고사항"
+}
+```
+"""
+
+    IMPROVEMENT_ADVISOR_COMPACT_USER = """## 계약서 조항 목록
+{clauses}
 
----
 ## 리스크 평가 결과
 {risk_result}
 
@@ -174,8 +338,130 @@ class PromptTemplates:
 {context}
 """
 
+    # 간결 출력 모드의 네이티브 구조화 출력 스키마 (response_format json_schema, strict)
+    COMPACT_SCHEMAS = {
+        "CONTRACT_ANALYZER_COMPACT": {
+            "type": "object",
+            "properties": {
+                "contract_type": {"type": "string"},
+                "party_a": {"type": "string"},
+                "party_b": {"type": "string"},
+                "amount": {"type": "string"},
+                "period": {"type": "string"},
+                "subject": {"type": "string"},
+                "clauses": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "string"}, "summary": {"type": "string"}},
+                        "required": ["id", "summary"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["contract_type", "party_a", "party_b", "amount", "period", "subject", "clauses"],
+            "additionalProperties": False,
+        },
+        "RISK_EVALUATOR_COMPACT": {
+            "type": "object",
+            "properties": {
+                "risk_score": {"type": "integer"},
+                "risk_level": {"type": "string", "enum": ["상", "중", "하"]},
+                "risks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "risk_type": {"type": "string"},
+                            "severity": {"type": "string", "enum": ["상", "중", "하"]},
+                            "description": {"type": "string"},
+                            "legal_basis": {"type": "string"},
+                        },
+                        "required": ["id", "risk_type", "severity", "description", "legal_basis"],
+                        "additionalProperties": False,
+                    },
+                },
+                "safe": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["risk_score", "risk_level", "risks", "safe"],
+            "additionalProperties": False,
+        },
+        "CLAUSE_COMPARATOR_COMPACT": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "status": {"type": "string", "enum": ["일치", "변경", "추가"]},
+                            "assessment": {"type": "string", "enum": ["유리", "불리", "중립"]},
+                            "standard": {"type": "string"},
+                        },
+                        "required": ["id", "status", "assessment", "standard"],
+                        "additionalProperties": False,
+                    },
+                },
+                "missing": {"type": "array", "items": {"type": "string"}},
+                "summary": {"type": "string"},
+            },
+            "required": ["results", "missing", "summary"],
+            "additionalProperties": False,
+        },
+        "CLAUSE_PAIR_ASSESSOR": {
+            "type": "object",
+            "properties": {
+                "assessments": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "corresponds": {"type": "boolean"},
+                            "assessment": {"type": "string", "enum": ["유리", "불리", "중립"]},
+                            "difference": {"type": "string"},
+                        },
+                        "required": ["id", "corresponds", "assessment", "difference"],
+                        "additionalProperties": False,
+                    },
+                },
+                "summary": {"type": "string"},
+            },
+            "required": ["assessments", "summary"],
+            "additionalProperties": False,
+        },
+        "IMPROVEMENT_ADVISOR_COMPACT": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "priority": {"type": "integer"},
+                            "id": {"type": ["string", "null"]},
+                            "suggested_clause": {"type": "string"},
+                            "reason": {"type": "string"},
+                            "tip": {"type": "string"},
+                        },
+                        "required": ["priority", "id", "suggested_clause", "reason", "tip"],
+                        "additionalProperties": False,
+                    },
+                },
+                "must_change": {"type": "array", "items": {"type": "string"}},
+                "negotiable": {"type": "array", "items": {"type": "string"}},
+                "overall": {"type": "string"},
+            },
+            "required": ["items", "must_change", "negotiable", "overall"],
+            "additionalProperties": False,
+        },
+    }
+
     # 대화형 상담 프롬프트
-    CONSULTATION = """당신은 친절한 AI 계약서 상담사입니다.
+    CONSULTATION_SYSTEM = """## 역할
+당신은 친절한 AI 계약서 상담사입니다.
 사용자의 계약서 관련 질문에 전문적이면서도 이해하기 쉽게 답변합니다.
 
 ## 답변 원칙
@@ -183,15 +469,77 @@ class PromptTemplates:
 2. 구체적인 예시를 들어 설명합니다
 3. 추가로 확인해야 할 사항이 있으면 안내합니다
 4. 법률 조언의 한계를 명시합니다 (실제 법률 상담은 변호사에게)
+"""
 
-## 대화 맥락
+    CONSULTATION_USER = """## 대화 맥락
 이전 분석 결과:
 {analysis_summary}
 
-## 사용자 질문
-{user_question}
+## 이전 대화 요약
+{conversation_summary}
+
+## 관련 계약 조항 (업로드한 계약서 원문)
+{contract_clauses}
 
 ## 참조 지식
 {context}
+
+## 사용자 질문
+{user_question}
 """
 
+    # 대화 요약 프롬프트 (오래된 대화를 누적 요약에 병합)
+    CHAT_SUMMARY_SYSTEM = """## 역할
+당신은 계약서 상담 대화의 기록 담당자입니다.
+기존 요약과 새로 밀려난 대화를 합쳐 하나의 갱신된 요약을 작성합니다.
+
+## 작성 원칙
+1. 사용자가 질문한 조항, 우려 사항, 확인된 사실과 AI가 제시한 결론을 보존합니다
+2. 인사말, 반복 설명, 일반론은 생략합니다
+3. 조 번호, 금액, 기간 등 구체적 수치는 그대로 유지합니다
+4. 개조식으로 작성하고, 지정된 분량을 넘지 않으며, 요약문만 출력합니다
+"""
+
+    CHAT_SUMMARY_USER = """## 기존 요약
+{summary}
+
+## 새로 요약할 대화
+{turns}
+
+## 분량
+{max_tokens}토큰 이내
+"""
+
+    @classmethod
+    def get_system_prompt(cls, name: str) -> str:
+        """고정 시스템 프롬프트 반환 (공통 프리픽스 + Agent별 지침)"""
+        if name.endswith("_COMPACT"):
+            return cls.SHARED_PREFIX + cls.COMPACT_RULES + getattr(cls, f"{name}_SYSTEM")
+        return cls.SHARED_PREFIX + getattr(cls, f"{name}_SYSTEM")
+
+    @classmethod
+    def response_format(cls, name: str) -> Optional[Dict[str, Any]]:
+        """템플릿의 구조화 출력 스키마 (response_format, 없으면 None)"""
+        schema = cls.COMPACT_SCHEMAS.get(name)
+        if schema is None:
+            return None
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": name.lower(), "schema": schema, "strict": True},
+        }
+
+    @classmethod
+    def build_messages(cls, name: str, **kwargs) -> List:
+        """system(고정) + user(가변) 메시지 목록 생성
+
+        Args:
+            name: 템플릿 이름 (예: "CONTRACT_ANALYZER")
+            **kwargs: user 템플릿에 채울 가변 값
+        """
+        from langchain_core.messages import SystemMessage, HumanMessage
+
+        user_prompt = getattr(cls, f"{name}_USER").format(**kwargs)
+        return [
+            SystemMessage(content=cls.get_system_prompt(name)),
+            HumanMessage(content=user_prompt)
+        ]
@@ -1,4 +1,19 @@
 # RAG module
-from .vectorstore import VectorStoreManager
-from .retriever import ContractRetriever
+# 하위 모듈은 처음 접근할 때 로드 (패키지 import만으로 무거운 의존성을 불러오지 않도록)
+import importlib
 
+_EXPORTS = {
+    "VectorStoreManager": ".vectorstore",
+    "ContractRetriever": ".retriever",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
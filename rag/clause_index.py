@@ -0,0 +1,212 @@
+"""
+ContractGuard AI - 계약서 조항 인덱스 모듈
+업로드된 계약서의 조항을 분석 시점에 한 번 색인하여 채팅 질의에 관련 조항만 제공
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import app_config
+from utils.text_processor import TextProcessor
+
+
+ARTICLE_REF_PATTERN = re.compile(r'제\s*(\d+)\s*조')
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어 검색용 토큰화 (단어 + 문자 bigram)"""
+    tokens = []
+    for word in re.findall(r'[가-힣]+|[A-Za-z]+|\d+', text.lower()):
+        tokens.append(word)
+        if len(word) > 2 and re.match(r'[가-힣]', word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class ContractClauseIndex:
+    """단일 계약서의 조항 하이브리드(BM25 + 벡터) 인덱스"""
+
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    RRF_K = 60
+
+    def __init__(self, contract_text: str, embeddings: Optional[Embeddings] = None):
+        self.clauses: List[Dict[str, Any]] = []
+        for i, clause in enumerate(TextProcessor.extract_clauses(contract_text)):
+            match = ARTICLE_REF_PATTERN.search(clause["title"])
+            self.clauses.append({
+                "id": f"c{i + 1}",
+                "number": int(match.group(1)) if match else None,
+                "title": clause["title"],
+                "content": clause["content"],
+            })
+        self.created_at = time.time()
+        self._build_lexical()
+        self.vectors = self._build_vectors(embeddings)
+        self._embeddings = embeddings if self.vectors is not None else None
+
+    def _build_lexical(self):
+        """BM25 통계 구축"""
+        self._term_freqs = [Counter(tokenize(f"{c['title']} {c['content']}")) for c in self.clauses]
+        self._doc_lens = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_len = sum(self._doc_lens) / len(self._doc_lens) if self._doc_lens else 0.0
+        doc_freq = Counter(term for tf in self._term_freqs for term in tf)
+        n = len(self.clauses)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def _build_vectors(self, embeddings: Optional[Embeddings]) -> Optional[np.ndarray]:
+        """조항 임베딩 (실패 시 어휘 검색만 사용)"""
+        if embeddings is None or not self.clauses:
+            return None
+        try:
+            vectors = np.array(
+                embeddings.embed_documents([f"{c['title']}\n{c['content']}" for c in self.clauses]),
+                dtype=np.float32
+            )
+        except Exception as e:
+            print(f"⚠️ 조항 임베딩 실패, 어휘 검색만 사용: {e}")
+            return None
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _bm25_scores(self, query: str) -> List[float]:
+        terms = tokenize(query)
+        scores = []
+        for tf, length in zip(self._term_freqs, self._doc_lens):
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                denom = freq + self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * length / (self._avg_len or 1))
+                score += self._idf[term] * freq * (self.BM25_K1 + 1) / denom
+            scores.append(score)
+        return scores
+
+    def _vector_scores(self, query: str) -> Optional[np.ndarray]:
+        if self.vectors is None:
+            return None
+        try:
+            query_vector = np.array(self._embeddings.embed_query(query), dtype=np.float32)
+        except Exception:
+            return None
+        query_vector /= max(np.linalg.norm(query_vector), 1e-12)
+        return self.vectors @ query_vector
+
+    def get_by_number(self, number: int) -> Optional[Dict[str, Any]]:
+        """조 번호로 조항 조회"""
+        for clause in self.clauses:
+            if clause["number"] == number:
+                return clause
+        return None
+
+    def get_by_id(self, clause_id: str) -> Optional[Dict[str, Any]]:
+        """조항 ID(c1, c2, ...)로 조회"""
+        for clause in self.clauses:
+            if clause["id"] == clause_id:
+                return clause
+        return None
+
+    def search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """질문과 관련된 조항 검색 (명시된 조 번호 우선, 이후 RRF 융합 순위)"""
+        if not self.clauses:
+            return []
+
+        results: List[Dict[str, Any]] = []
+        for number in ARTICLE_REF_PATTERN.findall(query):
+            clause = self.get_by_number(int(number))
+            if clause and clause not in results:
+                results.append(clause)
+
+        rankings = []
+        bm25 = self._bm25_scores(query)
+        rankings.append([i for i in sorted(range(len(bm25)), key=lambda i: -bm25[i]) if bm25[i] > 0])
+        vector_scores = self._vector_scores(query)
+        if vector_scores is not None:
+            rankings.append(list(np.argsort(-vector_scores)))
+
+        fused: Dict[int, float] = {}
+        for ranking in rankings:
+            for rank, index in enumerate(ranking):
+                fused[int(index)] = fused.get(int(index), 0.0) + 1.0 / (self.RRF_K + rank + 1)
+
+        for index in sorted(fused, key=lambda i: -fused[i]):
+            if len(results) >= k:
+                break
+            if self.clauses[index] not in results:
+                results.append(self.clauses[index])
+        return results
+
+    @staticmethod
+    def format_context(clauses: List[Dict[str, Any]], max_chars: int = 800) -> str:
+        """프롬프트에 넣을 조항 컨텍스트 문자열"""
+        if not clauses:
+            return "관련 계약 조항을 찾을 수 없습니다."
+        return "\n\n".join(
+            f"{clause['title']}\n{clause['content'][:max_chars]}" for clause in clauses
+        )
+
+
+class ClauseIndexRegistry:
+    """세션별 조항 인덱스 저장소 (LRU + 유휴시간 만료)"""
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_sessions = max_sessions or app_config.clause_index_max_sessions
+        self.ttl_seconds = ttl_seconds or app_config.clause_index_ttl_sec
+        self._indexes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        session_id: str,
+        contract_text: str,
+        embeddings: Optional[Embeddings] = None
+    ) -> ContractClauseIndex:
+        """세션의 계약서 조항 인덱스 생성 (기존 인덱스 교체)"""
+        return self.register(session_id, ContractClauseIndex(contract_text, embeddings))
+
+    def register(self, session_id: str, index: ContractClauseIndex) -> ContractClauseIndex:
+        """미리 만들어 둔 조항 인덱스를 세션에 등록 (기존 인덱스 교체)"""
+        with self._lock:
+            self._indexes[session_id] = {"index": index, "last_access": time.time()}
+            self._indexes.move_to_end(session_id)
+            self._evict_locked()
+        return index
+
+    def get(self, session_id: str) -> Optional[ContractClauseIndex]:
+        """세션 인덱스 조회 (만료 시 None)"""
+        with self._lock:
+            self._evict_locked()
+            entry = self._indexes.get(session_id)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            self._indexes.move_to_end(session_id)
+            return entry["index"]
+
+    def evict(self, session_id: str):
+        """세션 종료/초기화 시 인덱스 제거"""
+        with self._lock:
+            self._indexes.pop(session_id, None)
+
+    def _evict_locked(self):
+        cutoff = time.time() - self.ttl_seconds
+        for session_id in [s for s, e in self._indexes.items() if e["last_access"] < cutoff]:
+            del self._indexes[session_id]
+        while len(self._indexes) > self.max_sessions:
+            self._indexes.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+# 전역 인스턴스 (Streamlit 세션 간 공유, 세션 ID로 분리)
+clause_index_registry = ClauseIndexRegistry()
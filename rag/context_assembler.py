@@ -0,0 +1,202 @@
+"""
+ContractGuard AI - 컨텍스트 조립 모듈
+검색 후보 청크를 프롬프트에 넣기 전에 겹치는 인접 청크 병합 → 관련도 임계값 컷 →
+MMR(최대 한계 관련성) 재순위 → 토큰 예산 채우기 순서로 정리하여 중복 없이 적은 토큰으로 구성
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from config.settings import app_config
+from utils.text_processor import TextProcessor
+
+
+# 검색 후보: (청크, 관련도 점수, 정규화된 임베딩 또는 None)
+Candidate = Tuple[Document, float, Optional[np.ndarray]]
+
+# 텍스트만으로 겹침을 판정할 때 최소 겹침 길이 (우연한 일치 방지)
+MIN_TEXT_OVERLAP = 20
+
+SENTENCE_END_PATTERN = re.compile(r'(?:다\.|\.|\n)\s*')
+
+
+def _passage(doc: Document, score: float, vector: Optional[np.ndarray]) -> Dict[str, Any]:
+    start = doc.metadata.get("start_index")
+    return {
+        "content": doc.page_content,
+        "metadata": {k: v for k, v in doc.metadata.items() if k != "start_index"},
+        "source": doc.metadata.get("source", "unknown"),
+        "start": start,
+        "end": start + len(doc.page_content) if start is not None else None,
+        "score": float(score),
+        "vector": vector,
+        # 본문 중 가장 관련도가 높은 청크의 시작 위치 (예산 초과 시 여기서부터 자름)
+        "anchor": 0,
+    }
+
+
+def _text_overlap(left: str, right: str, max_overlap: int) -> int:
+    """left의 끝과 right의 앞이 겹치는 최대 길이 (MIN_TEXT_OVERLAP 미만이면 0)"""
+    for size in range(min(len(left), len(right), max_overlap), MIN_TEXT_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _join(
+    first: Dict[str, Any],
+    second: Dict[str, Any],
+    max_overlap: int
+) -> Optional[Tuple[str, int, int]]:
+    """같은 원본의 두 청크가 겹치거나 맞닿으면 (이어 붙인 본문, first 위치, second 위치), 아니면 None"""
+    if first["source"] != second["source"]:
+        return None
+    if first["start"] is not None and second["start"] is not None:
+        if first["start"] > second["start"]:
+            joined = _join(second, first, max_overlap)
+            return (joined[0], joined[2], joined[1]) if joined else None
+        if second["start"] > first["end"]:
+            return None
+        offset = second["start"] - first["start"]
+        if second["end"] <= first["end"]:
+            return first["content"], 0, offset
+        return first["content"] + second["content"][first["end"] - second["start"]:], 0, offset
+    # 시작 위치가 없는 청크(이전 스냅샷/Chroma)는 본문 겹침으로 판정
+    overlap = _text_overlap(first["content"], second["content"], max_overlap)
+    if overlap:
+        return first["content"] + second["content"][overlap:], 0, len(first["content"]) - overlap
+    overlap = _text_overlap(second["content"], first["content"], max_overlap)
+    if overlap:
+        return second["content"] + first["content"][overlap:], len(second["content"]) - overlap, 0
+    return None
+
+
+def merge_adjacent(passages: List[Dict[str, Any]], max_overlap: Optional[int] = None) -> List[Dict[str, Any]]:
+    """겹치는 인접 청크를 하나의 구절로 병합 (점수는 최댓값, 임베딩은 정규화한 합)"""
+    max_overlap = max_overlap if max_overlap is not None else app_config.chunk_overlap * 2
+    ordered = sorted(passages, key=lambda p: (p["source"], p["start"] if p["start"] is not None else -1))
+    merged: List[Dict[str, Any]] = []
+    for passage in ordered:
+        for target in merged:
+            joined = _join(target, passage, max_overlap)
+            if joined is None:
+                continue
+            content, target_offset, passage_offset = joined
+            if passage["score"] > target["score"]:
+                target["anchor"] = passage_offset + passage["anchor"]
+            else:
+                target["anchor"] = target_offset + target["anchor"]
+            if target["start"] is not None and passage["start"] is not None:
+                target["start"] = min(target["start"], passage["start"])
+                target["end"] = max(target["end"], passage["end"])
+            target["content"] = content
+            target["score"] = max(target["score"], passage["score"])
+            if target["vector"] is not None and passage["vector"] is not None:
+                combined = target["vector"] + passage["vector"]
+                norm = np.linalg.norm(combined)
+                target["vector"] = combined / norm if norm > 0 else combined
+            else:
+                target["vector"] = None
+            target["merged"] = target.get("merged", 1) + 1
+            break
+        else:
+            merged.append(dict(passage))
+    return merged
+
+
+def mmr_order(scores: np.ndarray, vectors: np.ndarray, lambda_mult: float, limit: int) -> List[int]:
+    """MMR 선택 순서 (유사도 행렬을 한 번에 계산하고 선택할 때마다 최대 유사도만 갱신)"""
+    count = len(scores)
+    similarity = vectors @ vectors.T
+    redundancy = np.full(count, -np.inf, dtype=np.float32)
+    available = np.ones(count, dtype=bool)
+    order: List[int] = []
+    for _ in range(min(limit, count)):
+        # 첫 선택은 순수 관련도, 이후에는 이미 고른 구절과의 최대 유사도만큼 감점
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        mmr = lambda_mult * scores - (1 - lambda_mult) * penalty
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        order.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+    return order
+
+
+def _fit(content: str, anchor: int, budget_tokens: int) -> str:
+    """토큰 예산에 맞게 자름 (가장 관련도 높은 청크 위치부터, 가능하면 문장 경계에서)"""
+    if TextProcessor.count_tokens_approx(content) <= budget_tokens:
+        return content
+    content = content[anchor:]
+    tokens = TextProcessor.count_tokens_approx(content)
+    while tokens > budget_tokens and content:
+        cut = content[:int(len(content) * budget_tokens / tokens)]
+        boundaries = [match.end() for match in SENTENCE_END_PATTERN.finditer(cut)]
+        if boundaries and boundaries[-1] >= len(cut) // 2:
+            cut = cut[:boundaries[-1]]
+        content = cut.rstrip()
+        tokens = TextProcessor.count_tokens_approx(content)
+    return content
+
+
+def assemble_context(
+    candidates: List[Candidate],
+    max_passages: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    relevance_ratio: Optional[float] = None,
+    min_relevance: Optional[float] = None,
+    lambda_mult: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """검색 후보 → 프롬프트에 넣을 구절 목록
+
+    1. 같은 원본에서 겹치는 인접 청크 병합
+    2. 관련도 컷: 최고 점수 × relevance_ratio 및 min_relevance 미만 제외 (고정 k 대신)
+    3. MMR 재순위 (임베딩이 없으면 관련도 순)
+    4. 토큰 예산을 채울 때까지 추가, 마지막 구절은 문장 경계에서 잘라 예산에 맞춤
+
+    Returns:
+        (구절 목록, {"candidates", "merged", "kept", "passages", "tokens"})
+    """
+    max_passages = max_passages or app_config.retriever_k
+    token_budget = token_budget or app_config.context_token_budget
+    relevance_ratio = app_config.context_relevance_ratio if relevance_ratio is None else relevance_ratio
+    min_relevance = app_config.context_min_relevance if min_relevance is None else min_relevance
+    lambda_mult = app_config.context_mmr_lambda if lambda_mult is None else lambda_mult
+
+    passages = merge_adjacent([_passage(*candidate) for candidate in candidates])
+    stats = {"candidates": len(candidates), "merged": len(passages), "kept": 0, "passages": 0, "tokens": 0}
+    if not passages:
+        return [], stats
+
+    top_score = max(p["score"] for p in passages)
+    # 최고 점수 구절은 항상 남김 (점수가 모두 낮거나 음수여도 빈 컨텍스트가 되지 않도록)
+    cutoff = min(top_score, max(min_relevance, top_score * relevance_ratio if top_score > 0 else top_score))
+    passages = [p for p in passages if p["score"] >= cutoff]
+    stats["kept"] = len(passages)
+
+    scores = np.array([p["score"] for p in passages], dtype=np.float32)
+    if all(p["vector"] is not None for p in passages):
+        vectors = np.stack([np.asarray(p["vector"], dtype=np.float32) for p in passages])
+        order = mmr_order(scores, vectors, lambda_mult, max_passages)
+    else:
+        order = list(np.argsort(-scores)[:max_passages])
+
+    selected: List[Dict[str, Any]] = []
+    remaining = token_budget
+    for index in order:
+        passage = passages[index]
+        content = _fit(passage["content"], passage["anchor"], remaining)
+        tokens = TextProcessor.count_tokens_approx(content)
+        # 잘린 구절이 너무 짧으면 넣지 않고 종료
+        if not content or (content != passage["content"] and tokens < token_budget // 10):
+            break
+        selected.append({**passage, "content": content, "tokens": tokens})
+        remaining -= tokens
+        if remaining <= 0:
+            break
+
+    stats["passages"] = len(selected)
+    stats["tokens"] = token_budget - remaining
+    return selected, stats
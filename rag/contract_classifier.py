@@ -0,0 +1,194 @@
+"""
+ContractGuard AI - 계약 유형 로컬 분류 모듈
+계약서 머리말과 조 제목의 문자 n-gram TF-IDF로 계약 유형을 밀리초 단위로 예측하여
+LLM 분석 결과를 기다리지 않고 표준 템플릿 검색/조항 비교를 먼저 시작
+"""
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import app_config
+from utils.text_processor import CONTRACT_TYPE_KEYWORDS, TextProcessor
+
+
+ARTICLE_TITLE_PATTERN = re.compile(r'제\s*\d+\s*조[^\n]*')
+NGRAM_SIZES = (2, 3)
+HEADER_CHARS = 300
+
+
+def normalize_contract_type(contract_type: str) -> str:
+    """자유 형식 계약 유형을 표준 유형명으로 정규화 (예: '소프트웨어 개발 용역계약' → '용역계약')"""
+    contract_type = (contract_type or "").strip()
+    normalized = TextProcessor.identify_contract_type(contract_type)
+    return contract_type if normalized == "일반계약" and contract_type else normalized
+
+
+def classifier_text(contract_text: str) -> str:
+    """분류 입력: 첫 조항 앞 머리말 + 조 제목 목록"""
+    first_article = ARTICLE_TITLE_PATTERN.search(contract_text)
+    header = contract_text[:first_article.start() if first_article else HEADER_CHARS][:HEADER_CHARS]
+    titles = ARTICLE_TITLE_PATTERN.findall(contract_text)
+    return "\n".join([header, *titles])
+
+
+def char_ngrams(text: str) -> Counter:
+    """공백 단위 토큰 내부의 문자 n-gram 빈도"""
+    grams = Counter()
+    for token in re.findall(r'[가-힣A-Za-z0-9]+', text.lower()):
+        for n in NGRAM_SIZES:
+            grams.update(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class ContractTypeClassifier:
+    """문자 n-gram TF-IDF 최근접 중심 분류기
+
+    - 유형별 TF-IDF 중심 벡터와의 코사인 유사도를 softmax로 정규화하여 신뢰도로 사용
+    - 학습 데이터: 표준 템플릿(유형 라벨), 유형 키워드 사전, 분석 이력
+    """
+
+    def __init__(self, temperature: float = 0.05):
+        self.temperature = temperature
+        self.idf: Dict[str, float] = {}
+        self.centroids: Dict[str, Dict[str, float]] = {}
+        self.samples = 0
+
+    def _vector(self, grams: Counter) -> Dict[str, float]:
+        vector = {
+            gram: (1 + math.log(count)) * self.idf[gram]
+            for gram, count in grams.items() if gram in self.idf
+        }
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        return {gram: v / norm for gram, v in vector.items()} if norm else {}
+
+    def fit(self, samples: List[Tuple[str, str]]) -> "ContractTypeClassifier":
+        """(라벨, 분류 입력 텍스트) 목록으로 학습"""
+        documents = [(label, char_ngrams(text)) for label, text in samples if label and text]
+        document_frequency = Counter()
+        for _, grams in documents:
+            document_frequency.update(grams.keys())
+        total = len(documents)
+        self.idf = {
+            gram: math.log((1 + total) / (1 + df)) + 1 for gram, df in document_frequency.items()
+        }
+
+        sums: Dict[str, Counter] = {}
+        for label, grams in documents:
+            sums.setdefault(label, Counter()).update(self._vector(grams))
+        self.centroids = {}
+        for label, summed in sums.items():
+            norm = math.sqrt(sum(v * v for v in summed.values()))
+            if norm:
+                self.centroids[label] = {gram: v / norm for gram, v in summed.items()}
+        self.samples = total
+        return self
+
+    def predict(self, contract_text: str) -> Tuple[str, float]:
+        """계약 유형과 신뢰도(0~1) 예측"""
+        vector = self._vector(char_ngrams(classifier_text(contract_text)))
+        if not vector or not self.centroids:
+            return "일반계약", 0.0
+
+        scores = {
+            label: sum(weight * centroid.get(gram, 0.0) for gram, weight in vector.items())
+            for label, centroid in self.centroids.items()
+        }
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        total = sum(math.exp((score - top) / self.temperature) for score in scores.values())
+        return best, 1.0 / total
+
+
+def template_samples() -> List[Tuple[str, str]]:
+    """표준 템플릿과 유형 키워드 사전 학습 샘플"""
+    from rag.standard_alignment import parse_standard_templates
+
+    samples = [
+        (contract_type, " ".join([contract_type, *keywords]))
+        for contract_type, keywords in CONTRACT_TYPE_KEYWORDS.items()
+    ]
+    template_path = os.path.join(app_config.data_dir, "raw", "standard_contracts.txt")
+    if os.path.exists(template_path):
+        with open(template_path, "r", encoding="utf-8") as f:
+            templates = parse_standard_templates(f.read())
+        for name, articles in templates.items():
+            titles = [f"제{a['number']}조 ({a['title']})" for a in articles]
+            samples.append((normalize_contract_type(name), "\n".join([name, *titles])))
+    return samples
+
+
+def history_samples(limit: int = 2000) -> List[Tuple[str, str]]:
+    """분석 이력 저장소의 (LLM 판정 유형, 계약서) 학습 샘플"""
+    from storage.result_store import get_result_store
+
+    store = get_result_store()
+    if store is None:
+        return []
+    return [
+        (normalize_contract_type(contract_type), classifier_text(contract_text))
+        for contract_type, contract_text in store.training_samples(limit)
+    ]
+
+
+_classifier: Optional[ContractTypeClassifier] = None
+_classifier_key: Optional[Tuple[str, int]] = None
+_classifier_lock = threading.Lock()
+_retraining = False
+
+
+def _train(key: Tuple[str, int]) -> ContractTypeClassifier:
+    global _classifier, _classifier_key
+    classifier = ContractTypeClassifier().fit(template_samples() + history_samples())
+    with _classifier_lock:
+        _classifier, _classifier_key = classifier, key
+    return classifier
+
+
+def _retrain_in_background(key: Tuple[str, int]):
+    global _retraining
+    try:
+        _train(key)
+    except Exception as e:
+        print(f"⚠️ 계약 유형 분류기 재학습 실패, 이전 모델을 계속 사용합니다: {e}")
+    finally:
+        with _classifier_lock:
+            _retraining = False
+
+
+def get_contract_classifier() -> ContractTypeClassifier:
+    """공용 분류기 (지식 베이스가 바뀌거나 분석 이력이 일정 수 이상 늘면 재학습)
+
+    최초 1회만 요청 경로에서 학습하고, 이후 재학습은 백그라운드 스레드에서 진행하며
+    끝날 때까지 이전 모델로 예측합니다.
+    """
+    global _retraining
+    from rag.vectorstore import get_kb_version
+    from storage.result_store import get_result_store
+
+    store = get_result_store()
+    key = (get_kb_version(), store.count() if store is not None else 0)
+    with _classifier_lock:
+        classifier = _classifier
+        if classifier is not None:
+            stale = _classifier_key[0] != key[0] \
+                or key[1] - _classifier_key[1] >= app_config.classifier_retrain_every
+            if stale and not _retraining:
+                _retraining = True
+                threading.Thread(
+                    target=_retrain_in_background, args=(key,), name="classifier-retrain", daemon=True
+                ).start()
+            return classifier
+    return _train(key)
+
+
+def predict_contract_type(contract_text: str) -> Dict[str, Any]:
+    """계약 유형 예측 결과 {"contract_type", "confidence", "confident"}"""
+    contract_type, confidence = get_contract_classifier().predict(contract_text)
+    return {
+        "contract_type": contract_type,
+        "confidence": round(confidence, 3),
+        "confident": confidence >= app_config.classifier_confidence_threshold,
+    }
@@ -0,0 +1,345 @@
+"""
+ContractGuard AI - 지식 베이스 스냅샷 모듈
+지식 베이스를 변경 불가능한 버전별 스냅샷(벡터 행렬 + 청크 + 매니페스트)으로 빌드하고,
+활성 버전 포인터를 원자적으로 교체하여 처리 중인 요청에 영향 없이 새 버전으로 전환
+
+디렉터리 구조 (root = app_config.vectorstore_dir):
+    snapshots/<version>/manifest.json   버전, 원본 해시, 임베딩 모델, 청크 설정
+    snapshots/<version>/vectors.npy     정규화된 float32 임베딩 (읽기 전용 메모리 매핑, 재채점용)
+    snapshots/<version>/codes.npy       int8/이진 양자화 코드 (양자화 시, 전체 스캔용)
+    snapshots/<version>/scale.npy       int8 차원별 스케일
+    snapshots/<version>/chunks.jsonl    청크 본문과 메타데이터
+    ACTIVE                              활성 버전 (os.replace로 원자적 교체)
+
+사용법:
+    python -m rag.kb_snapshot build              # data/raw에서 새 스냅샷 빌드 후 활성화
+    python -m rag.kb_snapshot build --no-activate
+    python -m rag.kb_snapshot build --quantization int8
+    python -m rag.kb_snapshot activate <version> # 이전 버전으로 롤백 등
+    python -m rag.kb_snapshot list
+    python -m rag.kb_snapshot prune
+"""
+import argparse
+import contextvars
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from config.settings import app_config, kb_snapshot_config
+from .vector_index import QUANTIZATIONS, VectorIndex, normalize, quantize
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOTS_DIR = "snapshots"
+ACTIVE_FILE = "ACTIVE"
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+CODE_FILES = {"codes": "codes.npy", "scale": "scale.npy"}
+CHUNKS_FILE = "chunks.jsonl"
+
+# 분석 1건 동안 고정할 스냅샷 (root → KBSnapshot, 노드/스레드가 같은 버전을 보도록)
+_pinned: contextvars.ContextVar = contextvars.ContextVar("kb_pinned_snapshots", default=None)
+
+
+def embedding_model_id(embeddings: Embeddings) -> str:
+    """스냅샷과 질의 임베딩의 호환성 확인용 모델 식별자 (차원 축소 시 "모델@차원")"""
+    model_id = type(embeddings).__name__
+    for attr in ("deployment", "model"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            model_id = value
+            break
+    dimensions = getattr(embeddings, "dimensions", None)
+    return f"{model_id}@{dimensions}" if isinstance(dimensions, int) and dimensions else model_id
+
+
+def snapshot_version(chunks: List[Document], model_id: str, quantization: str = "none") -> str:
+    """청크 내용 + 임베딩 모델 + 양자화 기준 버전 (같은 내용이면 같은 버전 → 캐시 유지)"""
+    digest = hashlib.sha256(f"{SNAPSHOT_FORMAT}\0{model_id}\0{quantization}".encode("utf-8"))
+    for chunk in chunks:
+        digest.update(b"\0")
+        digest.update(chunk.page_content.encode("utf-8"))
+        digest.update(json.dumps(chunk.metadata, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _snapshot_dir(root: str, version: str) -> str:
+    return os.path.join(root, SNAPSHOTS_DIR, version)
+
+
+def build_snapshot(
+    chunks: List[Document],
+    embeddings: Embeddings,
+    root: str,
+    details: Optional[Dict[str, Any]] = None,
+    activate: bool = True,
+    quantization: Optional[str] = None
+) -> Dict[str, Any]:
+    """분할된 청크로 스냅샷 빌드 (임시 디렉터리에 쓰고 완성 후 rename)
+
+    같은 버전이 이미 있으면 다시 임베딩하지 않고 기존 스냅샷을 사용합니다.
+
+    Args:
+        details: 매니페스트에 함께 기록할 정보 (원본 파일 해시, 청크 설정 등)
+        quantization: 검색용 양자화 (기본값: KB_QUANTIZATION)
+
+    Returns:
+        스냅샷 매니페스트
+    """
+    if not chunks:
+        raise ValueError("스냅샷으로 만들 청크가 없습니다.")
+    quantization = quantization or kb_snapshot_config.quantization
+    model_id = embedding_model_id(embeddings)
+    version = snapshot_version(chunks, model_id, quantization)
+    target = _snapshot_dir(root, version)
+
+    if not os.path.exists(os.path.join(target, MANIFEST_FILE)):
+        vectors = normalize(embeddings.embed_documents([chunk.page_content for chunk in chunks]))
+        codes = quantize(vectors, quantization)
+
+        staging = os.path.join(root, SNAPSHOTS_DIR, f".build-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            np.save(os.path.join(staging, VECTORS_FILE), vectors)
+            for name, array in codes.items():
+                np.save(os.path.join(staging, CODE_FILES[name]), array)
+            with open(os.path.join(staging, CHUNKS_FILE), "w", encoding="utf-8") as f:
+                for chunk in chunks:
+                    f.write(json.dumps(
+                        {"content": chunk.page_content, "metadata": chunk.metadata}, ensure_ascii=False
+                    ) + "\n")
+            manifest = {
+                "format": SNAPSHOT_FORMAT,
+                "version": version,
+                "created_at": time.time(),
+                "embedding_model": model_id,
+                "dimensions": int(vectors.shape[1]),
+                "quantization": quantization,
+                "chunk_count": len(chunks),
+                **(details or {}),
+            }
+            # 매니페스트를 마지막에 써서 매니페스트가 있는 스냅샷은 항상 완성본
+            with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # 다른 프로세스가 같은 버전을 먼저 완성함
+                if not os.path.exists(os.path.join(target, MANIFEST_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    if activate:
+        activate_snapshot(version, root)
+    return read_manifest(root, version)
+
+
+def read_manifest(root: str, version: str) -> Dict[str, Any]:
+    with open(os.path.join(_snapshot_dir(root, version), MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def activate_snapshot(version: str, root: str):
+    """활성 버전 포인터를 원자적으로 교체 (읽는 쪽은 이전 또는 새 버전 중 하나만 봄)"""
+    if not os.path.exists(os.path.join(_snapshot_dir(root, version), MANIFEST_FILE)):
+        raise ValueError(f"완성된 스냅샷이 없습니다: {version}")
+    pointer = os.path.join(root, ACTIVE_FILE)
+    staging = f"{pointer}.{uuid.uuid4().hex}.tmp"
+    with open(staging, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(staging, pointer)
+    get_snapshot_registry(root).refresh()
+
+
+def active_version(root: str) -> Optional[str]:
+    """활성 스냅샷 버전 (없으면 None)"""
+    try:
+        with open(os.path.join(root, ACTIVE_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_snapshots(root: str) -> List[Dict[str, Any]]:
+    """완성된 스냅샷 매니페스트 목록 (최신순)"""
+    base = os.path.join(root, SNAPSHOTS_DIR)
+    if not os.path.isdir(base):
+        return []
+    manifests = []
+    for name in os.listdir(base):
+        if not name.startswith(".") and os.path.exists(os.path.join(base, name, MANIFEST_FILE)):
+            manifests.append(read_manifest(root, name))
+    return sorted(manifests, key=lambda m: m["created_at"], reverse=True)
+
+
+def prune_snapshots(root: str, keep: Optional[int] = None) -> List[str]:
+    """오래된 스냅샷 삭제 (활성 버전과 최근 keep개 유지, 삭제한 버전 반환)
+
+    이미 메모리 매핑한 프로세스는 파일이 삭제되어도 기존 매핑으로 계속 읽을 수 있습니다.
+    """
+    keep = kb_snapshot_config.keep_versions if keep is None else keep
+    active = active_version(root)
+    removed = []
+    for manifest in list_snapshots(root)[keep:]:
+        if manifest["version"] != active:
+            shutil.rmtree(_snapshot_dir(root, manifest["version"]), ignore_errors=True)
+            removed.append(manifest["version"])
+    return removed
+
+
+class KBSnapshot:
+    """로드한 스냅샷 하나 (float 벡터는 읽기 전용 메모리 매핑, 양자화 코드는 메모리에 적재)"""
+
+    def __init__(self, root: str, version: str):
+        path = _snapshot_dir(root, version)
+        self.version = version
+        self.manifest = read_manifest(root, version)
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        codes = {
+            name: np.load(os.path.join(path, filename))
+            for name, filename in CODE_FILES.items()
+            if os.path.exists(os.path.join(path, filename))
+        }
+        self.index = VectorIndex(
+            vectors,
+            self.manifest.get("quantization", "none"),
+            codes=codes,
+            rescore_factor=kb_snapshot_config.rescore_factor
+        )
+        self.documents: List[Document] = []
+        with open(os.path.join(path, CHUNKS_FILE), encoding="utf-8") as f:
+            for line in f:
+                item = json.loads(line)
+                self.documents.append(Document(page_content=item["content"], metadata=item["metadata"]))
+
+    def search(self, query_vector: List[float], k: int = 5) -> List[Document]:
+        """코사인 유사도 상위 k개 청크"""
+        return [doc for doc, _, _ in self.search_candidates(query_vector, k)]
+
+    def search_candidates(self, query_vector: List[float], k: int = 5) -> List[Tuple[Document, float, np.ndarray]]:
+        """코사인 유사도 상위 k개 (청크, 유사도, 정규화된 벡터) - 컨텍스트 조립(MMR)용"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape[0] != self.index.dimensions:
+            raise ValueError(
+                f"질의 임베딩 차원({query.shape[0]})이 스냅샷({self.index.dimensions}, "
+                f"{self.manifest['embedding_model']})과 다릅니다. 현재 임베딩 모델로 스냅샷을 다시 빌드하세요."
+            )
+        query = normalize(query)
+        rows = self.index.search(query, k)
+        vectors = np.asarray(self.index.vectors[rows], dtype=np.float32)
+        scores = vectors @ query
+        return [(self.documents[row], float(score), vector) for row, score, vector in zip(rows, scores, vectors)]
+
+
+class SnapshotRegistry:
+    """root 하나의 활성 스냅샷 관리
+
+    - ACTIVE 포인터는 check_interval_sec마다 다시 읽고, 바뀌면 새 스냅샷을 로드한 뒤 참조만 교체
+    - 교체 전에 current()로 받은 스냅샷은 그대로 유효 (처리 중인 요청은 이전 버전으로 완료)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._snapshot: Optional[KBSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[KBSnapshot]:
+        """활성 스냅샷 (kb_scope 안에서는 처음 본 버전으로 고정, 없으면 None)"""
+        pins = _pinned.get()
+        if pins is not None and self.root in pins:
+            return pins[self.root]
+
+        if time.monotonic() - self._checked_at >= kb_snapshot_config.check_interval_sec:
+            self.refresh()
+        snapshot = self._snapshot
+        if pins is not None:
+            pins[self.root] = snapshot
+        return snapshot
+
+    def refresh(self):
+        """ACTIVE 포인터를 다시 읽고 버전이 바뀌었으면 교체"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = active_version(self.root)
+            if version is None:
+                self._snapshot = None
+            elif self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = KBSnapshot(self.root, version)
+
+
+_registries: Dict[str, SnapshotRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_snapshot_registry(root: str) -> SnapshotRegistry:
+    """root별 공용 레지스트리"""
+    key = os.path.abspath(root)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SnapshotRegistry(key)
+        return registry
+
+
+@contextmanager
+def kb_scope() -> Iterator[None]:
+    """이 블록(분석 1건) 안의 검색이 모두 같은 스냅샷 버전을 사용하도록 고정"""
+    token = _pinned.set({})
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI 지식 베이스 스냅샷 관리")
+    parser.add_argument("--root", default=app_config.vectorstore_dir, help="스냅샷 저장 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="data/raw에서 스냅샷 빌드")
+    build.add_argument("--no-activate", action="store_true", help="빌드만 하고 활성화하지 않음")
+    build.add_argument("--quantization", choices=QUANTIZATIONS, default=None, help="검색용 양자화 (기본: KB_QUANTIZATION)")
+    activate = commands.add_parser("activate", help="활성 버전 전환")
+    activate.add_argument("version")
+    commands.add_parser("list", help="스냅샷 목록")
+    prune = commands.add_parser("prune", help="오래된 스냅샷 삭제")
+    prune.add_argument("--keep", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from rag.vectorstore import VectorStoreManager, load_knowledge_documents
+
+        manifest = VectorStoreManager(persist_directory=args.root).build_snapshot(
+            load_knowledge_documents(), activate=not args.no_activate, quantization=args.quantization
+        )
+        state = "활성화" if not args.no_activate else "빌드만 완료"
+        print(f"✅ 스냅샷 {manifest['version']} ({manifest['chunk_count']}개 청크, {state})")
+    elif args.command == "activate":
+        activate_snapshot(args.version, args.root)
+        print(f"✅ 활성 버전: {args.version}")
+    elif args.command == "list":
+        active = active_version(args.root)
+        for manifest in list_snapshots(args.root):
+            marker = "*" if manifest["version"] == active else " "
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["created_at"]))
+            print(
+                f"{marker} {manifest['version']}  {created}  {manifest['chunk_count']:5d}개 청크  "
+                f"{manifest['embedding_model']} ({manifest['dimensions']}차원, {manifest.get('quantization', 'none')})"
+            )
+    elif args.command == "prune":
+        removed = prune_snapshots(args.root, args.keep)
+        print(f"🗑️ {len(removed)}개 삭제: {', '.join(removed) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,24 @@
 ContractGuard AI - Retriever 모듈
 계약서 분석을 위한 지식 검색
 """
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any
-from langchain.schema import Document
-from .vectorstore import VectorStoreManager
+from langchain_core.documents import Document
+from config.settings import app_config
+from .context_assembler import assemble_context
+from .vectorstore import VectorStoreManager, get_kb_version
+from utils.tracing import tracer
+
+
+# 분석 유형별 검색 질의 템플릿
+QUERY_TEMPLATES = {
+    "risk": "계약서 리스크 체크리스트: {text}",
+    "legal": "다음 계약 조항과 관련된 법률 조항 및 리스크: {text}",
+    "standard": "{text}에 대한 표준계약서 조항",
+    "general": "{text}",
+}
 
 
 class ContractRetriever:
@@ -15,20 +30,24 @@ class ContractRetriever:
             vectorstore_manager = VectorStoreManager()
             vectorstore_manager.load_vectorstore()
         self.vs_manager = vectorstore_manager
+        # 분석 유형 + 검색어 + 지식 베이스 버전별 컨텍스트 LRU (업로드 직후 예열한 결과 재사용)
+        self._context_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._context_lock = threading.Lock()
+        self.context_cache_stats = {"hits": 0, "misses": 0}
     
     def search_legal_basis(self, clause_text: str, k: int = 3) -> List[Document]:
         """조항에 대한 법률적 근거 검색"""
-        query = f"다음 계약 조항과 관련된 법률 조항 및 리스크: {clause_text}"
+        query = QUERY_TEMPLATES["legal"].format(text=clause_text)
         return self.vs_manager.similarity_search(query, k=k)
     
     def search_standard_clause(self, clause_type: str, k: int = 3) -> List[Document]:
         """표준 조항 검색"""
-        query = f"{clause_type}에 대한 표준계약서 조항"
+        query = QUERY_TEMPLATES["standard"].format(text=clause_type)
         return self.vs_manager.similarity_search(query, k=k)
     
     def search_risk_keywords(self, text: str, k: int = 5) -> List[Document]:
         """리스크 키워드 관련 정보 검색"""
-        query = f"계약서 리스크 체크리스트: {text}"
+        query = QUERY_TEMPLATES["risk"].format(text=text)
         return self.vs_manager.similarity_search(query, k=k)
     
     def get_context_for_analysis(
@@ -36,28 +55,52 @@ class ContractRetriever:
         contract_text: str, 
         analysis_type: str = "general"
     ) -> str:
-        """분석 유형에 따른 컨텍스트 생성"""
+        """분석 유형에 따른 컨텍스트 생성 (같은 검색은 LRU에서 재사용)"""
+        key = (
+            analysis_type,
+            hashlib.sha256(contract_text.encode("utf-8")).hexdigest(),
+            get_kb_version()
+        )
+        with self._context_lock:
+            context = self._context_cache.get(key)
+            if context is not None:
+                self._context_cache.move_to_end(key)
+                self.context_cache_stats["hits"] += 1
+            else:
+                self.context_cache_stats["misses"] += 1
+        if context is not None:
+            # 캐시 적중도 검색 구간으로 기록 (트레이스의 검색 횟수가 실제 요청 수와 일치하도록)
+            with tracer.span("retrieval", kind="retrieval", analysis_type=analysis_type, cache_hit=True):
+                return context
         
-        if analysis_type == "risk":
-            docs = self.search_risk_keywords(contract_text, k=5)
-        elif analysis_type == "legal":
-            docs = self.search_legal_basis(contract_text, k=5)
-        elif analysis_type == "standard":
-            docs = self.search_standard_clause(contract_text, k=5)
-        else:
-            # 일반 분석 - 모든 유형 검색
-            docs = self.vs_manager.similarity_search(contract_text, k=5)
+        context = self._build_context(contract_text, analysis_type)
+        with self._context_lock:
+            self._context_cache[key] = context
+            self._context_cache.move_to_end(key)
+            while len(self._context_cache) > app_config.retriever_context_cache_size:
+                self._context_cache.popitem(last=False)
+        return context
+    
+    def _build_context(self, contract_text: str, analysis_type: str) -> str:
+        """검색 실행 및 컨텍스트 포맷팅
+
+        후보를 넉넉히(retriever_fetch_k) 검색한 뒤 겹치는 청크 병합, 관련도 컷, MMR,
+        토큰 예산(context_token_budget)으로 최대 retriever_k개 구절을 고름
+        """
+        template = QUERY_TEMPLATES.get(analysis_type, QUERY_TEMPLATES["general"])
+        query = template.format(text=contract_text)
+        with tracer.span("retrieval", kind="retrieval", analysis_type=analysis_type, cache_hit=False) as span:
+            candidates = self.vs_manager.search_candidates(query, k=app_config.retriever_fetch_k)
+            passages, stats = assemble_context(candidates)
+            span.set(documents=len(candidates), passages=len(passages), context_tokens=stats["tokens"])
         
-        if not docs:
+        if not passages:
             return "관련 지식 정보를 찾을 수 없습니다."
         
         context_parts = []
-        for i, doc in enumerate(docs, 1):
-            source = doc.metadata.get("source", "unknown")
-            doc_type = doc.metadata.get("type", "unknown")
-            context_parts.append(
-                f"[참조 {i}] ({doc_type})\n{doc.page_content[:500]}..."
-            )
+        for i, passage in enumerate(passages, 1):
+            doc_type = passage["metadata"].get("type", "unknown")
+            context_parts.append(f"[참조 {i}] ({doc_type})\n{passage['content']}")
         
         return "\n\n---\n\n".join(context_parts)
     
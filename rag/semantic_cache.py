@@ -0,0 +1,172 @@
+"""
+ContractGuard AI - 의미 기반 답변 캐시 모듈
+반복되는 상담 질문을 임베딩 유사도로 찾아 이전 답변을 재사용
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import app_config
+
+
+ARTICLE_REF_PATTERN = re.compile(r'제\s*(\d+)\s*조')
+
+
+def contract_hash(contract_text: str) -> str:
+    """캐시 범위 구분용 계약서 해시 (계약서가 없으면 'none')"""
+    if not contract_text:
+        return "none"
+    normalized = re.sub(r'\s+', ' ', contract_text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class SemanticAnswerCache:
+    """계약서 해시 + 지식 베이스 버전 범위의 의미 기반 답변 캐시
+
+    - 질문 임베딩의 코사인 유사도가 임계값 이상이면 캐시된 답변 반환
+    - 질문에 명시된 조 번호가 다르면 유사해도 재사용하지 않음
+    - 지식 베이스 버전이 바뀌면 이전 버전 항목을 모두 폐기
+    - 전체 항목 수(LRU)와 TTL로 크기 제한
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self._embeddings = embeddings
+        self.threshold = threshold or app_config.semantic_cache_threshold
+        self.max_entries = max_entries or app_config.semantic_cache_max_entries
+        self.ttl_seconds = ttl_seconds or app_config.semantic_cache_ttl_sec
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 0
+        self._kb_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            from utils.llm_clients import get_embeddings
+
+            self._embeddings = get_embeddings()
+        return self._embeddings
+
+    def embed(self, question: str) -> np.ndarray:
+        """질문 임베딩 (정규화)"""
+        vector = np.array(self.embeddings.embed_query(question), dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    @staticmethod
+    def _article_refs(question: str) -> Tuple[int, ...]:
+        return tuple(sorted({int(n) for n in ARTICLE_REF_PATTERN.findall(question)}))
+
+    def lookup(
+        self,
+        question: str,
+        scope: str,
+        kb_version: str,
+        vector: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[Dict[str, Any]], np.ndarray]:
+        """유사 질문의 캐시 항목 조회
+
+        Returns:
+            (캐시 항목 또는 None, 질문 임베딩) - 임베딩은 store()에 재사용
+        """
+        if vector is None:
+            vector = self.embed(question)
+        refs = self._article_refs(question)
+
+        with self._lock:
+            self._sync_kb_version_locked(kb_version)
+            self._expire_locked()
+
+            candidates = [
+                (entry_id, entry) for entry_id, entry in self._entries.items()
+                if entry["scope"] == scope and entry["refs"] == refs
+            ]
+            if candidates:
+                matrix = np.stack([entry["vector"] for _, entry in candidates])
+                scores = matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    entry_id, entry = candidates[best]
+                    self._entries.move_to_end(entry_id)
+                    entry["hits"] += 1
+                    self.stats["hits"] += 1
+                    return {**entry, "similarity": float(scores[best])}, vector
+
+            self.stats["misses"] += 1
+            return None, vector
+
+    def store(
+        self,
+        question: str,
+        answer: str,
+        scope: str,
+        kb_version: str,
+        vector: Optional[np.ndarray] = None
+    ):
+        """답변 저장"""
+        if vector is None:
+            vector = self.embed(question)
+        with self._lock:
+            self._sync_kb_version_locked(kb_version)
+            self._entries[self._next_id] = {
+                "question": question,
+                "answer": answer,
+                "scope": scope,
+                "refs": self._article_refs(question),
+                "vector": vector,
+                "created_at": time.time(),
+                "hits": 0,
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: Optional[str] = None):
+        """범위(계약서) 단위 또는 전체 캐시 폐기"""
+        with self._lock:
+            if scope is None:
+                self._entries.clear()
+                return
+            for entry_id in [i for i, e in self._entries.items() if e["scope"] == scope]:
+                del self._entries[entry_id]
+
+    def _sync_kb_version_locked(self, kb_version: str):
+        # 지식 베이스가 바뀌면 이전 답변은 근거가 달라지므로 전부 폐기
+        if self._kb_version != kb_version:
+            self._entries.clear()
+            self._kb_version = kb_version
+
+    def _expire_locked(self):
+        cutoff = time.time() - self.ttl_seconds
+        for entry_id in [i for i, e in self._entries.items() if e["created_at"] < cutoff]:
+            del self._entries[entry_id]
+
+    def summary(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "hit_rate": self.stats["hits"] / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 전역 인스턴스 (Streamlit 세션 간 공유, 범위로 분리)
+semantic_answer_cache = SemanticAnswerCache()
@@ -0,0 +1,311 @@
+"""
+ContractGuard AI - 표준계약서 조항 정렬 모듈
+표준 템플릿을 조 단위로 파싱하고 계약서 조항과 로컬에서 정렬
+(임베딩 + 어휘 유사도, 헝가리안 할당)하여 일치/변경/누락/추가를 판정
+"""
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import app_config
+from rag.clause_index import tokenize
+from utils.text_processor import TextProcessor
+
+
+TEMPLATE_HEADER = re.compile(r'^##\s+(.+?)\s*표준\s*템플릿\s*$', re.MULTILINE)
+ARTICLE_HEADER = re.compile(r'^###\s+제\s*(\d+)\s*조\s*\(([^)]*)\)\s*$', re.MULTILINE)
+TITLE_PATTERN = re.compile(r'제\s*\d+\s*조\s*\(?([^)\n]*)\)?')
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)?')
+
+# TextProcessor/ContractAnalyzer 계약 유형 → 표준 템플릿 이름 키워드
+TEMPLATE_KEYWORDS = {
+    "용역": ("용역", "도급", "서비스"),
+    "NDA": ("비밀유지", "nda", "기밀"),
+    "임대차": ("임대", "임차"),
+}
+
+
+def parse_standard_templates(text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """표준계약서 파일을 템플릿별 조항 목록으로 파싱
+
+    가이드 주석([표준: ...])과 구분선은 비교 대상 본문에서 제외합니다.
+    """
+    templates: Dict[str, List[Dict[str, Any]]] = {}
+    headers = list(TEMPLATE_HEADER.finditer(text))
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = text[header.end():end]
+
+        articles = []
+        matches = list(ARTICLE_HEADER.finditer(body))
+        for j, match in enumerate(matches):
+            article_end = matches[j + 1].start() if j + 1 < len(matches) else len(body)
+            lines = body[match.end():article_end].strip().splitlines()
+            content = "\n".join(
+                line for line in lines
+                if line.strip() and not line.strip().startswith(("[", "---"))
+            )
+            articles.append({
+                "number": int(match.group(1)),
+                "title": match.group(2).strip(),
+                "content": content,
+            })
+        templates[header.group(1).strip()] = articles
+    return templates
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', '', text)
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b.get(term, 0) for term, count in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _title_grams(title: str) -> set:
+    compact = re.sub(r'[^가-힣A-Za-z0-9]', '', title)
+    return {compact[i:i + 2] for i in range(len(compact) - 1)} or {compact}
+
+
+def _overlap(a: set, b: set) -> float:
+    """겹침 계수 (조사 유무 등 길이 차이에 덜 민감)"""
+    return len(a & b) / min(len(a), len(b)) if a and b else 0.0
+
+
+def hungarian(cost: np.ndarray) -> List[Tuple[int, int]]:
+    """최소 비용 할당 (행 수 ≤ 열 수가 아니면 전치하여 처리)
+
+    Returns:
+        (행, 열) 쌍 목록
+    """
+    rows, cols = cost.shape
+    if rows == 0 or cols == 0:
+        return []
+    if rows > cols:
+        return [(r, c) for c, r in hungarian(cost.T)]
+
+    # 포텐셜 기반 O(n^2 m) 구현 (1-indexed)
+    u = np.zeros(rows + 1)
+    v = np.zeros(cols + 1)
+    p = np.zeros(cols + 1, dtype=int)
+    way = np.zeros(cols + 1, dtype=int)
+    for i in range(1, rows + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(cols + 1, np.inf)
+        used = np.zeros(cols + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            current = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (current < minv[1:])
+            minv[1:][improve] = current[improve]
+            way[1:][improve] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    return [(p[j] - 1, j - 1) for j in range(1, cols + 1) if p[j]]
+
+
+class StandardClauseAligner:
+    """계약서 조항 ↔ 표준 템플릿 조항 로컬 정렬기
+
+    - 표준 조항 임베딩은 템플릿별로 한 번만 계산하여 재사용
+    - 유사도 = 임베딩 코사인 × w + 어휘(제목 bigram 겹침 + 본문 코사인) × (1 - w)
+    - 할당 후 유사도가 낮은 쌍은 대응 미확인(uncertain)으로 두고, 할당되지 않은 조항만 누락(표준)/추가(계약서)
+    - 본문이 사실상 같고 수치가 동일한 쌍은 일치, 나머지만 '변경'으로 LLM 평가 대상
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        template_path: Optional[str] = None
+    ):
+        self.embeddings = embeddings
+        self.template_path = template_path or os.path.join(
+            app_config.data_dir, "raw", "standard_contracts.txt"
+        )
+        self.templates: Dict[str, List[Dict[str, Any]]] = {}
+        self._template_vectors: Dict[str, Optional[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._loaded_version: Optional[str] = None
+
+    def _ensure_loaded(self):
+        """지식 베이스 버전이 바뀌었으면 템플릿 재파싱 및 임베딩 초기화"""
+        from rag.vectorstore import get_kb_version
+
+        version = get_kb_version()
+        if self._loaded_version == version:
+            return
+        templates = {}
+        if os.path.exists(self.template_path):
+            with open(self.template_path, "r", encoding="utf-8") as f:
+                templates = parse_standard_templates(f.read())
+        self.templates = templates
+        self._template_vectors = {}
+        self._loaded_version = version
+
+    def select_template(self, contract_type: str) -> Optional[str]:
+        """계약 유형에 맞는 표준 템플릿 이름 (없으면 None)"""
+        contract_type = (contract_type or "").lower()
+        for name in self.templates:
+            for key, keywords in TEMPLATE_KEYWORDS.items():
+                if key.lower() in name.lower() and any(k in contract_type for k in keywords):
+                    return name
+        return None
+
+    def family_of(self, contract_type: str) -> str:
+        """캐시 통계용 템플릿 계열 (맞는 템플릿이 없으면 계약 유형)"""
+        with self._lock:
+            self._ensure_loaded()
+            return self.select_template(contract_type) or contract_type or "일반계약"
+
+    def _embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        if self.embeddings is None or not texts:
+            return None
+        try:
+            vectors = np.array(self.embeddings.embed_documents(texts), dtype=np.float32)
+        except Exception as e:
+            print(f"⚠️ 조항 임베딩 실패, 어휘 유사도만 사용: {e}")
+            return None
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def _get_template_vectors(self, name: str, articles: List[Dict[str, Any]], version: str) -> Optional[np.ndarray]:
+        """템플릿 조항 임베딩 (네트워크 호출은 잠금 밖에서, 저장은 잠금 안에서 확인 후)
+
+        콜드 스타트에 여러 분석이 동시에 들어와도 느린 임베딩 호출 하나에 모두 대기하지 않도록
+        잠금을 잡지 않고 계산하고, 그 사이 지식 베이스가 바뀌었으면 저장하지 않습니다.
+        """
+        with self._lock:
+            if self._loaded_version == version and name in self._template_vectors:
+                return self._template_vectors[name]
+        vectors = self._embed([f"{a['title']}\n{a['content']}" for a in articles])
+        with self._lock:
+            if self._loaded_version == version:
+                vectors = self._template_vectors.setdefault(name, vectors)
+        return vectors
+
+    @staticmethod
+    def _lexical_similarity(clauses: List[Dict[str, Any]], articles: List[Dict[str, Any]]) -> np.ndarray:
+        clause_titles = [_title_grams(c["title"]) for c in clauses]
+        clause_bodies = [Counter(tokenize(c["content"])) for c in clauses]
+        article_titles = [_title_grams(a["title"]) for a in articles]
+        article_bodies = [Counter(tokenize(a["content"])) for a in articles]
+
+        matrix = np.zeros((len(clauses), len(articles)), dtype=np.float32)
+        for i in range(len(clauses)):
+            for j in range(len(articles)):
+                matrix[i, j] = (
+                    0.5 * _overlap(clause_titles[i], article_titles[j])
+                    + 0.5 * _cosine(clause_bodies[i], article_bodies[j])
+                )
+        return matrix
+
+    @staticmethod
+    def _is_unchanged(current: str, standard: str) -> bool:
+        """본문이 사실상 동일하고 수치(기간/금액/비율)가 같은지"""
+        if NUMBER_PATTERN.findall(current) != NUMBER_PATTERN.findall(standard):
+            return False
+        if _normalize(current) == _normalize(standard):
+            return True
+        body_similarity = _cosine(Counter(tokenize(current)), Counter(tokenize(standard)))
+        return body_similarity >= app_config.alignment_unchanged_threshold
+
+    def align(self, contract_text: str, contract_type: str) -> Optional[Dict[str, Any]]:
+        """계약서 조항을 표준 템플릿에 정렬
+
+        Returns:
+            템플릿을 고를 수 없거나 조항이 없으면 None, 그 외 정렬 결과
+        """
+        with self._lock:
+            self._ensure_loaded()
+            template_name = self.select_template(contract_type)
+            if template_name is None:
+                return None
+            articles = self.templates[template_name]
+            version = self._loaded_version
+        template_vectors = self._get_template_vectors(template_name, articles, version)
+
+        clauses = []
+        for clause in TextProcessor.extract_clauses(contract_text):
+            title_match = TITLE_PATTERN.search(clause["title"])
+            clauses.append({
+                "title": (title_match.group(1) if title_match else clause["title"]).strip(),
+                "heading": clause["title"],
+                "content": clause["content"],
+            })
+        if not clauses or not articles:
+            return None
+
+        similarity = self._lexical_similarity(clauses, articles)
+        clause_vectors = self._embed([f"{c['title']}\n{c['content']}" for c in clauses])
+        if clause_vectors is not None and template_vectors is not None:
+            weight = app_config.alignment_embedding_weight
+            similarity = weight * (clause_vectors @ template_vectors.T) + (1 - weight) * similarity
+
+        paired_clauses, paired_articles = set(), set()
+        matched, changed, uncertain = [], [], []
+        for i, j in hungarian(-similarity):
+            score = float(similarity[i, j])
+            paired_clauses.add(i)
+            paired_articles.add(j)
+            pair = {
+                "clause_name": articles[j]["title"],
+                "current_title": clauses[i]["heading"],
+                "current": clauses[i]["content"],
+                "standard": articles[j]["content"],
+                "similarity": round(score, 3),
+            }
+            if score < app_config.alignment_match_threshold:
+                # 제목/문구가 달라 유사도만으로는 대응 여부를 알 수 없는 쌍 (LLM으로 확인)
+                uncertain.append({**pair, "article": articles[j], "clause": clauses[i]})
+            elif self._is_unchanged(clauses[i]["content"], articles[j]["content"]):
+                matched.append(pair)
+            else:
+                changed.append(pair)
+
+        return {
+            "template": template_name,
+            "matched": matched,
+            "changed": changed,
+            "uncertain": uncertain,
+            "missing": [a for j, a in enumerate(articles) if j not in paired_articles],
+            "extra": [c for i, c in enumerate(clauses) if i not in paired_clauses],
+            "coverage": (len(matched) + len(changed)) / len(articles),
+        }
+
+
+_aligners: Dict[int, Tuple[Any, StandardClauseAligner]] = {}
+_aligners_lock = threading.Lock()
+
+
+def get_standard_aligner(embeddings: Optional[Embeddings] = None) -> StandardClauseAligner:
+    """임베딩 클라이언트별 공용 정렬기 (표준 조항 임베딩 재사용)"""
+    key = id(embeddings)
+    with _aligners_lock:
+        entry = _aligners.get(key)
+        if entry is None or entry[0] is not embeddings:
+            entry = (embeddings, StandardClauseAligner(embeddings))
+            _aligners[key] = entry
+        return entry[1]
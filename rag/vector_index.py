@@ -0,0 +1,118 @@
+"""
+ContractGuard AI - 양자화 벡터 인덱스 모듈
+정규화된 float32 임베딩을 int8/이진 코드로 압축하여 1차 후보를 빠르게 고르고,
+상위 후보만 원본 float 벡터로 다시 채점하는 2단계 정확 검색
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+QUANTIZATIONS = ("none", "int8", "binary")
+
+# 바이트별 켜진 비트 수 (이진 코드 해밍 거리 계산용)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화 (float32)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def truncate_dimensions(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    """앞쪽 차원만 남기고 재정규화 (text-embedding-3의 dimensions 요청과 같은 결과)"""
+    return normalize(np.asarray(vectors)[..., :dimensions])
+
+
+def quantize(vectors: np.ndarray, method: str) -> Dict[str, np.ndarray]:
+    """정규화된 벡터 → 양자화 코드
+
+    - int8: 차원별 대칭 스케일 (최대 절댓값 → 127)
+    - binary: 부호 비트 (차원당 1비트, 8차원씩 1바이트로 묶음)
+    """
+    if method == "int8":
+        scale = np.abs(vectors).max(axis=0) / 127.0
+        scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+        return {"codes": codes, "scale": scale}
+    if method == "binary":
+        return {"codes": np.packbits(vectors > 0, axis=1)}
+    if method == "none":
+        return {}
+    raise ValueError(f"지원하지 않는 양자화 방식: {method} (가능: {', '.join(QUANTIZATIONS)})")
+
+
+def _hamming(codes: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """이진 코드 행별 해밍 거리 (8바이트 단위로 묶을 수 있으면 64비트 popcount)"""
+    if codes.shape[1] % 8 == 0:
+        codes, query_bits = codes.view(np.uint64), query_bits.view(np.uint64)
+    xor = np.bitwise_xor(codes, query_bits)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+    # numpy 2.0 이전: 바이트 단위 조회표
+    return _POPCOUNT[xor.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+class VectorIndex:
+    """코사인 유사도 top-k 검색 (양자화 시 후보 선별 → float 재채점)
+
+    vectors는 메모리 매핑된 배열이어도 되며, 양자화하면 전체 스캔은 작은 코드 배열로만 하고
+    float 벡터는 재채점할 후보 행만 읽습니다.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        quantization: str = "none",
+        codes: Optional[Dict[str, np.ndarray]] = None,
+        rescore_factor: int = 4
+    ):
+        self.vectors = vectors
+        self.quantization = quantization
+        self.codes = codes if codes is not None else quantize(np.asarray(vectors), quantization)
+        self.rescore_factor = max(1, rescore_factor)
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectors.shape[1]
+
+    def memory_bytes(self) -> int:
+        """검색 시 전체 스캔하는 배열 크기 (양자화하면 코드, 아니면 float 벡터)"""
+        if self.quantization == "none":
+            return int(self.vectors.nbytes)
+        return int(sum(array.nbytes for array in self.codes.values()))
+
+    def search(self, query: np.ndarray, k: int = 5) -> np.ndarray:
+        """정규화된 질의 벡터에 대한 상위 k개 행 번호 (유사도 내림차순)"""
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        query = np.asarray(query, dtype=np.float32)
+
+        if self.quantization == "none":
+            return self._top(self.vectors @ query, k)
+
+        candidates = min(len(self), k * self.rescore_factor)
+        if self.quantization == "int8":
+            # einsum은 int8 배열 전체를 float로 복사하지 않고 곱셈 중에 변환
+            approx = np.einsum("ij,j->i", self.codes["codes"], query * self.codes["scale"])
+        else:
+            # 해밍 거리가 작을수록 유사
+            approx = -_hamming(self.codes["codes"], np.packbits(query > 0))
+        shortlist = np.sort(self._top(approx, candidates))
+
+        # 후보만 원본 float 벡터로 재채점 (정렬된 행 번호로 읽어 메모리 매핑 접근을 순차화)
+        exact = np.asarray(self.vectors[shortlist]) @ query
+        return shortlist[self._top(exact, k)]
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        if k >= scores.shape[0]:
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
@@ -2,35 +2,42 @@
 ContractGuard AI - Vector Store 관리 모듈
 ChromaDB 기반 벡터 데이터베이스 관리
 """
+import hashlib
 import os
-from typing import List, Optional
-from langchain_openai import AzureOpenAIEmbeddings
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 from langchain_community.vectorstores import Chroma
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
-from config.settings import azure_config, app_config
+from config.settings import app_config, kb_snapshot_config
+from utils.llm_clients import get_embeddings
+from .kb_snapshot import KBSnapshot, build_snapshot, get_snapshot_registry
 
 
 class VectorStoreManager:
     """Vector Store 관리자"""
     
-    def __init__(self):
-        self.embeddings = AzureOpenAIEmbeddings(
-            azure_endpoint=azure_config.endpoint,
-            api_key=azure_config.api_key,
-            api_version=azure_config.api_version,
-            azure_deployment=azure_config.embed_large
-        )
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        persist_directory: Optional[str] = None
+    ):
+        # embeddings를 주입하면 Azure 임베딩 대신 사용 (벤치마크/테스트용)
+        self.embeddings = embeddings or get_embeddings()
         self.vectorstore: Optional[Chroma] = None
-        self.persist_directory = app_config.vectorstore_dir
+        self.persist_directory = persist_directory or app_config.vectorstore_dir
+        # 버전별 스냅샷 (없으면 기존 Chroma 저장소 사용)
+        self.snapshots = get_snapshot_registry(self.persist_directory) if kb_snapshot_config.enabled else None
         
     def _get_text_splitter(self) -> RecursiveCharacterTextSplitter:
         """텍스트 분할기 반환"""
         return RecursiveCharacterTextSplitter(
             chunk_size=app_config.chunk_size,
             chunk_overlap=app_config.chunk_overlap,
-            separators=["\n\n", "\n", "###", "##", "#", " ", ""]
+            separators=["\n\n", "\n", "###", "##", "#", " ", ""],
+            add_start_index=True  # 겹치는 인접 청크 병합용 (컨텍스트 조립)
         )
     
     def create_vectorstore(self, documents: List[Document]) -> Chroma:
@@ -61,6 +68,39 @@ class VectorStoreManager:
             return self.vectorstore
         return None
     
+    def build_snapshot(
+        self,
+        documents: List[Document],
+        activate: bool = True,
+        quantization: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """문서로부터 새 지식 베이스 스냅샷 빌드 (활성화하면 처리 중인 요청 이후부터 적용)"""
+        splits = self._get_text_splitter().split_documents(documents)
+        sources = [
+            {
+                "source": doc.metadata.get("source", "unknown"),
+                "sha256": hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest(),
+                "characters": len(doc.page_content),
+            }
+            for doc in documents
+        ]
+        return build_snapshot(
+            splits,
+            self.embeddings,
+            self.persist_directory,
+            details={
+                "sources": sources,
+                "chunk_size": app_config.chunk_size,
+                "chunk_overlap": app_config.chunk_overlap,
+            },
+            activate=activate,
+            quantization=quantization
+        )
+
+    def active_snapshot(self) -> Optional[KBSnapshot]:
+        """현재 요청이 사용할 스냅샷 (kb_scope 안에서는 고정, 없으면 None)"""
+        return self.snapshots.current() if self.snapshots is not None else None
+
     def add_documents(self, documents: List[Document]):
         """문서 추가"""
         if self.vectorstore is None:
@@ -71,7 +111,11 @@ class VectorStoreManager:
             self.vectorstore.add_documents(splits)
     
     def similarity_search(self, query: str, k: int = 5) -> List[Document]:
-        """유사도 검색"""
+        """유사도 검색 (활성 스냅샷 우선)"""
+        snapshot = self.active_snapshot()
+        if snapshot is not None:
+            return snapshot.search(self.embeddings.embed_query(query), k=k)
+
         if self.vectorstore is None:
             self.load_vectorstore()
         
@@ -80,6 +124,26 @@ class VectorStoreManager:
         
         return self.vectorstore.similarity_search(query, k=k)
     
+    def search_candidates(self, query: str, k: int = 20) -> List[Tuple[Document, float, Optional[np.ndarray]]]:
+        """컨텍스트 조립용 검색 후보 (청크, 관련도, 정규화된 벡터)
+
+        스냅샷이 없으면 Chroma 관련도 점수만 반환하고 벡터는 None (MMR 생략)
+        """
+        snapshot = self.active_snapshot()
+        if snapshot is not None:
+            return snapshot.search_candidates(self.embeddings.embed_query(query), k=k)
+
+        if self.vectorstore is None:
+            self.load_vectorstore()
+        
+        if self.vectorstore is None:
+            return []
+        
+        return [
+            (doc, score, None)
+            for doc, score in self.vectorstore.similarity_search_with_relevance_scores(query, k=k)
+        ]
+    
     def get_retriever(self, k: int = 5):
         """Retriever 반환"""
         if self.vectorstore is None:
@@ -93,11 +157,45 @@ class VectorStoreManager:
         return None
 
 
-def initialize_knowledge_base():
-    """법률 지식 베이스 초기화"""
-    data_dir = app_config.data_dir
-    raw_dir = os.path.join(data_dir, "raw")
-    
+KNOWLEDGE_FILES = ("legal_knowledge.txt", "standard_contracts.txt")
+
+_kb_version_cache: Tuple[Optional[tuple], Optional[str]] = (None, None)
+
+
+def get_kb_version() -> str:
+    """지식 베이스 버전 (모든 캐시 키에 포함)
+
+    활성 스냅샷이 있으면 스냅샷 버전(kb_scope 안에서는 분석 시작 시점 버전으로 고정),
+    없으면 원본 파일 내용 해시를 사용합니다. 파일 크기/수정시각이 그대로면 이전 해시를 재사용합니다.
+    """
+    if kb_snapshot_config.enabled:
+        snapshot = get_snapshot_registry(app_config.vectorstore_dir).current()
+        if snapshot is not None:
+            return snapshot.version
+
+    global _kb_version_cache
+    raw_dir = os.path.join(app_config.data_dir, "raw")
+    paths = [os.path.join(raw_dir, name) for name in KNOWLEDGE_FILES]
+    signature = tuple(
+        (path, os.path.getsize(path), os.path.getmtime(path)) if os.path.exists(path) else (path,)
+        for path in paths
+    )
+    if _kb_version_cache[0] == signature:
+        return _kb_version_cache[1]
+
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    version = digest.hexdigest()[:12]
+    _kb_version_cache = (signature, version)
+    return version
+
+
+def load_knowledge_documents() -> List[Document]:
+    """data/raw의 법률 지식/표준계약서 원본 문서"""
+    raw_dir = os.path.join(app_config.data_dir, "raw")
     documents = []
     
     # 법률 지식 로드
@@ -119,10 +217,29 @@ def initialize_knowledge_base():
                 page_content=content,
                 metadata={"source": "standard_contracts", "type": "표준계약서"}
             ))
+    return documents
+
+
+def initialize_knowledge_base(manager: Optional[VectorStoreManager] = None):
+    """법률 지식 베이스 초기화
+
+    스냅샷을 사용하면 새 버전을 빌드한 뒤 활성 버전만 원자적으로 교체합니다.
+    (기존 저장소를 제자리에서 수정하지 않으므로 처리 중인 요청은 이전 버전으로 완료)
+    """
+    documents = load_knowledge_documents()
     
     if documents:
-        manager = VectorStoreManager()
+        manager = manager or VectorStoreManager()
+        if manager.snapshots is not None:
+            manifest = manager.build_snapshot(documents)
+            print(f"✅ 지식 베이스 스냅샷 {manifest['version']} 활성화: {len(documents)}개 문서")
+            return manager
+
         manager.create_vectorstore(documents)
+
+        # 재구축된 지식 베이스로는 이전 상담 답변을 재사용하지 않음
+        from .semantic_cache import semantic_answer_cache
+        semantic_answer_cache.invalidate()
         print(f"✅ 지식 베이스 초기화 완료: {len(documents)}개 문서")
         return manager
     
@@ -0,0 +1,23 @@
+# Storage module
+# 하위 모듈은 처음 접근할 때 로드 (패키지 import만으로 무거운 의존성을 불러오지 않도록)
+import importlib
+
+_EXPORTS = {
+    "ClauseVerdictCache": ".clause_cache",
+    "get_clause_cache": ".clause_cache",
+    "NearDuplicateIndex": ".near_duplicate",
+    "get_near_duplicate_index": ".near_duplicate",
+    "AnalysisResultStore": ".result_store",
+    "get_result_store": ".result_store",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
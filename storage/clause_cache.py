@@ -0,0 +1,222 @@
+"""
+ContractGuard AI - 조항 판정 캐시 모듈
+정규화된 조항 지문(fingerprint)으로 이전 분석의 조항별 리스크/비교 판정을 재사용
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.settings import clause_cache_config
+
+
+# 당사자 정의: 주식회사 ○○(이하 "갑"이라 한다)
+PARTY_DEFINITION = re.compile(
+    r'([^\s"“”\'()]+(?:\s+[^\s"“”\'()]+)?)\s*\(\s*이하\s*["“\']?\s*(갑|을|병)\s*["”\']?'
+)
+QUOTED_PARTY = re.compile(r'["“\'](갑|을|병)["”\']')
+FULLWIDTH_DIGITS = str.maketrans("０１２３４５６７８９", "0123456789")
+
+
+def extract_party_names(contract_text: str) -> Dict[str, str]:
+    """계약서 전문에서 당사자 정의(이름 → 갑/을) 추출"""
+    return {
+        name.strip(): role
+        for name, role in PARTY_DEFINITION.findall(contract_text)
+        if name.strip() not in ("갑", "을", "병")
+    }
+
+
+def normalize_clause(text: str, party_names: Optional[Dict[str, str]] = None) -> str:
+    """조항 본문 정규화
+
+    - 조 번호 제목 제거 (같은 조항이 다른 번호에 위치해도 동일 취급)
+    - 당사자 실명 → 갑/을, 따옴표 표기 통일
+    - 숫자 표기 통일 (전각 숫자, 천 단위 구분자, 숫자 사이 공백)
+    - 공백/구두점 제거
+    """
+    text = re.sub(r'^\s*제\s*\d+\s*조\s*(\([^)]*\))?', '', text)
+    for name, role in sorted((party_names or {}).items(), key=lambda item: -len(item[0])):
+        text = text.replace(name, role)
+    text = QUOTED_PARTY.sub(r'\1', text)
+    text = text.translate(FULLWIDTH_DIGITS)
+    text = re.sub(r'(?<=\d)[,\s](?=\d{3}\b)', '', text)
+    text = re.sub(r'[\s.,·:;"“”\'()\[\]]+', '', text)
+    return text
+
+
+def clause_fingerprint(text: str, party_names: Optional[Dict[str, str]] = None) -> str:
+    """정규화된 조항 지문"""
+    return hashlib.sha256(normalize_clause(text, party_names).encode("utf-8")).hexdigest()[:32]
+
+
+def prompt_version(*parts: str) -> str:
+    """프롬프트/지식 베이스가 바뀌면 이전 판정을 쓰지 않도록 하는 버전 키"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class ClauseVerdictCache:
+    """계약서 간 공유되는 조항 판정 캐시 (SQLite)
+
+    - stage: "risk"(조항별 리스크 판정) / "comparison"(표준 조항 대비 평가)
+    - version: 프롬프트 + 지식 베이스 버전 (바뀌면 자연히 미스)
+    - family: 템플릿 계열(계약 유형)별 적중률 집계용
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.db_path = db_path or clause_cache_config.db_path
+        self.max_entries = max_entries or clause_cache_config.max_entries
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._setup()
+
+    def _setup(self):
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS clause_verdicts (
+                    stage TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (stage, fingerprint, version)
+                );
+                CREATE INDEX IF NOT EXISTS idx_clause_verdicts_last_used
+                    ON clause_verdicts(last_used);
+                CREATE TABLE IF NOT EXISTS clause_cache_stats (
+                    family TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    misses INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (family, stage)
+                );
+            """)
+            self.conn.commit()
+
+    def get_many(
+        self,
+        stage: str,
+        fingerprints: Iterable[str],
+        version: str,
+        family: str
+    ) -> Dict[str, Any]:
+        """지문 목록 조회 (적중한 지문 → 판정), 계열별 적중률 기록"""
+        fingerprints = list(dict.fromkeys(fingerprints))
+        if not fingerprints:
+            return {}
+
+        found: Dict[str, Any] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(fingerprints), 500):
+                chunk = fingerprints[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT fingerprint, verdict FROM clause_verdicts "
+                    f"WHERE stage = ? AND version = ? AND fingerprint IN ({','.join('?' * len(chunk))})",
+                    [stage, version, *chunk]
+                ).fetchall()
+                found.update((fingerprint, json.loads(verdict)) for fingerprint, verdict in rows)
+
+            if found:
+                self.conn.executemany(
+                    "UPDATE clause_verdicts SET hits = hits + 1, last_used = ? "
+                    "WHERE stage = ? AND fingerprint = ? AND version = ?",
+                    [(now, stage, fingerprint, version) for fingerprint in found]
+                )
+            self.conn.execute(
+                """
+                INSERT INTO clause_cache_stats VALUES (?, ?, ?, ?)
+                ON CONFLICT(family, stage) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses
+                """,
+                (family, stage, len(found), len(fingerprints) - len(found))
+            )
+            self.conn.commit()
+        return found
+
+    def put_many(self, stage: str, verdicts: Dict[str, Any], version: str, family: str):
+        """지문별 판정 저장"""
+        if not verdicts:
+            return
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                """
+                INSERT INTO clause_verdicts VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT(stage, fingerprint, version) DO UPDATE SET
+                    verdict = excluded.verdict,
+                    last_used = excluded.last_used
+                """,
+                [
+                    (stage, fingerprint, version, family, json.dumps(verdict, ensure_ascii=False), now, now)
+                    for fingerprint, verdict in verdicts.items()
+                ]
+            )
+            self.conn.commit()
+            self._writes += len(verdicts)
+            if self._writes >= 1000:
+                self._prune_locked()
+                self._writes = 0
+
+    def _prune_locked(self):
+        """최근 사용 순으로 최대 항목 수만 유지"""
+        self.conn.execute(
+            "DELETE FROM clause_verdicts WHERE rowid IN ("
+            "SELECT rowid FROM clause_verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self.conn.commit()
+
+    def family_stats(self) -> List[Dict[str, Any]]:
+        """템플릿 계열/단계별 적중률"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT family, stage, hits, misses FROM clause_cache_stats ORDER BY family, stage"
+            ).fetchall()
+        return [
+            {
+                "family": family,
+                "stage": stage,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+            for family, stage, hits, misses in rows
+        ]
+
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self.conn.execute("DELETE FROM clause_verdicts")
+            self.conn.execute("DELETE FROM clause_cache_stats")
+            self.conn.commit()
+
+
+_cache: Optional[ClauseVerdictCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_clause_cache() -> Optional[ClauseVerdictCache]:
+    """프로세스 공용 조항 판정 캐시 (비활성화 시 None)"""
+    global _cache
+    if not clause_cache_config.enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ClauseVerdictCache()
+        return _cache
@@ -0,0 +1,234 @@
+"""
+ContractGuard AI - 유사 계약서 탐지 모듈
+조항 shingle MinHash + LSH 밴드 인덱스(SQLite)로 이전에 분석한 거의 같은 계약서를 찾아
+분석 결과를 재사용
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import near_duplicate_config
+from storage.clause_cache import clause_fingerprint, extract_party_names, normalize_clause
+from utils.text_processor import TextProcessor
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def clause_shingles(contract_text: str, size: int = 5) -> Tuple[set, List[Dict[str, str]], List[str]]:
+    """정규화된 조항 본문의 문자 n-gram 집합, 조항 목록, 조항 지문 목록"""
+    party_names = extract_party_names(contract_text)
+    clauses = TextProcessor.extract_clauses(contract_text) or [{"title": "", "content": contract_text}]
+    shingles = set()
+    fingerprints = []
+    for clause in clauses:
+        normalized = normalize_clause(clause["content"], party_names)
+        fingerprints.append(clause_fingerprint(clause["content"], party_names))
+        if len(normalized) <= size:
+            shingles.add(normalized)
+            continue
+        shingles.update(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+    return shingles, clauses, fingerprints
+
+
+class MinHasher:
+    """고정 시드 MinHash (프로세스/재시작 간 동일한 서명)"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: set) -> np.ndarray:
+        """shingle 집합의 MinHash 서명 (uint32 × num_perm)"""
+        if not shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (a * x + b) mod p, x < 2^32, a < 2^32 → 곱은 2^64 미만
+        # 긴 계약서에서 (shingle 수 × num_perm) 행렬이 커지지 않도록 나누어 계산
+        result = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        for start in range(0, len(hashes), 4096):
+            permuted = (np.outer(hashes[start:start + 4096], self.a) + self.b) % MERSENNE_PRIME
+            result = np.minimum(result, (permuted & MAX_HASH).min(axis=0))
+        return result.astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH 기반 유사 계약서 인덱스
+
+    - 서명을 bands × rows로 나누어 밴드별 버킷 키를 SQLite 인덱스에 저장
+    - 조회는 같은 버킷을 공유하는 후보만 읽어 서명으로 유사도 추정 (전수 비교 없음)
+    - 분석 결과는 zlib 압축 JSON으로 함께 저장, 메모리에는 아무것도 상주하지 않음
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None
+    ):
+        self.db_path = db_path or near_duplicate_config.db_path
+        self.num_perm = num_perm or near_duplicate_config.num_perm
+        self.bands = bands or near_duplicate_config.bands
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.rows = self.num_perm // self.bands
+        self.hasher = MinHasher(self.num_perm)
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._setup()
+
+    def _setup(self):
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS contracts (
+                    contract_id TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL,
+                    clause_fingerprints TEXT NOT NULL,
+                    report BLOB,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    contract_id TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets(band, bucket);
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets_contract ON lsh_buckets(contract_id);
+            """)
+            self.conn.commit()
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[int]:
+        """밴드별 버킷 키 (부호 있는 64비트 정수)"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(int.from_bytes(chunk[:8], "little", signed=True) ^ zlib.crc32(chunk))
+        return keys
+
+    def add(
+        self,
+        contract_text: str,
+        report: Optional[Dict[str, Any]] = None,
+        contract_id: Optional[str] = None
+    ) -> str:
+        """계약서 추가 (증분 삽입)"""
+        shingles, _, fingerprints = clause_shingles(contract_text)
+        signature = self.hasher.signature(shingles)
+        contract_id = contract_id or uuid.uuid4().hex
+        payload = zlib.compress(json.dumps(report, ensure_ascii=False).encode("utf-8")) if report else None
+
+        with self._lock:
+            self.conn.execute("DELETE FROM lsh_buckets WHERE contract_id = ?", (contract_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO contracts VALUES (?, ?, ?, ?, ?)",
+                (contract_id, signature.tobytes(), json.dumps(fingerprints), payload, time.time())
+            )
+            self.conn.executemany(
+                "INSERT INTO lsh_buckets VALUES (?, ?, ?)",
+                [(band, key, contract_id) for band, key in enumerate(self._bucket_keys(signature))]
+            )
+            self.conn.commit()
+        return contract_id
+
+    def query(
+        self,
+        contract_text: str,
+        k: int = 3,
+        min_similarity: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """유사 계약서 후보 조회 (추정 Jaccard 유사도 내림차순)"""
+        min_similarity = near_duplicate_config.offer_threshold if min_similarity is None else min_similarity
+        shingles, clauses, fingerprints = clause_shingles(contract_text)
+        signature = self.hasher.signature(shingles)
+        keys = self._bucket_keys(signature)
+
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(keys):
+                candidates.update(row[0] for row in self.conn.execute(
+                    "SELECT contract_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, key)
+                ))
+            rows = []
+            candidate_ids = list(candidates)
+            for start in range(0, len(candidate_ids), 500):
+                chunk = candidate_ids[start:start + 500]
+                rows.extend(self.conn.execute(
+                    f"SELECT contract_id, signature, clause_fingerprints, created_at FROM contracts "
+                    f"WHERE contract_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+
+        matches = []
+        for contract_id, blob, prior_fingerprints, created_at in rows:
+            prior_signature = np.frombuffer(blob, dtype=np.uint32)
+            similarity = float(np.mean(prior_signature == signature))
+            if similarity < min_similarity:
+                continue
+            prior = set(json.loads(prior_fingerprints))
+            current = set(fingerprints)
+            matches.append({
+                "contract_id": contract_id,
+                "similarity": similarity,
+                "created_at": created_at,
+                "changed_clauses": [
+                    clause["title"] for clause, fp in zip(clauses, fingerprints) if fp not in prior
+                ],
+                "removed_clauses": len(prior - current),
+                "identical": prior == current,
+            })
+        matches.sort(key=lambda m: -m["similarity"])
+        return matches[:k]
+
+    def get_report(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 분석 결과 조회"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT report FROM contracts WHERE contract_id = ?", (contract_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def remove(self, contract_id: str):
+        """계약서 삭제"""
+        with self._lock:
+            self.conn.execute("DELETE FROM lsh_buckets WHERE contract_id = ?", (contract_id,))
+            self.conn.execute("DELETE FROM contracts WHERE contract_id = ?", (contract_id,))
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """프로세스 공용 유사 계약서 인덱스 (비활성화 시 None)"""
+    global _index
+    if not near_duplicate_config.enabled:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
@@ -0,0 +1,315 @@
+"""
+ContractGuard AI - 분석 결과 저장소 모듈
+final_report를 압축 JSON으로 영속 저장하고, 인덱스 컬럼 + 리스크 유형 플래그 + FTS5로
+포트폴리오 단위 조회(예: 무제한 손해배상이 있는 용역계약 중 70점 초과)를 지원
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional
+
+from config.settings import result_store_config
+from rag.contract_classifier import normalize_contract_type
+
+
+# 자유 형식 risk_type을 조회용 표준 플래그로 매핑 (키워드는 risk_type/설명에서 검색)
+# DB 스키마/데이터 버전 (PRAGMA user_version, 보정이 필요한 변경이 생기면 증가)
+# 1: partial 컬럼 추가, contract_type 정규화
+SCHEMA_VERSION = 1
+
+RISK_FLAG_KEYWORDS = {
+    "무제한 손해배상": ("무제한 손해배상", "한도 없", "한도없", "무제한"),
+    "과도한 위약금": ("위약금", "위약벌"),
+    "일방적 해지": ("일방적 해지", "일방 해지", "사전 통지 없", "임의 해지"),
+    "지식재산권 귀속": ("지식재산", "지적재산", "저작권 귀속", "성과물 귀속"),
+    "과도한 비밀유지": ("비밀유지 기간", "비밀유지"),
+    "불리한 분쟁해결": ("관할", "분쟁해결", "중재"),
+    "책임제한 부재": ("책임제한", "면책"),
+    "대금 지급 위험": ("대금", "지급 지연", "지체상금"),
+}
+
+
+def risk_flags(report: Dict[str, Any]) -> List[str]:
+    """리포트의 리스크 목록에서 조회용 플래그 추출 (원본 risk_type + 표준 플래그)"""
+    risks = report.get("risks", {}).get("risks", [])
+    flags = set()
+    for risk in risks if isinstance(risks, list) else []:
+        if not isinstance(risk, dict):
+            continue
+        risk_type = str(risk.get("risk_type", "")).strip()
+        if risk_type:
+            flags.add(risk_type)
+        text = f"{risk_type} {risk.get('description', '')}"
+        for flag, keywords in RISK_FLAG_KEYWORDS.items():
+            if any(keyword in text for keyword in keywords):
+                flags.add(flag)
+    return sorted(flags)
+
+
+def _search_text(report: Dict[str, Any], contract_text: str) -> str:
+    """전문 검색 대상 텍스트 (리스크/비교/개선안 요약 + 계약서 원문)"""
+    parts = [report.get("summary", {}).get("contract_type", "")]
+    risks = report.get("risks", {}).get("risks", [])
+    for risk in risks if isinstance(risks, list) else []:
+        if isinstance(risk, dict):
+            parts.append(" ".join(str(risk.get(k, "")) for k in ("clause", "risk_type", "description")))
+    comparison = report.get("comparison", {}).get("comparison_results", [])
+    for item in comparison if isinstance(comparison, list) else []:
+        if isinstance(item, dict):
+            parts.append(f"{item.get('clause_name', '')} {item.get('status', '')}")
+    improvements = report.get("improvements", {})
+    parts.append(str(improvements.get("overall_recommendation", "")))
+    parts.append(contract_text)
+    return "\n".join(p for p in parts if p)
+
+
+class AnalysisResultStore:
+    """분석 결과 영속 저장소 (SQLite)
+
+    - analyses: 인덱스 컬럼(contract_type, risk_score, risk_level, created_at, partial) + zlib 압축 리포트
+      (contract_type은 표준 유형명으로 정규화, LLM 원본 값은 리포트 JSON에 유지)
+    - risk_flags: (flag, analysis_rowid) 복합 키로 리스크 유형별 교집합 조회
+    - analyses_fts: FTS5(trigram) 전문 검색 (한국어 부분 일치)
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or result_store_config.db_path
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._setup()
+
+    def _setup(self):
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    id INTEGER PRIMARY KEY,
+                    analysis_id TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    contract_type TEXT,
+                    risk_score INTEGER,
+                    risk_level TEXT,
+                    created_at REAL NOT NULL,
+                    partial INTEGER NOT NULL DEFAULT 0,
+                    report BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_analyses_type_score
+                    ON analyses(contract_type, risk_score);
+                CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses(risk_score);
+                CREATE INDEX IF NOT EXISTS idx_analyses_level ON analyses(risk_level);
+                CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses(created_at);
+                CREATE TABLE IF NOT EXISTS risk_flags (
+                    flag TEXT NOT NULL,
+                    analysis_rowid INTEGER NOT NULL,
+                    PRIMARY KEY (flag, analysis_rowid)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_risk_flags_rowid ON risk_flags(analysis_rowid);
+            """)
+            self._migrate_locked()
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts "
+                    "USING fts5(body, tokenize='trigram')"
+                )
+            except sqlite3.OperationalError:
+                # trigram 토크나이저가 없는 SQLite (3.34 미만)
+                self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5(body)")
+            self.conn.commit()
+
+    def _migrate_locked(self):
+        """이전 버전 DB 보정 (partial 컬럼 추가, 계약 유형 정규화)
+
+        user_version이 SCHEMA_VERSION보다 낮을 때만 한 번 실행하여 프로세스 시작마다 전체 테이블을 훑지 않습니다.
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(analyses)")}
+        if "partial" not in columns:
+            self.conn.execute("ALTER TABLE analyses ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+        for (contract_type,) in self.conn.execute(
+            "SELECT DISTINCT contract_type FROM analyses WHERE contract_type IS NOT NULL"
+        ).fetchall():
+            normalized = normalize_contract_type(contract_type)
+            if normalized != contract_type:
+                self.conn.execute(
+                    "UPDATE analyses SET contract_type = ? WHERE contract_type = ?", (normalized, contract_type)
+                )
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def save(
+        self,
+        report: Dict[str, Any],
+        contract_text: str = "",
+        title: Optional[str] = None,
+        analysis_id: Optional[str] = None
+    ) -> str:
+        """분석 결과 저장 (같은 analysis_id면 교체)"""
+        analysis_id = analysis_id or report.get("thread_id") or uuid.uuid4().hex
+        summary = report.get("summary", {})
+        stored = {k: v for k, v in report.items() if k != "performance"}
+        blob = zlib.compress(json.dumps(stored, ensure_ascii=False).encode("utf-8"))
+        title = title or (contract_text.strip().splitlines() or [""])[0][:100]
+        try:
+            risk_score = int(summary.get("risk_score"))
+        except (TypeError, ValueError):
+            risk_score = None
+        # 조회 필터가 표준 유형명으로 일치 검색하므로 정규화하여 저장
+        contract_type = normalize_contract_type(summary["contract_type"]) if summary.get("contract_type") else None
+
+        with self._lock:
+            existing = self.conn.execute(
+                "SELECT id FROM analyses WHERE analysis_id = ?", (analysis_id,)
+            ).fetchone()
+            if existing:
+                self._delete_locked(existing[0])
+            cursor = self.conn.execute(
+                "INSERT INTO analyses "
+                "(analysis_id, title, contract_type, risk_score, risk_level, created_at, partial, report) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (analysis_id, title, contract_type, risk_score,
+                 summary.get("risk_level"), time.time(), int(bool(report.get("partial"))), blob)
+            )
+            rowid = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO risk_flags VALUES (?, ?)",
+                [(flag, rowid) for flag in risk_flags(report)]
+            )
+            self.conn.execute(
+                "INSERT INTO analyses_fts (rowid, body) VALUES (?, ?)",
+                (rowid, _search_text(report, contract_text))
+            )
+            self.conn.commit()
+        return analysis_id
+
+    def _delete_locked(self, rowid: int):
+        self.conn.execute("DELETE FROM risk_flags WHERE analysis_rowid = ?", (rowid,))
+        self.conn.execute("DELETE FROM analyses_fts WHERE rowid = ?", (rowid,))
+        self.conn.execute("DELETE FROM analyses WHERE id = ?", (rowid,))
+
+    def delete(self, analysis_id: str):
+        """분석 결과 삭제"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id FROM analyses WHERE analysis_id = ?", (analysis_id,)
+            ).fetchone()
+            if row:
+                self._delete_locked(row[0])
+                self.conn.commit()
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 리포트 조회"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT report FROM analyses WHERE analysis_id = ?", (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def query(
+        self,
+        contract_type: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        risk_levels: Optional[List[str]] = None,
+        flags: Optional[List[str]] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조건 검색 (리포트 본문은 읽지 않고 요약 컬럼만 반환)
+
+        Args:
+            contract_type: 계약 유형 (표준 유형명으로 정규화 후 일치)
+            min_score / max_score: 리스크 점수 범위 (이상/이하)
+            risk_levels: 리스크 수준 목록 (상/중/하)
+            flags: 모두 포함해야 하는 리스크 유형 플래그
+            text: 전문 검색어
+        """
+        conditions, params = [], []
+        if contract_type:
+            conditions.append("a.contract_type = ?")
+            params.append(normalize_contract_type(contract_type))
+        if min_score is not None:
+            conditions.append("a.risk_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("a.risk_score <= ?")
+            params.append(max_score)
+        if risk_levels:
+            conditions.append(f"a.risk_level IN ({','.join('?' * len(risk_levels))})")
+            params.extend(risk_levels)
+        for flag in flags or []:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM risk_flags f WHERE f.flag = ? AND f.analysis_rowid = a.id)"
+            )
+            params.append(flag)
+        if text and text.strip():
+            text = text.strip()
+            if len(text) >= 3:
+                conditions.append("a.id IN (SELECT rowid FROM analyses_fts WHERE analyses_fts MATCH ?)")
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                # trigram 색인은 3글자 미만 검색어를 찾지 못하므로 본문을 직접 검사
+                conditions.append("a.id IN (SELECT rowid FROM analyses_fts WHERE instr(body, ?) > 0)")
+                params.append(text)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            "SELECT a.analysis_id, a.title, a.contract_type, a.risk_score, a.risk_level, a.created_at, a.partial "
+            f"FROM analyses a {where} ORDER BY a.created_at DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self.conn.execute(sql, [*params, limit, offset]).fetchall()
+        keys = ("analysis_id", "title", "contract_type", "risk_score", "risk_level", "created_at", "partial")
+        return [{**dict(zip(keys, row)), "partial": bool(row[-1])} for row in rows]
+
+    def training_samples(self, limit: int = 2000) -> List[tuple]:
+        """계약 유형 분류기 학습용 (계약 유형, 계약서 원문) 최근 목록"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT contract_type, report FROM analyses WHERE contract_type IS NOT NULL "
+                "ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        samples = []
+        for contract_type, blob in rows:
+            report = json.loads(zlib.decompress(blob).decode("utf-8"))
+            raw_text = report.get("analysis", {}).get("raw_text", "")
+            if raw_text:
+                samples.append((contract_type, raw_text))
+        return samples
+
+    def count(self) -> int:
+        """저장된 분석 수"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def facets(self) -> Dict[str, List[str]]:
+        """검색 필터 후보 (계약 유형, 플래그)"""
+        with self._lock:
+            types = [r[0] for r in self.conn.execute(
+                "SELECT DISTINCT contract_type FROM analyses WHERE contract_type IS NOT NULL ORDER BY 1"
+            )]
+            flags = [r[0] for r in self.conn.execute("SELECT DISTINCT flag FROM risk_flags ORDER BY 1")]
+        return {"contract_types": types, "flags": flags}
+
+
+_store: Optional[AnalysisResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[AnalysisResultStore]:
+    """프로세스 공용 분석 결과 저장소 (비활성화 시 None)"""
+    global _store
+    if not result_store_config.enabled:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = AnalysisResultStore()
+        return _store
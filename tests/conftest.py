@@ -0,0 +1,64 @@
+"""
+ContractGuard AI - 테스트 공용 픽스처
+벤치마크용 가짜 LLM/임베딩으로 Azure 호출 없이 분석 경로를 검증
+"""
+import argparse
+import os
+import sys
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.messages import BaseMessage, SystemMessage
+from pydantic import PrivateAttr
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeChatModel
+
+
+class RecordingChatModel(FakeChatModel):
+    """호출된 (system, user) 프롬프트, 호출 옵션, 응답을 기록하는 가짜 Chat 모델"""
+
+    latency: float = 0.0
+
+    _calls: list = PrivateAttr(default_factory=list)
+
+    @property
+    def calls(self) -> List[dict]:
+        return self._calls
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ):
+        result = super()._generate(messages, stop, run_manager, **kwargs)
+        self._calls.append({
+            "system": "".join(m.content for m in messages if isinstance(m, SystemMessage)),
+            "user": "".join(m.content for m in messages if not isinstance(m, SystemMessage)),
+            "kwargs": kwargs,
+            "response": result.generations[0].message.content,
+        })
+        return result
+
+
+@pytest.fixture(scope="session")
+def fake_stack(tmp_path_factory):
+    """가짜 LLM/임베딩 기반 (워크플로우, Retriever)"""
+    from benchmarks.run_benchmark import build_fake_stack
+
+    args = argparse.Namespace(embed_latency=0.0, llm_latency=0.0, llm_token_latency=0.0, jitter=0.0, seed=42)
+    return build_fake_stack(args, str(tmp_path_factory.mktemp("stack")))
+
+
+@pytest.fixture
+def retriever(fake_stack):
+    return fake_stack[1]
+
+
+@pytest.fixture
+def recording_llm():
+    return RecordingChatModel()
@@ -0,0 +1,29 @@
+"""
+ContractGuard AI - 조항 판정 캐시 테스트
+조항 지문 정규화와 버전/단계별 조회 검증
+"""
+from storage.clause_cache import ClauseVerdictCache, clause_fingerprint, extract_party_names
+
+
+def test_fingerprint_ignores_numbering_party_names_and_formatting():
+    parties = extract_party_names('주식회사 가나(이하 "갑"이라 한다)\n주식회사 나다(이하 "을"이라 한다)')
+    assert parties == {"주식회사 가나": "갑", "주식회사 나다": "을"}
+    first = "제5조 (손해배상) 주식회사 가나에게 금 1,000,000원을 배상한다."
+    second = '제12조(손해배상)  "갑"에게 금 １０００ ０００원을 배상한다'
+
+    assert clause_fingerprint(first, parties) == clause_fingerprint(second)
+    assert clause_fingerprint(first, parties) != clause_fingerprint("제5조 (손해배상) 갑에게 금 2,000,000원을 배상한다.")
+
+
+def test_get_many_is_scoped_by_stage_and_version(tmp_path):
+    cache = ClauseVerdictCache(db_path=str(tmp_path / "cache.db"))
+    cache.put_many("risk", {"fp1": {"risks": []}}, "v1", "용역계약서")
+
+    assert cache.get_many("risk", ["fp1", "fp2"], "v1", "용역계약서") == {"fp1": {"risks": []}}
+    # 프롬프트/지식 베이스 버전이나 단계가 다르면 재사용하지 않음
+    assert cache.get_many("risk", ["fp1"], "v2", "용역계약서") == {}
+    assert cache.get_many("comparison", ["fp1"], "v1", "용역계약서") == {}
+
+    stats = {(s["family"], s["stage"]): s for s in cache.family_stats()}
+    assert stats[("용역계약서", "risk")]["hits"] == 1
+    assert stats[("용역계약서", "risk")]["misses"] == 2
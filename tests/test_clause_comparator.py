@@ -0,0 +1,82 @@
+"""
+ContractGuard AI - 조항 비교 Agent 테스트
+정렬 유사도가 낮은 표준 조항을 LLM 확인 없이 누락/불리로 판정하지 않는지 검증
+"""
+import json
+import re
+
+import pytest
+
+from agents.clause_comparator import ClauseComparatorAgent
+from benchmarks import fakes
+from benchmarks.canned_responses import canned_response
+from benchmarks.contract_generator import generate_contract
+from config.settings import clause_cache_config
+
+# 생성 계약서의 "제3조 (계약 금액)"은 표준 템플릿의 "대금 및 지급방법"과 제목/문구가 달라 유사도가 낮음
+RENAMED_ARTICLE = "대금 및 지급방법"
+RENAMED_CLAUSE = "계약 금액"
+
+
+@pytest.fixture(autouse=True)
+def no_clause_cache(monkeypatch):
+    monkeypatch.setattr(clause_cache_config, "enabled", False)
+
+
+def _assessor_override(monkeypatch, rewrite):
+    """조항 쌍 평가 응답의 assessments 목록을 rewrite(쌍 ID, 쌍 본문, 평가)로 바꾸기"""
+    def response(system_prompt, user_prompt):
+        content = canned_response(system_prompt, user_prompt)
+        if "(대응 확인 필요)" not in user_prompt:
+            return content
+        payload = json.loads(re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL).group(1))
+        blocks = dict(re.findall(r'### \[(p\d+)\] (.*?)(?=\n### \[p|\Z)', user_prompt, re.DOTALL))
+        payload["assessments"] = [
+            item for item in (rewrite(a["id"], blocks.get(a["id"], ""), a) for a in payload["assessments"]) if item
+        ]
+        return f"```json\n{json.dumps(payload, ensure_ascii=False)}\n```"
+    monkeypatch.setattr(fakes, "canned_response", response)
+
+
+def _compare(retriever, llm):
+    agent = ClauseComparatorAgent(llm=llm, retriever=retriever)
+    return agent.invoke({"contract_text": generate_contract(10, seed=10), "contract_type": "용역계약"})
+
+
+def _item(result, name):
+    return next(item for item in result["comparison_results"] if item["clause_name"] == name)
+
+
+def test_low_similarity_pair_is_sent_to_assessor(retriever, recording_llm):
+    result = _compare(retriever, recording_llm)
+
+    prompts = [call["user"] for call in recording_llm.calls if "(대응 확인 필요)" in call["user"]]
+    assert prompts and RENAMED_ARTICLE in prompts[0]
+    assert RENAMED_ARTICLE not in result["missing_clauses"]
+    assert _item(result, RENAMED_ARTICLE)["status"] == "변경"
+
+
+def test_pair_judged_unrelated_is_missing(monkeypatch, retriever, recording_llm):
+    _assessor_override(
+        monkeypatch,
+        lambda pair_id, block, item: {**item, "corresponds": not block.startswith(RENAMED_ARTICLE)}
+    )
+    result = _compare(retriever, recording_llm)
+
+    assert RENAMED_ARTICLE in result["missing_clauses"]
+    assert _item(result, RENAMED_ARTICLE)["assessment"] == "불리"
+    assert _item(result, RENAMED_CLAUSE)["status"] == "추가"
+
+
+def test_unanswered_pair_is_unconfirmed_not_unfavorable(monkeypatch, retriever, recording_llm):
+    _assessor_override(
+        monkeypatch,
+        lambda pair_id, block, item: None if block.startswith(RENAMED_ARTICLE) else item
+    )
+    result = _compare(retriever, recording_llm)
+
+    item = _item(result, RENAMED_ARTICLE)
+    assert item["status"] == "미확인"
+    assert item["assessment"] == "미확인"
+    assert RENAMED_ARTICLE in result["unconfirmed_clauses"]
+    assert RENAMED_ARTICLE not in result["missing_clauses"]
@@ -0,0 +1,58 @@
+"""
+ContractGuard AI - 컨텍스트 조립 테스트
+인접 청크 병합, 관련도 컷, MMR 중복 제거, 토큰 예산 적용 검증
+"""
+import numpy as np
+from langchain_core.documents import Document
+
+from rag.context_assembler import assemble_context, merge_adjacent, mmr_order, _passage
+from utils.text_processor import TextProcessor
+
+
+SOURCE = "민법 제393조(손해배상의 범위) 채무불이행으로 인한 손해배상은 통상의 손해를 그 한도로 한다. " \
+         "특별한 사정으로 인한 손해는 채무자가 그 사정을 알았거나 알 수 있었을 때에 한하여 배상의 책임이 있다."
+
+
+def _chunk(start, end, source="law.txt"):
+    return Document(page_content=SOURCE[start:end], metadata={"source": source, "start_index": start})
+
+
+def test_overlapping_chunks_are_merged_by_offset():
+    passages = [_passage(_chunk(0, 60), 0.5, None), _passage(_chunk(40, len(SOURCE)), 0.9, None)]
+    merged = merge_adjacent(passages)
+    assert len(merged) == 1
+    assert merged[0]["content"] == SOURCE
+    assert merged[0]["score"] == 0.9
+    # 예산 초과 시 잘라낼 기준점은 점수가 높은 청크 위치
+    assert merged[0]["anchor"] == 40
+
+
+def test_chunks_without_offsets_are_merged_by_text_overlap():
+    left = Document(page_content=SOURCE[:70], metadata={"source": "law.txt"})
+    right = Document(page_content=SOURCE[40:], metadata={"source": "law.txt"})
+    merged = merge_adjacent([_passage(left, 0.7, None), _passage(right, 0.6, None)])
+    assert [p["content"] for p in merged] == [SOURCE]
+
+
+def test_different_sources_are_not_merged():
+    passages = [_passage(_chunk(0, 60, "a.txt"), 0.5, None), _passage(_chunk(40, 100, "b.txt"), 0.5, None)]
+    assert len(merge_adjacent(passages)) == 2
+
+
+def test_mmr_prefers_diverse_passage():
+    vectors = np.array([[1.0, 0.0], [0.999, 0.045], [0.0, 1.0]], dtype=np.float32)
+    scores = np.array([0.9, 0.89, 0.8], dtype=np.float32)
+    assert mmr_order(scores, vectors, lambda_mult=0.5, limit=2) == [0, 2]
+
+
+def test_relevance_cut_and_token_budget():
+    docs = [
+        (Document(page_content="손해배상 한도 " * 40, metadata={"source": "a"}), 0.9, None),
+        (Document(page_content="관할 법원 " * 40, metadata={"source": "b"}), 0.8, None),
+        (Document(page_content="무관한 내용", metadata={"source": "c"}), 0.1, None),
+    ]
+    selected, stats = assemble_context(docs, max_passages=5, token_budget=60, relevance_ratio=0.5, min_relevance=0.0)
+    assert stats["kept"] == 2
+    assert "무관한 내용" not in [p["content"] for p in selected]
+    assert sum(TextProcessor.count_tokens_approx(p["content"]) for p in selected) <= 60
+    assert stats["tokens"] <= 60
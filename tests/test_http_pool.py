@@ -0,0 +1,17 @@
+"""
+ContractGuard AI - HTTP 연결 풀 테스트
+풀 재생성 시 이전 클라이언트(동기/비동기)를 닫는지 검증
+"""
+from utils.http_pool import close_http_clients, get_async_http_client, get_http_client
+
+
+def test_close_http_clients_closes_both_clients():
+    sync_client = get_http_client()
+    async_client = get_async_http_client()
+
+    close_http_clients()
+
+    assert sync_client.is_closed
+    assert async_client.is_closed
+    assert get_async_http_client() is not async_client
+    close_http_clients()
@@ -0,0 +1,68 @@
+"""
+ContractGuard AI - LLM 요청 분산 테스트
+배포 간 분산(가중 무작위), 지연 추정 감쇠, 장애 조치 검증
+"""
+import asyncio
+import random
+import threading
+import time
+
+from config.settings import dispatch_config
+from utils.llm_dispatch import Backend, LatencyTracker, LLMDispatcher
+
+
+class FakeAsyncClient:
+    """ainvoke만 제공하는 가짜 Chat 클라이언트"""
+
+    def __init__(self, reply: str, delay: float = 0.0, fail: bool = False):
+        self.reply = reply
+        self.delay = delay
+        self.fail = fail
+
+    async def ainvoke(self, messages, **kwargs):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.reply} 실패")
+        return self.reply
+
+
+def _dispatcher(*clients):
+    """Azure 클라이언트 생성 없이 가짜 배포로 디스패처 구성"""
+    dispatcher = LLMDispatcher.__new__(LLMDispatcher)
+    dispatcher.deployment = "test"
+    dispatcher.temperature = 0.0
+    dispatcher.backends = [Backend(f"b{i}", client, "test") for i, client in enumerate(clients)]
+    dispatcher.latency = LatencyTracker(dispatch_config.latency_window)
+    dispatcher._lock = threading.Lock()
+    dispatcher._random = random.Random(0)
+    dispatcher.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+    return dispatcher
+
+
+def test_first_choice_is_spread_by_load_score():
+    dispatcher = _dispatcher(FakeAsyncClient("fast"), FakeAsyncClient("slow"))
+    fast, slow = dispatcher.backends
+    fast.record_latency(0.1)
+    slow.record_latency(0.3)
+
+    picks = [dispatcher._candidates(set())[0].name for _ in range(400)]
+    # 부하 점수 역수 비례 (0.75 : 0.25) - 느린 배포도 다시 측정되도록 일부 요청을 받음
+    assert 200 < picks.count("b0") < 380
+    assert picks.count("b1") > 20
+
+
+def test_latency_estimate_decays_without_samples():
+    backend = Backend("b0", FakeAsyncClient("x"), "test")
+    backend.record_latency(2.0)
+    backend.sampled_at = time.time() - dispatch_config.latency_decay_sec
+    assert abs(backend.current_latency() - 1.0) < 0.05
+
+
+def test_failed_backend_fails_over_to_next():
+    dispatcher = _dispatcher(FakeAsyncClient("broken", fail=True), FakeAsyncClient("ok"))
+    # 첫 요청이 반드시 실패하는 배포로 가도록 다른 배포를 느리게 측정
+    dispatcher.backends[1].record_latency(100.0)
+
+    assert dispatcher.invoke([], latency_key="test", timeout=5) == "ok"
+    assert dispatcher.stats["failovers"] == 1
+    assert dispatcher.backends[0].stats["failures"] == 1
@@ -0,0 +1,75 @@
+"""
+ContractGuard AI - 마이크로 배치 테스트
+배치 요청에 호출자 마감 시간이 전달되는지 검증
+"""
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from agents.clause_comparator import ClauseComparatorAgent
+from config.settings import micro_batch_config
+from utils.deadline import StageBudget, stage_scope
+from utils.micro_batch import MicroBatcher
+
+
+def _recording_executor(calls):
+    def execute(texts, timeout):
+        calls.append((list(texts), timeout))
+        return [f"r:{text}" for text in texts], {}, {"prompt_tokens": len(texts)}
+    return execute
+
+
+def _submit_async(batcher, texts, execute, timeout=None):
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = batcher.submit("group", texts, execute, timeout=timeout)
+        except Exception as e:
+            outcome["error"] = e
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def test_batch_uses_earliest_caller_deadline():
+    calls = []
+    batcher = MicroBatcher(window_ms=50, max_items=10, workers=1)
+    execute = _recording_executor(calls)
+    threads = [
+        _submit_async(batcher, ["a"], execute, timeout=None),
+        _submit_async(batcher, ["b"], execute, timeout=2.0),
+        _submit_async(batcher, ["c"], execute, timeout=5.0),
+    ]
+    for thread, _ in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    texts, timeout = calls[0]
+    assert sorted(texts) == ["a", "b", "c"]
+    assert timeout is not None and 1.5 < timeout <= 2.0
+
+
+def test_expired_caller_is_dropped_from_batch():
+    calls = []
+    batcher = MicroBatcher(window_ms=200, max_items=10, workers=1)
+    execute = _recording_executor(calls)
+    expired, expired_outcome = _submit_async(batcher, ["late"], execute, timeout=0.05)
+    waiting, waiting_outcome = _submit_async(batcher, ["ok"], execute)
+    expired.join(5)
+    waiting.join(5)
+
+    assert isinstance(expired_outcome["error"], FutureTimeoutError)
+    assert calls == [(["ok"], None)]
+    assert waiting_outcome["result"][0] == ["r:ok"]
+
+
+def test_batched_llm_call_gets_caller_deadline(monkeypatch, retriever, recording_llm):
+    monkeypatch.setattr(micro_batch_config, "enabled", True)
+    agent = ClauseComparatorAgent(llm=recording_llm, retriever=retriever)
+    with stage_scope(StageBudget("compare_clauses", 3.0, "full", time.monotonic() + 3.0)):
+        agent._invoke_batched("CLAUSE_PAIR_ASSESSOR", ["목적\n- 표준: 가\n- 계약서(제1조): 나"], "assessments",
+                              contract_type="용역계약")
+
+    timeout = recording_llm.calls[-1]["kwargs"].get("timeout")
+    assert timeout is not None and 0 < timeout <= 3.0
@@ -0,0 +1,44 @@
+"""
+ContractGuard AI - 분석 결과 저장소 테스트
+이전 버전 DB 보정이 한 번만 실행되는지 검증
+"""
+import sqlite3
+
+from storage.result_store import SCHEMA_VERSION, AnalysisResultStore
+
+
+def _legacy_db(path):
+    """partial 컬럼이 없고 계약 유형이 정규화되지 않은 이전 버전 DB"""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE analyses (id INTEGER PRIMARY KEY, analysis_id TEXT NOT NULL UNIQUE, title TEXT, "
+        "contract_type TEXT, risk_score INTEGER, risk_level TEXT, created_at REAL NOT NULL, report BLOB NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO analyses (analysis_id, contract_type, created_at, report) VALUES ('a1', '소프트웨어 개발 용역계약', 0, x'')"
+    )
+    conn.commit()
+    conn.close()
+
+
+def _contract_types(store):
+    return [row[0] for row in store.conn.execute("SELECT contract_type FROM analyses ORDER BY id")]
+
+
+def test_migration_runs_once(tmp_path):
+    path = str(tmp_path / "results.db")
+    _legacy_db(path)
+
+    store = AnalysisResultStore(db_path=path)
+    assert _contract_types(store) == ["용역계약"]
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    # 보정 후 들어온 값은 다시 열어도 건드리지 않음 (시작마다 전체 테이블을 훑지 않음)
+    store.conn.execute(
+        "INSERT INTO analyses (analysis_id, contract_type, created_at, report) VALUES ('a2', '비밀유지계약서', 0, x'')"
+    )
+    store.conn.commit()
+    store.conn.close()
+
+    reopened = AnalysisResultStore(db_path=path)
+    assert _contract_types(reopened) == ["용역계약", "비밀유지계약서"]
+    assert "partial" in {row[1] for row in reopened.conn.execute("PRAGMA table_info(analyses)")}
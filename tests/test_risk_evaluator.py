@@ -0,0 +1,67 @@
+"""
+ContractGuard AI - 리스크 평가 Agent 테스트
+조항 판정 캐시 부분 적중 시 처음 보는 조항만 LLM에 보내는지 검증
+"""
+from agents.contract_analyzer import ContractAnalyzerAgent
+from agents.risk_evaluator import RiskEvaluatorAgent
+from benchmarks.contract_generator import generate_contract
+from storage.clause_cache import ClauseVerdictCache
+from utils.text_processor import TextProcessor
+
+
+def _risk_calls(llm):
+    return [call for call in llm.calls if "리스크 관리 전문가" in call["system"]]
+
+
+def _risk_prompts(llm):
+    return [call["user"] for call in _risk_calls(llm)]
+
+
+def _setup(tmp_path, retriever, recording_llm, num_articles=14):
+    contract = generate_contract(num_articles, seed=7)
+    analysis = ContractAnalyzerAgent(llm=recording_llm, retriever=retriever).invoke({"contract_text": contract})
+    agent = RiskEvaluatorAgent(llm=recording_llm, retriever=retriever)
+    cache = ClauseVerdictCache(db_path=str(tmp_path / "clause_cache.db"))
+    return contract, analysis, agent, cache
+
+
+def test_partial_hit_prompt_excludes_whole_contract(tmp_path, retriever, recording_llm):
+    contract, analysis, agent, cache = _setup(tmp_path, retriever, recording_llm)
+    assert analysis["raw_text"] == contract
+
+    clauses = TextProcessor.extract_clauses(contract)
+    agent._evaluate_with_cache(cache, contract, clauses, analysis)
+    full_prompt = _risk_prompts(recording_llm)[-1]
+
+    # 마지막 조항만 바꾼 계약서: 나머지 조항은 캐시 적중
+    last = clauses[-1]
+    changed = contract.replace(last["content"], last["content"] + " 단, 을의 귀책사유가 없는 경우는 제외한다.")
+    changed_clauses = TextProcessor.extract_clauses(changed)
+    recording_llm.calls.clear()
+    result = agent._evaluate_with_cache(cache, changed, changed_clauses, {**analysis, "raw_text": changed})
+
+    prompts = _risk_prompts(recording_llm)
+    assert len(prompts) == 1
+    assert result["clause_cache"]["evaluated"] < len(changed_clauses)
+    # 계약서 원문/다른 조항은 프롬프트에 없어야 함
+    assert "raw_text" not in prompts[0]
+    assert clauses[0]["content"] not in prompts[0]
+    assert len(prompts[0]) < len(full_prompt) / 2
+
+
+def test_merged_score_uses_local_rule_only_when_merging(tmp_path, retriever, recording_llm):
+    contract, analysis, agent, cache = _setup(tmp_path, retriever, recording_llm)
+    clauses = TextProcessor.extract_clauses(contract)
+
+    # 캐시 미스: LLM이 준 점수를 그대로 사용
+    first = agent._evaluate_with_cache(cache, contract, clauses, analysis)
+    llm_result = agent._parse_json_response(_risk_calls(recording_llm)[-1]["response"])
+    assert "clause_cache" not in first
+    assert first["risk_score"] == llm_result["risk_score"]
+    assert first["risk_level"] == llm_result["risk_level"]
+
+    # 전부 적중: 캐시된 판정만으로 심각도 합 규칙 적용
+    second = agent._evaluate_with_cache(cache, contract, clauses, analysis)
+    assert second["clause_cache"]["evaluated"] == 0
+    assert second["risk_score"] == RiskEvaluatorAgent._score(second["risks"])["risk_score"]
+    assert second["risk_level"] in ("상", "중", "하")
@@ -0,0 +1,59 @@
+"""
+ContractGuard AI - 우선순위 스케줄러 테스트
+등급별 배정 순서, 대기열 한도(역압), 대기 시간 초과 처리 검증
+"""
+import threading
+import time
+
+import pytest
+
+from config.settings import scheduler_config
+from utils.scheduler import PriorityScheduler, SchedulerOverloaded, workload
+
+
+@pytest.fixture(autouse=True)
+def scheduler_enabled(monkeypatch):
+    monkeypatch.setattr(scheduler_config, "enabled", True)
+
+
+def _enqueue(scheduler, priority, order=None):
+    """다른 스레드에서 슬롯을 요청하고 대기열에 들어갈 때까지 기다림"""
+    depth = scheduler.queue_depth(priority)
+
+    def run():
+        with workload(priority), scheduler.slot(timeout=5):
+            if order is not None:
+                order.append(priority)
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while scheduler.queue_depth(priority) == depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return thread
+
+
+def test_chat_is_granted_before_queued_batch():
+    scheduler = PriorityScheduler(max_concurrent=1, queue_limits={"chat": 10, "analysis": 10, "batch": 10})
+    order = []
+    with workload("batch"), scheduler.slot():
+        threads = [_enqueue(scheduler, "batch", order), _enqueue(scheduler, "chat", order)]
+    for thread in threads:
+        thread.join(5)
+    assert order == ["chat", "batch"]
+
+
+def test_timed_out_waiter_leaves_queue_and_full_queue_is_rejected():
+    scheduler = PriorityScheduler(max_concurrent=1, queue_limits={"chat": 1, "analysis": 1, "batch": 1})
+    with workload("analysis"), scheduler.slot():
+        with pytest.raises(TimeoutError):
+            with scheduler.slot(timeout=0.05):
+                pass
+        assert scheduler.queue_depth("analysis") == 0
+
+        waiting = _enqueue(scheduler, "analysis")
+        with pytest.raises(SchedulerOverloaded):
+            with scheduler.slot(timeout=0.05):
+                pass
+    waiting.join(5)
+    counters = scheduler.summary()["classes"]["analysis"]
+    assert (counters["timed_out"], counters["rejected"], counters["queued"]) == (1, 1, 0)
@@ -0,0 +1,49 @@
+"""
+ContractGuard AI - 표준계약서 조항 정렬 테스트
+템플릿 임베딩 중에도 정렬기 잠금을 잡지 않는지, 임베딩을 한 번만 계산하는지 검증
+"""
+import threading
+
+from benchmarks.canned_responses import hash_embedding
+from benchmarks.contract_generator import generate_contract
+from rag.standard_alignment import StandardClauseAligner
+
+
+class GatedEmbeddings:
+    """첫 호출(템플릿 조항)을 gate가 열릴 때까지 붙잡는 임베딩"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            assert self.gate.wait(5)
+        return [hash_embedding(text, 64) for text in texts]
+
+
+def test_template_embedding_does_not_hold_lock():
+    embeddings = GatedEmbeddings()
+    aligner = StandardClauseAligner(embeddings)
+    contract = generate_contract(10, seed=10)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(aligner.align(contract, "용역계약")))
+    worker.start()
+    try:
+        assert embeddings.started.wait(5)
+        # 템플릿 임베딩이 끝나지 않았어도 잠금을 쓰는 다른 호출은 바로 진행
+        done = threading.Event()
+        threading.Thread(target=lambda: (aligner.family_of("용역계약"), done.set()), daemon=True).start()
+        assert done.wait(1)
+    finally:
+        embeddings.gate.set()
+        worker.join(5)
+    assert results and results[0] is not None
+
+    # 템플릿 임베딩은 재사용하고 계약서 조항만 다시 임베딩
+    calls = embeddings.calls
+    aligner.align(contract, "용역계약")
+    assert embeddings.calls == calls + 1
@@ -0,0 +1,50 @@
+"""
+ContractGuard AI - 양자화 벡터 인덱스 테스트
+int8/이진 후보 선별 + float 재채점이 정확 검색과 같은 상위 결과를 내는지 검증
+"""
+import numpy as np
+import pytest
+
+from rag.vector_index import VectorIndex, normalize, quantize, truncate_dimensions
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(0)
+    vectors = normalize(rng.standard_normal((500, 64)))
+    # 각 질의는 코퍼스 벡터에 작은 잡음을 더한 것 (정답 이웃이 분명하도록)
+    queries = normalize(vectors[:20] + 0.05 * rng.standard_normal((20, 64)))
+    return vectors, queries
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+def test_quantized_search_matches_exact_top1(corpus, quantization):
+    vectors, queries = corpus
+    exact = VectorIndex(vectors)
+    index = VectorIndex(vectors, quantization=quantization, rescore_factor=8)
+
+    for query in queries:
+        expected = exact.search(query, k=3)
+        found = index.search(query, k=3)
+        assert found[0] == expected[0]
+        # 재채점 후 유사도 내림차순
+        scores = vectors[found] @ query
+        assert np.all(np.diff(scores) <= 1e-6)
+    assert index.memory_bytes() < exact.memory_bytes()
+
+
+def test_quantize_and_truncate_shapes(corpus):
+    vectors, _ = corpus
+    assert quantize(vectors, "int8")["codes"].dtype == np.int8
+    assert quantize(vectors, "binary")["codes"].shape == (500, 8)
+    truncated = truncate_dimensions(vectors, 16)
+    assert truncated.shape == (500, 16)
+    assert np.allclose(np.linalg.norm(truncated, axis=1), 1.0, atol=1e-5)
+    with pytest.raises(ValueError):
+        quantize(vectors, "pq")
+
+
+def test_search_handles_small_k_and_empty(corpus):
+    vectors, queries = corpus
+    assert len(VectorIndex(vectors[:2], quantization="int8").search(queries[0], k=5)) == 2
+    assert len(VectorIndex(vectors, quantization="binary").search(queries[0], k=0)) == 0
@@ -0,0 +1,36 @@
+"""
+ContractGuard AI - 워크플로우 테스트
+선행 조항 비교의 트레이스 구간 배치와 사용하지 않은 선행 비교 정리 검증
+"""
+from benchmarks.contract_generator import generate_contract
+
+
+def _run(workflow, thread_id, **kwargs):
+    report = workflow.run(generate_contract(10, seed=10), thread_id=thread_id, **kwargs)
+    assert "error" not in report
+    return report
+
+
+def test_early_comparison_span_is_child_of_trace_root(fake_stack):
+    workflow = fake_stack[0]
+    report = _run(workflow, "test-early-span")
+    spans = report["performance"]["spans"]
+    by_id = {span["span_id"]: span for span in spans}
+
+    early = [span for span in spans if span["kind"] == "early_compare"]
+    assert len(early) == 1
+    assert by_id[early[0]["parent_id"]]["kind"] == "root"
+    assert report["comparison"]["early_start"]["used"] is True
+
+    # 선행 비교의 LLM/검색 구간은 analyze 노드가 아닌 early_compare 구간 아래에 있어야 함
+    analyze = next(span for span in spans if span["kind"] == "node" and span["name"] == "analyze")
+    children = [span for span in spans if span["parent_id"] == analyze["span_id"]]
+    assert all(span["kind"] in ("llm", "retrieval") for span in children)
+    assert any(span["parent_id"] == early[0]["span_id"] for span in spans)
+    assert analyze["duration"] - sum(span["duration"] for span in children) >= -0.002
+
+
+def test_unused_early_comparison_is_cleared(fake_stack):
+    workflow = fake_stack[0]
+    _run(workflow, "test-early-cleared")
+    assert "test-early-cleared" not in workflow._early_comparisons
@@ -0,0 +1,307 @@
+"""
+ContractGuard AI - 일괄 스크리닝 모듈
+LLM 분석 전에 계약서 아카이브 전체를 결정적 규칙(계약 유형, 조항 구조, 손해배상/해지 지표)으로
+프로세스 풀에서 1차 선별하고, 예비 리스크 순으로 정렬한 컬럼형 요약(NumPy/Parquet)을 저장
+
+사용법:
+    python -m utils.bulk_screening ./archive --output screening.npz --top 50
+    python -m utils.bulk_screening ./archive --output screening.parquet --analyze 20
+"""
+import argparse
+import bisect
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가 (python -m 외 직접 실행 대비)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.document_loader import DocumentLoader
+from utils.text_processor import (
+    CONTRACT_TYPE_KEYWORDS,
+    DAMAGE_RISK_INDICATORS,
+    SEVERITY_WEIGHTS,
+    TERMINATION_RISK_INDICATORS,
+)
+
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+# TextProcessor.extract_clauses와 같은 조 제목 시작 패턴
+ARTICLE_PATTERN = re.compile(r'제\s*\d+\s*조')
+
+# 지표가 해당 조항 제목 안에 있을 때만 적용 (예: '즉시'는 해지 조항에서만 의미가 있음)
+DAMAGE_CLAUSE_KEYWORDS = ("손해배상", "배상", "위약")
+TERMINATION_CLAUSE_KEYWORDS = ("해지", "해제")
+
+COLUMNS = (
+    "path", "contract_type", "n_clauses", "n_chars",
+    "damage_flags", "termination_flags", "risk_score", "error",
+)
+
+
+def _build_rule_pattern() -> re.Pattern:
+    """모든 규칙 키워드를 하나의 정규식으로 결합 (문서당 한 번만 스캔)"""
+    keywords = {keyword for words in CONTRACT_TYPE_KEYWORDS.values() for keyword in words}
+    keywords.update(indicator for indicator, _, _ in DAMAGE_RISK_INDICATORS)
+    keywords.update(indicator for indicator, _, _ in TERMINATION_RISK_INDICATORS)
+    # 긴 키워드 우선 (겹치는 접두어가 짧은 키워드에 가려지지 않도록)
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(f"{ARTICLE_PATTERN.pattern}|{alternation}", re.IGNORECASE)
+
+
+RULE_PATTERN = _build_rule_pattern()
+DAMAGE_BITS = {indicator: 1 << i for i, (indicator, _, _) in enumerate(DAMAGE_RISK_INDICATORS)}
+TERMINATION_BITS = {indicator: 1 << i for i, (indicator, _, _) in enumerate(TERMINATION_RISK_INDICATORS)}
+INDICATOR_WEIGHTS = {
+    indicator: SEVERITY_WEIGHTS[severity]
+    for indicator, _, severity in DAMAGE_RISK_INDICATORS + TERMINATION_RISK_INDICATORS
+}
+
+
+def screen_text(text: str) -> Dict[str, Any]:
+    """계약서 텍스트 1건의 규칙 평가
+
+    조 제목과 모든 규칙 키워드를 한 번의 정규식 스캔으로 찾고,
+    손해배상/해지 지표는 해당 조항 안에서 나온 경우만 집계합니다.
+    """
+    headings: List[str] = []
+    heading_starts: List[int] = []
+    keywords = set()
+    hits = []
+    for match in RULE_PATTERN.finditer(text):
+        token = match.group(0)
+        if ARTICLE_PATTERN.fullmatch(token):
+            # 제목 줄은 계속 스캔하여 제목 안의 키워드도 집계
+            line_end = text.find("\n", match.start())
+            headings.append(text[match.start():line_end if line_end >= 0 else len(text)])
+            heading_starts.append(match.start())
+            continue
+        token = token.lower()
+        keywords.add(token)
+        hits.append((match.start(), token))
+
+    # 계약 유형: TextProcessor.identify_contract_type과 같은 우선순위
+    contract_type = "일반계약"
+    for candidate, words in CONTRACT_TYPE_KEYWORDS.items():
+        if keywords.intersection(words):
+            contract_type = candidate
+            break
+
+    damage_flags = termination_flags = 0
+    for position, token in hits:
+        index = bisect.bisect_right(heading_starts, position) - 1
+        if index < 0:
+            continue
+        heading = headings[index]
+        if token in DAMAGE_BITS and any(k in heading for k in DAMAGE_CLAUSE_KEYWORDS):
+            damage_flags |= DAMAGE_BITS[token]
+        if token in TERMINATION_BITS and any(k in heading for k in TERMINATION_CLAUSE_KEYWORDS):
+            termination_flags |= TERMINATION_BITS[token]
+
+    score = sum(
+        weight for indicator, weight in INDICATOR_WEIGHTS.items()
+        if damage_flags & DAMAGE_BITS.get(indicator, 0)
+        or termination_flags & TERMINATION_BITS.get(indicator, 0)
+    )
+    return {
+        "contract_type": contract_type,
+        "n_clauses": len(headings),
+        "n_chars": len(text),
+        "damage_flags": damage_flags,
+        "termination_flags": termination_flags,
+        "risk_score": min(100, score),
+        "error": "",
+    }
+
+
+def screen_file(path: str) -> Dict[str, Any]:
+    """파일 1건 로드 후 규칙 평가 (실패는 error 컬럼에 기록)"""
+    try:
+        text = DocumentLoader.load(path, os.path.splitext(path)[1].lstrip("."))
+        row = screen_text(text)
+    except Exception as e:
+        row = {
+            "contract_type": "", "n_clauses": 0, "n_chars": 0,
+            "damage_flags": 0, "termination_flags": 0, "risk_score": 0, "error": str(e)[:200],
+        }
+    row["path"] = path
+    return row
+
+
+def _screen_batch(paths: List[str]) -> List[Dict[str, Any]]:
+    # 작업 단위를 묶어 프로세스 간 직렬화 비용을 줄임
+    return [screen_file(path) for path in paths]
+
+
+def iter_documents(root: str, extensions=SUPPORTED_EXTENSIONS) -> Iterator[str]:
+    """아카이브 디렉터리의 계약서 파일 경로 (지연 순회)"""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield os.path.join(dirpath, filename)
+
+
+def screen_archive(
+    paths: Iterator[str],
+    workers: Optional[int] = None,
+    batch_size: int = 64
+) -> Dict[str, np.ndarray]:
+    """계약서 경로 스트림을 프로세스 풀로 스크리닝
+
+    제출 중인 배치 수를 워커 수의 2배로 제한하여 아카이브 전체 목록이나 결과를
+    한꺼번에 큐에 쌓지 않습니다.
+
+    Returns:
+        예비 리스크 점수 내림차순으로 정렬된 컬럼 배열
+    """
+    workers = workers or os.cpu_count() or 1
+    columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+
+    def collect(future):
+        for row in future.result():
+            for name in COLUMNS:
+                columns[name].append(row[name])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        batch: List[str] = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) < batch_size:
+                continue
+            pending.add(executor.submit(_screen_batch, batch))
+            batch = []
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+        if batch:
+            pending.add(executor.submit(_screen_batch, batch))
+        for future in pending:
+            collect(future)
+
+    arrays = {
+        "path": np.array(columns["path"], dtype=str),
+        "contract_type": np.array(columns["contract_type"], dtype=str),
+        "n_clauses": np.array(columns["n_clauses"], dtype=np.int32),
+        "n_chars": np.array(columns["n_chars"], dtype=np.int64),
+        "damage_flags": np.array(columns["damage_flags"], dtype=np.uint8),
+        "termination_flags": np.array(columns["termination_flags"], dtype=np.uint8),
+        "risk_score": np.array(columns["risk_score"], dtype=np.int16),
+        "error": np.array(columns["error"], dtype=str),
+    }
+    # 점수 내림차순, 동점은 경로순 (실행마다 같은 순서)
+    order = np.lexsort((arrays["path"], -arrays["risk_score"].astype(np.int32)))
+    return {name: values[order] for name, values in arrays.items()}
+
+
+def save_screening(columns: Dict[str, np.ndarray], output_path: str):
+    """컬럼형 요약 저장 (.parquet이면 Parquet, 그 외 NumPy .npz)"""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if output_path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet 저장에는 pyarrow가 필요합니다. 다음 명령어로 설치하세요:\n"
+                "pip install pyarrow\n"
+                f"원본 오류: {e}"
+            )
+        pq.write_table(pa.table({name: values for name, values in columns.items()}), output_path)
+    else:
+        np.savez_compressed(output_path, **columns)
+
+
+def load_screening(path: str) -> Dict[str, np.ndarray]:
+    """저장된 스크리닝 요약 로드"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def describe_flags(damage_flags: int, termination_flags: int) -> List[str]:
+    """비트 플래그 → 지표 설명"""
+    descriptions = [
+        description for indicator, description, _ in DAMAGE_RISK_INDICATORS
+        if damage_flags & DAMAGE_BITS[indicator]
+    ]
+    descriptions.extend(
+        description for indicator, description, _ in TERMINATION_RISK_INDICATORS
+        if termination_flags & TERMINATION_BITS[indicator]
+    )
+    return descriptions
+
+
+def analyze_top(columns: Dict[str, np.ndarray], count: int) -> List[Dict[str, Any]]:
+    """예비 리스크 상위 계약서만 전체 워크플로우로 분석하고 분석 이력 저장소에 저장
+
+    일괄 처리 등급으로 스케줄링하여 대화형 사용자의 호출 슬롯을 침범하지 않으며,
+    대화형 SLA 대신 제한 시간 없이 실행합니다.
+    """
+    from graph.workflow import ContractAnalysisWorkflow
+    from storage.result_store import get_result_store
+    from utils.scheduler import llm_scheduler, workload
+
+    workflow = ContractAnalysisWorkflow()
+    store = get_result_store()
+    results = []
+    for path, error in zip(columns["path"][:count], columns["error"][:count]):
+        if error:
+            continue
+        text = DocumentLoader.load(str(path), os.path.splitext(str(path))[1].lstrip("."))
+        # 일괄 처리 대기열이 길면 줄어들 때까지 투입 보류 (역압)
+        llm_scheduler.wait_for_capacity("batch")
+        with workload("batch", "bulk_screening"):
+            result = workflow.run(text, sla_sec=0)
+        if store is not None and "error" not in result:
+            store.save(result, text, title=os.path.basename(str(path)))
+        results.append({"path": str(path), "result": result})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ContractGuard AI 계약서 아카이브 일괄 스크리닝")
+    parser.add_argument("archive", help="계약서 아카이브 디렉터리 (txt/pdf/docx)")
+    parser.add_argument("--output", default="screening.npz", help="요약 저장 경로 (.npz 또는 .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--batch-size", type=int, default=64, help="프로세스 작업 단위 파일 수")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 계약서 수")
+    parser.add_argument("--analyze", type=int, default=0, help="전체 워크플로우로 분석할 상위 계약서 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = screen_archive(iter_documents(args.archive), workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    save_screening(columns, args.output)
+
+    total = len(columns["path"])
+    errors = int(np.count_nonzero(columns["error"] != ""))
+    print(f"📂 {total:,}건 스크리닝 ({elapsed:.1f}초, {total / max(elapsed, 1e-9):,.0f}건/초), 오류 {errors:,}건")
+    print(f"💾 요약 저장: {args.output}")
+
+    for i in range(min(args.top, total)):
+        flags = describe_flags(int(columns["damage_flags"][i]), int(columns["termination_flags"][i]))
+        print(
+            f"  {int(columns['risk_score'][i]):3d}점  {columns['contract_type'][i]:12s}  "
+            f"{columns['path'][i]}  {', '.join(flags)}"
+        )
+
+    if args.analyze:
+        for item in analyze_top(columns, args.analyze):
+            summary = item["result"].get("summary", {})
+            print(f"🔍 {item['path']}: {summary.get('risk_score', 'N/A')}점 ({summary.get('risk_level', 'N/A')})")
+
+
+if __name__ == "__main__":
+    main()
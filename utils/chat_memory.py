@@ -0,0 +1,96 @@
+"""
+ContractGuard AI - 대화 메모리 모듈
+토큰 예산 안의 최근 대화 창 + 오래된 대화의 누적 요약으로 상담 프롬프트 크기를 일정하게 유지
+"""
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from config.settings import app_config
+from utils.text_processor import TextProcessor
+
+
+class ChatMemory:
+    """세션별 상담 대화 메모리
+
+    - window: 프롬프트에 그대로 넣는 최근 대화 (토큰 예산 이내)
+    - summary: 창에서 밀려난 대화를 누적 요약한 텍스트
+    - display: 화면 표시용 대화 기록 (최근 N개만 보관)
+    """
+
+    def __init__(
+        self,
+        window_tokens: Optional[int] = None,
+        summary_tokens: Optional[int] = None,
+        display_messages: Optional[int] = None
+    ):
+        self.window_tokens = window_tokens or app_config.chat_window_tokens
+        self.summary_tokens = summary_tokens or app_config.chat_summary_tokens
+        self.summary = ""
+        self.window: deque = deque()
+        self.display: deque = deque(maxlen=display_messages or app_config.chat_display_messages)
+        self._window_size = 0
+
+    def add(self, role: str, content: str, cached: bool = False):
+        """대화 메시지 추가 (role: user/assistant, cached: 캐시된 답변 여부)"""
+        tokens = TextProcessor.count_tokens_approx(content)
+        self.window.append({"role": role, "content": content, "tokens": tokens})
+        self._window_size += tokens
+        self.display.append({"role": role, "content": content, "cached": cached})
+
+    @property
+    def window_size(self) -> int:
+        """최근 대화 창의 토큰 수"""
+        return self._window_size
+
+    def window_messages(self) -> List[Any]:
+        """최근 대화 창을 LangChain 메시지로 변환"""
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        return [
+            HumanMessage(content=turn["content"]) if turn["role"] == "user"
+            else AIMessage(content=turn["content"])
+            for turn in self.window
+        ]
+
+    def pop_overflow(self) -> List[Dict[str, Any]]:
+        """예산을 넘으면 오래된 대화를 꺼내 반환 (요약 대상)
+
+        요약 호출이 매 턴 발생하지 않도록 예산의 절반까지 비우며,
+        질문/답변 쌍이 갈라지지 않게 assistant 메시지에서 끊고 마지막 한 쌍은 남깁니다.
+        """
+        if self._window_size <= self.window_tokens:
+            return []
+
+        target = self.window_tokens // 2
+        folded: List[Dict[str, Any]] = []
+        while len(self.window) > 2 and self._window_size > target:
+            turn = self.window.popleft()
+            self._window_size -= turn["tokens"]
+            folded.append(turn)
+            # 질문만 꺼낸 경우 답변까지 함께 요약
+            if turn["role"] == "user" and self.window and self.window[0]["role"] == "assistant":
+                answer = self.window.popleft()
+                self._window_size -= answer["tokens"]
+                folded.append(answer)
+        return folded
+
+    def set_summary(self, summary: str):
+        """누적 요약 갱신 (예산을 넘으면 잘라냄)"""
+        summary = summary.strip()
+        tokens = TextProcessor.count_tokens_approx(summary)
+        if tokens > self.summary_tokens:
+            summary = summary[-int(len(summary) * self.summary_tokens / tokens):]
+        self.summary = summary
+
+    @staticmethod
+    def format_turns(turns: List[Dict[str, Any]]) -> str:
+        """요약 프롬프트용 대화 문자열"""
+        labels = {"user": "사용자", "assistant": "AI"}
+        return "\n".join(f"{labels.get(t['role'], t['role'])}: {t['content']}" for t in turns)
+
+    def clear(self):
+        """대화 메모리 초기화"""
+        self.summary = ""
+        self.window.clear()
+        self.display.clear()
+        self._window_size = 0
@@ -0,0 +1,164 @@
+"""
+ContractGuard AI - 간결 출력 복원 모듈
+LLM이 조항 ID와 짧은 코드만 반환하는 간결 출력 모드에서 프롬프트용 조항 목록을 만들고,
+응답을 로컬 조항(제목/원문)으로 기존 리포트 스키마에 맞게 복원
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+
+ARTICLE_START_PATTERN = re.compile(r'제\s*\d+\s*조')
+
+
+def clause_id(index: int) -> str:
+    """조항 순번(0부터) → 조항 ID (채팅용 조항 인덱스와 같은 규칙)"""
+    return f"c{index + 1}"
+
+
+def clause_map(clauses: List[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """조항 ID → 조항"""
+    return {clause_id(i): clause for i, clause in enumerate(clauses)}
+
+
+def render_clauses(
+    contract_text: str,
+    clauses: List[Dict[str, str]],
+    indices: Optional[List[int]] = None,
+    with_content: bool = True
+) -> str:
+    """조항 ID를 붙인 프롬프트용 계약서 (전체 계약서면 첫 조항 앞 머리말 포함)"""
+    parts = []
+    if indices is None:
+        first_article = ARTICLE_START_PATTERN.search(contract_text)
+        preamble = contract_text[:first_article.start()].strip() if first_article else ""
+        if preamble and with_content:
+            parts.append(preamble)
+        indices = list(range(len(clauses)))
+    for i in indices:
+        clause = clauses[i]
+        header = f"[{clause_id(i)}] {clause['title']}"
+        parts.append(f"{header}\n{clause['content']}" if with_content else header)
+    return "\n\n".join(parts)
+
+
+def _title(clauses_by_id: Dict[str, Dict[str, str]], clause_ref: Any, fallback: str = "") -> str:
+    clause = clauses_by_id.get(str(clause_ref or ""))
+    return clause["title"] if clause else fallback
+
+
+def _labels(clauses_by_id: Dict[str, Dict[str, str]], refs: Any) -> List[str]:
+    """조항 ID 목록을 조항 제목으로 (ID가 아닌 항목은 그대로)"""
+    if not isinstance(refs, list):
+        return []
+    return [_title(clauses_by_id, ref, str(ref)) for ref in refs]
+
+
+def expand_analysis(compact: Dict[str, Any], clauses: List[Dict[str, str]]) -> Dict[str, Any]:
+    """계약서 분석 간결 응답 → 기존 분석 결과 스키마"""
+    if "raw_response" in compact:
+        return compact
+    clauses_by_id = clause_map(clauses)
+    summaries = compact.get("clauses") if isinstance(compact.get("clauses"), list) else []
+    return {
+        "contract_type": compact.get("contract_type", "일반계약"),
+        "parties": {"party_a": compact.get("party_a", ""), "party_b": compact.get("party_b", "")},
+        "key_terms": {
+            "amount": compact.get("amount", ""),
+            "period": compact.get("period", ""),
+            "subject": compact.get("subject", ""),
+        },
+        "clauses_summary": [
+            {
+                "title": _title(clauses_by_id, item.get("id"), str(item.get("id", ""))),
+                "summary": item.get("summary", ""),
+            }
+            for item in summaries if isinstance(item, dict)
+        ],
+    }
+
+
+def expand_risks(compact: Dict[str, Any], clauses: List[Dict[str, str]]) -> Dict[str, Any]:
+    """리스크 평가 간결 응답 → 기존 리스크 결과 스키마 (조항 ID는 clause_id로 유지)"""
+    if "raw_response" in compact:
+        return compact
+    clauses_by_id = clause_map(clauses)
+    risks = compact.get("risks") if isinstance(compact.get("risks"), list) else []
+    return {
+        "risk_score": compact.get("risk_score", 50),
+        "risk_level": compact.get("risk_level", "중"),
+        "risks": [
+            {
+                "clause": _title(clauses_by_id, risk.get("id"), str(risk.get("id", ""))),
+                "clause_id": risk.get("id"),
+                "risk_type": risk.get("risk_type", ""),
+                "severity": risk.get("severity", "중"),
+                "description": risk.get("description", ""),
+                "legal_basis": risk.get("legal_basis", ""),
+            }
+            for risk in risks if isinstance(risk, dict)
+        ],
+        "safe_clauses": _labels(clauses_by_id, compact.get("safe")),
+        "safe_clause_ids": [ref for ref in compact.get("safe") or [] if ref in clauses_by_id],
+    }
+
+
+def expand_comparison(compact: Dict[str, Any], clauses: List[Dict[str, str]]) -> Dict[str, Any]:
+    """조항 비교 간결 응답 → 기존 비교 결과 스키마 (현재 문구는 계약서 원문에서 복원)"""
+    if "raw_response" in compact:
+        return compact
+    clauses_by_id = clause_map(clauses)
+    items = compact.get("results") if isinstance(compact.get("results"), list) else []
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        clause = clauses_by_id.get(str(item.get("id", "")))
+        results.append({
+            "clause_name": clause["title"] if clause else str(item.get("id", "")),
+            "status": item.get("status", "변경"),
+            "current": clause["content"] if clause else "",
+            "standard": item.get("standard", ""),
+            "assessment": item.get("assessment", "중립"),
+        })
+    missing = compact.get("missing") if isinstance(compact.get("missing"), list) else []
+    for name in missing:
+        results.append({
+            "clause_name": name,
+            "status": "누락",
+            "current": "해당 조항 없음",
+            "standard": "",
+            "assessment": "불리",
+        })
+    return {
+        "comparison_results": results,
+        "missing_clauses": missing,
+        "summary": compact.get("summary", ""),
+    }
+
+
+def expand_improvements(compact: Dict[str, Any], clauses: List[Dict[str, str]]) -> Dict[str, Any]:
+    """개선 제안 간결 응답 → 기존 개선 제안 스키마 (현재 문구는 계약서 원문에서 복원)"""
+    if "raw_response" in compact:
+        return compact
+    clauses_by_id = clause_map(clauses)
+    items = compact.get("items") if isinstance(compact.get("items"), list) else []
+    improvements = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        clause = clauses_by_id.get(str(item.get("id") or ""))
+        improvements.append({
+            "priority": item.get("priority", 3),
+            "clause_name": clause["title"] if clause else "신규 조항",
+            "current_clause": clause["content"] if clause else "해당 조항 없음",
+            "suggested_clause": item.get("suggested_clause", ""),
+            "reason": item.get("reason", ""),
+            "negotiation_tip": item.get("tip", ""),
+        })
+    return {
+        "priority_improvements": improvements,
+        "must_change": _labels(clauses_by_id, compact.get("must_change")),
+        "negotiable": _labels(clauses_by_id, compact.get("negotiable")),
+        "overall_recommendation": compact.get("overall", ""),
+    }
+
@@ -0,0 +1,205 @@
+"""
+ContractGuard AI - 마감 시간(데드라인) 모듈
+분석 전체 SLA를 워크플로우 노드별 예산으로 나누어 전파하고, 시간이 부족하면
+작은 모델 → 컨텍스트 축소 → 선택 노드 생략 순서로 단계적으로 품질을 낮춤
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import deadline_config
+
+
+# 워크플로우 노드 순서와 생략 가능한 노드 (생략 시 부분 리포트)
+NODE_ORDER = ["analyze", "evaluate_risk", "compare_clauses", "suggest_improvements", "generate_report"]
+OPTIONAL_NODES = {"suggest_improvements"}
+
+# 현재 분석의 데드라인과 실행 중인 노드 예산 (스레드·비동기 컨텍스트별로 분리)
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("current_deadline", default=None)
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("current_stage", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """노드 예산 또는 전체 SLA 초과"""
+
+
+class NodeLatencyEstimator:
+    """노드별 예상 소요시간 (전체 품질로 실행한 실측치의 EWMA)"""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._estimates: Dict[str, float] = dict(deadline_config.node_estimates)
+        self._lock = threading.Lock()
+
+    def get(self, node: str) -> float:
+        with self._lock:
+            return self._estimates.get(node, 0.0)
+
+    def observe(self, node: str, seconds: float):
+        with self._lock:
+            previous = self._estimates.get(node)
+            self._estimates[node] = seconds if previous is None else (
+                (1 - self.alpha) * previous + self.alpha * seconds
+            )
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {node: round(seconds, 2) for node, seconds in self._estimates.items()}
+
+
+# 전역 인스턴스 (워크플로우 인스턴스 간 공유)
+node_estimator = NodeLatencyEstimator()
+
+
+class StageBudget:
+    """노드 하나의 예산과 품질 저하 단계
+
+    level: "full" → "small_model" → "trim_context" → "skip" (뒤로 갈수록 저하가 큼)
+    """
+
+    LEVELS = ["full", "small_model", "trim_context", "skip"]
+
+    def __init__(self, node: str, budget: float, level: str, ends_at: float):
+        self.node = node
+        self.budget = budget
+        self.level = level
+        self.ends_at = ends_at
+
+    def time_left(self) -> float:
+        return self.ends_at - time.monotonic()
+
+    def at_least(self, level: str) -> bool:
+        return self.LEVELS.index(self.level) >= self.LEVELS.index(level)
+
+    @property
+    def small_model(self) -> bool:
+        return self.at_least("small_model")
+
+    @property
+    def trim_context(self) -> bool:
+        return self.at_least("trim_context")
+
+    @property
+    def skip(self) -> bool:
+        return self.level == "skip"
+
+
+class Deadline:
+    """분석 1건의 전체 마감 시간
+
+    - plan(): 남은 시간을 남은 노드의 예상 소요시간 비율로 나누어 현재 노드 예산 결정
+    - 남은 시간이 예상보다 부족할수록 품질 저하 단계를 높이고 기록
+    """
+
+    def __init__(self, sla_sec: float):
+        self.sla_sec = sla_sec
+        self.started = time.monotonic()
+        self.ends_at = self.started + sla_sec
+        self.stages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.ends_at - time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def plan(self, node: str) -> StageBudget:
+        """노드 예산과 품질 저하 단계 결정"""
+        remaining = self.remaining()
+        following = NODE_ORDER[NODE_ORDER.index(node):] if node in NODE_ORDER else [node]
+        expected = sum(node_estimator.get(n) for n in following)
+        ratio = remaining / expected if expected > 0 else float("inf")
+
+        if node in OPTIONAL_NODES and ratio < deadline_config.skip_optional_ratio:
+            level = "skip"
+        elif ratio < deadline_config.trim_context_ratio:
+            level = "trim_context"
+        elif ratio < deadline_config.small_model_ratio:
+            level = "small_model"
+        else:
+            level = "full"
+
+        # 마지막 리포트 생성 시간은 남겨 둠
+        usable = remaining - (deadline_config.report_reserve_sec if node != "generate_report" else 0.0)
+        if ratio >= 1:
+            # 여유가 있으면 다음 노드들의 예상 시간을 뺀 나머지를 모두 허용
+            budget = usable - sum(node_estimator.get(n) for n in following[1:])
+        else:
+            # 부족하면 남은 시간을 예상 소요시간 비율로 배분
+            budget = usable * node_estimator.get(node) / expected
+        budget = max(0.0, budget)
+        return StageBudget(node, budget, level, time.monotonic() + budget)
+
+    def record(self, stage: StageBudget, seconds: float, outcome: str):
+        """노드 실행 결과 기록 (완료/생략/시간 초과)"""
+        if stage.level == "full" and outcome == "completed":
+            node_estimator.observe(stage.node, seconds)
+        with self._lock:
+            self.stages.append({
+                "node": stage.node,
+                "level": stage.level,
+                "budget": round(stage.budget, 2),
+                "elapsed": round(seconds, 2),
+                "outcome": outcome,
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """SLA 준수 여부와 노드별 품질 저하 내역"""
+        with self._lock:
+            stages = list(self.stages)
+        degraded = [s for s in stages if s["level"] != "full" or s["outcome"] != "completed"]
+        return {
+            "sla_sec": self.sla_sec,
+            "elapsed": round(self.elapsed(), 2),
+            "met": self.elapsed() <= self.sla_sec,
+            "partial": any(s["outcome"] in ("skipped", "timed_out") for s in stages),
+            "skipped": [s["node"] for s in stages if s["outcome"] == "skipped"],
+            "timed_out": [s["node"] for s in stages if s["outcome"] == "timed_out"],
+            "degradations": degraded,
+        }
+
+
+@contextmanager
+def deadline_scope(sla_sec: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """분석 전체 데드라인 설정 (SLA가 없거나 비활성화면 None)"""
+    if not deadline_config.enabled or not sla_sec or sla_sec <= 0:
+        yield None
+        return
+    deadline = Deadline(sla_sec)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def stage_scope(stage: Optional[StageBudget]) -> Iterator[Optional[StageBudget]]:
+    """노드 예산 설정 (None이면 전체 데드라인만 적용)"""
+    token = _current_stage.set(stage)
+    try:
+        yield stage
+    finally:
+        _current_stage.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """현재 분석의 데드라인 (없으면 None)"""
+    return _current_deadline.get()
+
+
+def current_stage() -> Optional[StageBudget]:
+    """현재 노드 예산 (노드 밖이면 None)"""
+    return _current_stage.get()
+
+
+def time_left() -> Optional[float]:
+    """현재 호출에 허용된 시간 (노드 예산 우선, 데드라인이 없으면 None)"""
+    stage = current_stage()
+    if stage is not None:
+        return stage.time_left()
+    deadline = current_deadline()
+    return deadline.remaining() if deadline is not None else None
@@ -5,23 +5,31 @@ PDF, DOCX, TXT 파일에서 텍스트 추출
 import io
 from typing import Optional
 
-try:
-    from PyPDF2 import PdfReader
-except ImportError as e:
-    raise ImportError(
-        "PyPDF2가 설치되지 않았습니다. 다음 명령어로 설치하세요:\n"
-        "pip install PyPDF2\n"
-        f"원본 오류: {e}"
-    )
 
-try:
-    from docx import Document
-except ImportError as e:
-    raise ImportError(
-        "python-docx가 설치되지 않았습니다. 다음 명령어로 설치하세요:\n"
-        "pip install python-docx\n"
-        f"원본 오류: {e}"
-    )
+def _import_pdf_reader():
+    """PDF 파서 지연 로드 (PDF를 처음 읽을 때만 import)"""
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError as e:
+        raise ImportError(
+            "PyPDF2가 설치되지 않았습니다. 다음 명령어로 설치하세요:\n"
+            "pip install PyPDF2\n"
+            f"원본 오류: {e}"
+        )
+    return PdfReader
+
+
+def _import_docx_document():
+    """DOCX 파서 지연 로드 (DOCX를 처음 읽을 때만 import)"""
+    try:
+        from docx import Document
+    except ImportError as e:
+        raise ImportError(
+            "python-docx가 설치되지 않았습니다. 다음 명령어로 설치하세요:\n"
+            "pip install python-docx\n"
+            f"원본 오류: {e}"
+        )
+    return Document
 
 
 class DocumentLoader:
@@ -30,6 +38,7 @@ class DocumentLoader:
     @staticmethod
     def load_pdf(file) -> str:
         """PDF 파일에서 텍스트 추출"""
+        PdfReader = _import_pdf_reader()
         try:
             if hasattr(file, 'read'):
                 pdf_reader = PdfReader(io.BytesIO(file.read()))
@@ -48,6 +57,7 @@ class DocumentLoader:
     @staticmethod
     def load_docx(file) -> str:
         """DOCX 파일에서 텍스트 추출"""
+        Document = _import_docx_document()
         try:
             if hasattr(file, 'read'):
                 doc = Document(io.BytesIO(file.read()))
@@ -87,12 +97,18 @@ class DocumentLoader:
         
         file_type = file_type.lower()
         
-        if file_type == 'pdf':
-            return cls.load_pdf(file)
-        elif file_type in ['docx', 'doc']:
-            return cls.load_docx(file)
-        elif file_type == 'txt':
-            return cls.load_txt(file)
-        else:
-            raise ValueError(f"지원하지 않는 파일 형식입니다: {file_type}")
+        from .tracing import tracer
+        
+        with tracer.span("document_load", kind="document", file_type=file_type) as span:
+            if file_type == 'pdf':
+                text = cls.load_pdf(file)
+            elif file_type in ['docx', 'doc']:
+                text = cls.load_docx(file)
+            elif file_type == 'txt':
+                text = cls.load_txt(file)
+            else:
+                raise ValueError(f"지원하지 않는 파일 형식입니다: {file_type}")
+            span.set(characters=len(text))
+        
+        return text
 
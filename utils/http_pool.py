@@ -0,0 +1,183 @@
+"""
+ContractGuard AI - HTTP 연결 풀 모듈
+모든 Azure OpenAI 채팅/임베딩 클라이언트가 공유하는 httpx 동기/비동기 클라이언트
+(keep-alive, 가능하면 HTTP/2)와 연결 재사용/연결 수립 시간 집계
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config.settings import http_pool_config
+
+
+# 비동기 클라이언트 종료 대기 시간(초)
+ASYNC_CLOSE_TIMEOUT_SEC = 5.0
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (h2 패키지 필요)"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConnectionStats:
+    """연결 재사용 통계 (httpcore trace 이벤트 기반)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.connect_seconds = 0.0
+
+    def record(self, new_connection: bool, connect_seconds: float):
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.new_connections += 1
+                self.connect_seconds += connect_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """요청 수, 새 연결 수, 재사용률, 평균 연결 수립 시간"""
+        with self._lock:
+            reused = self.requests - self.new_connections
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused": reused,
+                "reuse_rate": reused / self.requests if self.requests else 0.0,
+                "avg_connect_ms": (
+                    self.connect_seconds / self.new_connections * 1000 if self.new_connections else 0.0
+                ),
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+class _RequestTrace:
+    """요청 1건의 연결 수립 구간 측정 (TCP 연결 + TLS 핸드셰이크)"""
+
+    def __init__(self):
+        self.connect_started: Optional[float] = None
+        self.connect_seconds = 0.0
+
+    def on_event(self, event_name: str):
+        if event_name == "connection.connect_tcp.started":
+            self.connect_started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self.connect_started is not None:
+                self.connect_seconds = time.perf_counter() - self.connect_started
+
+    def finish(self):
+        new_connection = self.connect_started is not None
+        connection_stats.record(new_connection, self.connect_seconds)
+
+        # 현재 트레이스 스팬(LLM/임베딩 호출)에 연결 정보 누적
+        from utils.tracing import tracer
+
+        span = tracer.current_span()
+        if span is not None:
+            attributes = span.attributes
+            span.set(
+                http_requests=attributes.get("http_requests", 0) + 1,
+                new_connections=attributes.get("new_connections", 0) + int(new_connection),
+                connect_ms=round(attributes.get("connect_ms", 0.0) + self.connect_seconds * 1000, 2),
+            )
+
+
+def _on_request(request: httpx.Request):
+    trace = _RequestTrace()
+    request.extensions["trace"] = lambda name, info: trace.on_event(name)
+    request.extensions["contractguard_trace"] = trace
+
+
+async def _on_request_async(request: httpx.Request):
+    trace = _RequestTrace()
+
+    async def on_event(name, info):
+        trace.on_event(name)
+
+    request.extensions["trace"] = on_event
+    request.extensions["contractguard_trace"] = trace
+
+
+def _on_response(response: httpx.Response):
+    trace = response.request.extensions.get("contractguard_trace")
+    if trace is not None:
+        trace.finish()
+
+
+async def _on_response_async(response: httpx.Response):
+    _on_response(response)
+
+
+def _client_options() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=http_pool_config.max_connections,
+            max_keepalive_connections=http_pool_config.max_keepalive_connections,
+            keepalive_expiry=http_pool_config.keepalive_expiry_sec,
+        ),
+        "timeout": httpx.Timeout(
+            http_pool_config.read_timeout_sec, connect=http_pool_config.connect_timeout_sec
+        ),
+        "http2": http_pool_config.http2 and http2_available(),
+    }
+
+
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """프로세스 공용 동기 httpx 클라이언트"""
+    global _sync_client
+    with _pool_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                event_hooks={"request": [_on_request], "response": [_on_response]},
+                **_client_options()
+            )
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """프로세스 공용 비동기 httpx 클라이언트"""
+    global _async_client
+    with _pool_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                event_hooks={"request": [_on_request_async], "response": [_on_response_async]},
+                **_client_options()
+            )
+        return _async_client
+
+
+def close_http_clients():
+    """공용 클라이언트 종료 (풀 설정 변경 후 재생성용)"""
+    global _sync_client, _async_client
+    with _pool_lock:
+        sync_client, async_client = _sync_client, _async_client
+        _sync_client, _async_client = None, None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None and not async_client.is_closed:
+        # 비동기 클라이언트는 요청을 보내던 디스패처 이벤트 루프에서 닫아 풀의 연결을 반환
+        # (루프 스레드가 get_async_http_client를 호출할 수 있으므로 잠금 밖에서 대기)
+        from utils.llm_dispatch import _get_loop
+
+        try:
+            asyncio.run_coroutine_threadsafe(async_client.aclose(), _get_loop()).result(ASYNC_CLOSE_TIMEOUT_SEC)
+        except Exception as e:
+            print(f"⚠️ 비동기 HTTP 클라이언트 종료 실패: {e}")
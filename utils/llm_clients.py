@@ -0,0 +1,120 @@
+"""
+ContractGuard AI - LLM 클라이언트 풀 모듈
+Azure OpenAI 채팅/임베딩 클라이언트와 Retriever를 프로세스 단위로 재사용
+(모든 클라이언트가 utils.http_pool의 공용 HTTP 연결 풀을 공유)
+"""
+import threading
+from typing import Any, Dict, Tuple
+
+from config.settings import azure_config, app_config
+from utils.http_pool import get_async_http_client, get_http_client
+
+
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_or_create(key: Tuple, factory):
+    """키별 클라이언트 캐시 (동시 생성 시 하나만 유지)"""
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+
+def get_chat_llm(
+    deployment: str = None,
+    temperature: float = 0.1,
+    endpoint: str = None,
+    api_key: str = None,
+    api_version: str = None
+):
+    """배포/temperature별 공용 AzureChatOpenAI 클라이언트 반환
+
+    엔드포인트 설정이 바뀌면(부하 테스트 등) 새 클라이언트를 만듭니다.
+    endpoint/api_key/api_version을 지정하면 기본 Azure 설정 대신 사용합니다 (다중 배포 분산용).
+    """
+    deployment = deployment or azure_config.gpt4o_mini
+    endpoint = endpoint or azure_config.endpoint
+    api_version = api_version or azure_config.api_version
+    key = ("chat", endpoint, api_version, deployment, temperature)
+
+    def factory():
+        from langchain_openai import AzureChatOpenAI
+
+        return AzureChatOpenAI(
+            azure_endpoint=endpoint,
+            api_key=api_key or azure_config.api_key,
+            api_version=api_version,
+            azure_deployment=deployment,
+            temperature=temperature,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        )
+
+    return _get_or_create(key, factory)
+
+
+def get_embeddings(deployment: str = None):
+    """배포별 공용 AzureOpenAIEmbeddings 클라이언트 반환 (호출은 우선순위 스케줄러 슬롯 안에서 실행)"""
+    deployment = deployment or azure_config.embed_large
+    dimensions = azure_config.embed_dimensions or None
+    key = ("embeddings", azure_config.endpoint, azure_config.api_version, deployment, dimensions)
+
+    def factory():
+        from langchain_openai import AzureOpenAIEmbeddings
+
+        from utils.scheduler import ScheduledEmbeddings
+
+        return ScheduledEmbeddings(AzureOpenAIEmbeddings(
+            azure_endpoint=azure_config.endpoint,
+            api_key=azure_config.api_key,
+            api_version=azure_config.api_version,
+            azure_deployment=deployment,
+            dimensions=dimensions,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        ))
+
+    return _get_or_create(key, factory)
+
+
+def get_agent_llm(deployment: str = None, temperature: float = 0.1):
+    """Agent용 LLM (분산 디스패처가 켜져 있으면 디스패처, 아니면 단일 클라이언트)"""
+    from config.settings import dispatch_config
+
+    if not dispatch_config.enabled:
+        return get_chat_llm(deployment, temperature)
+
+    deployment = deployment or azure_config.gpt4o_mini
+    key = ("dispatcher", azure_config.endpoint, dispatch_config.backends_json, deployment, temperature)
+
+    def factory():
+        from utils.llm_dispatch import LLMDispatcher
+
+        return LLMDispatcher(deployment, temperature)
+
+    return _get_or_create(key, factory)
+
+
+def get_retriever():
+    """공용 ContractRetriever 반환 (Vector Store 연결 재사용)"""
+    key = ("retriever", azure_config.endpoint, app_config.vectorstore_dir)
+
+    def factory():
+        from rag.retriever import ContractRetriever
+
+        return ContractRetriever()
+
+    return _get_or_create(key, factory)
+
+
+def reset_clients():
+    """캐시된 클라이언트 제거 (지식 베이스 재구축 후 등)"""
+    with _clients_lock:
+        _clients.clear()
@@ -0,0 +1,333 @@
+"""
+ContractGuard AI - LLM 요청 분산 모듈
+여러 Azure OpenAI 배포/엔드포인트로 요청을 분산하고, 학습된 p95를 넘는 호출은
+헤징(중복 요청) 후 먼저 도착한 응답을 사용하며, 서킷 브레이커로 장애 배포를 우회
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import azure_config, dispatch_config
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 배포를 사용할 수 없음"""
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """요청을 보낼 수 있는지 (열린 서킷은 reset 시간 경과 후 시험 요청 1건만 허용)"""
+        with self._lock:
+            if self.state == "open" and time.time() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open":
+                return not self._trial_in_flight
+            return self.state == "closed"
+
+    def acquire(self) -> bool:
+        """요청 시작 (half_open이면 시험 요청 자리를 차지)"""
+        if not self.available():
+            return False
+        with self._lock:
+            if self.state == "half_open":
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.time()
+            self._trial_in_flight = False
+
+    def release(self):
+        """결과 없이 끝난 요청 (헤징 패배로 취소) - 시험 자리만 반환"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class Backend:
+    """배포 하나 (엔드포인트 + 배포명)"""
+
+    def __init__(self, name: str, client: Any, deployment: str):
+        self.name = name
+        self.client = client
+        self.deployment = deployment
+        self.breaker = CircuitBreaker(
+            dispatch_config.breaker_failure_threshold, dispatch_config.breaker_reset_sec
+        )
+        self.in_flight = 0
+        self.ewma_latency = 0.0
+        self.sampled_at = 0.0
+        self.stats = {"calls": 0, "wins": 0, "failures": 0, "cancelled": 0}
+
+    def record_latency(self, latency: float):
+        self.ewma_latency = latency if not self.ewma_latency else 0.8 * self.ewma_latency + 0.2 * latency
+        self.sampled_at = time.time()
+
+    def current_latency(self) -> float:
+        """지연 추정 (오래 측정되지 않은 추정은 반감기마다 절반 - 일시적으로 느렸던 배포가 계속 배제되지 않도록)"""
+        if not self.ewma_latency:
+            return 0.0
+        age = time.time() - self.sampled_at
+        return self.ewma_latency * 0.5 ** (age / dispatch_config.latency_decay_sec)
+
+    def load_score(self) -> float:
+        """낮을수록 우선 (평균 지연 × 진행 중 요청 수, 측정 전 배포는 최소 지연으로 간주)"""
+        latency = max(self.current_latency(), dispatch_config.balance_min_latency_sec)
+        return latency * (1 + self.in_flight)
+
+
+class LatencyTracker:
+    """호출 유형(Agent/용도)별 최근 지연시간 창과 헤징 지연 계산"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency: float):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(latency)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """학습된 p95 (표본이 부족하면 None - 헤징하지 않음)"""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < dispatch_config.hedge_min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * dispatch_config.hedge_percentile / 100))
+        return max(dispatch_config.hedge_min_delay_sec, samples[index])
+
+
+def load_backend_specs() -> List[Dict[str, Any]]:
+    """AOAI_BACKENDS 설정 (없으면 기본 Azure 설정 1개)"""
+    if dispatch_config.backends_json:
+        try:
+            specs = json.loads(dispatch_config.backends_json)
+            if isinstance(specs, list) and specs:
+                return specs
+        except json.JSONDecodeError as e:
+            print(f"⚠️ AOAI_BACKENDS 파싱 실패, 기본 배포만 사용: {e}")
+    return [{"name": "default", "endpoint": azure_config.endpoint, "api_key": azure_config.api_key}]
+
+
+# 모든 디스패처가 공유하는 이벤트 루프 (공용 비동기 HTTP 클라이언트가 하나의 루프에 묶이도록)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-dispatch", daemon=True).start()
+        return _loop
+
+
+class LLMDispatcher:
+    """배포 간 분산 + 헤징 + 서킷 브레이커를 적용한 LLM 호출기
+
+    - 사용 가능한 배포 중 부하 점수(감쇠하는 평균 지연 × 진행 중 요청 수)의 역수에 비례해 골라 먼저 요청
+    - 학습된 p95(호출 유형별)까지 응답이 없으면 다른 배포로 중복 요청, 먼저 온 응답 사용
+    - 늦은 요청은 취소 (비동기 HTTP 요청을 중단하여 연결 반환)
+    - 실패하면 남은 배포로 즉시 재시도, 연속 실패한 배포는 서킷을 열어 제외
+    """
+
+    def __init__(self, deployment: str, temperature: float = 0.1):
+        from utils.llm_clients import get_chat_llm
+
+        self.deployment = deployment
+        self.temperature = temperature
+        self.backends: List[Backend] = []
+        for i, spec in enumerate(load_backend_specs()):
+            actual = (spec.get("deployments") or {}).get(deployment, deployment)
+            client = get_chat_llm(
+                actual,
+                temperature,
+                endpoint=spec.get("endpoint"),
+                api_key=spec.get("api_key"),
+                api_version=spec.get("api_version")
+            )
+            self.backends.append(Backend(spec.get("name") or f"backend-{i}", client, actual))
+        self.latency = LatencyTracker(dispatch_config.latency_window)
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+
+    def invoke(
+        self,
+        messages: List,
+        latency_key: str = "default",
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """동기 호출 (Agent 스레드에서 사용, 실제 요청은 공용 이벤트 루프에서 실행)
+
+        timeout을 넘기면 진행 중인 요청(헤징 포함)을 모두 취소하고 TimeoutError 발생
+        kwargs(max_tokens, response_format 등)는 각 배포 호출에 그대로 전달
+        """
+        context = contextvars.copy_context()
+        future = asyncio.run_coroutine_threadsafe(
+            self._dispatch(messages, latency_key, context, kwargs), _get_loop()
+        )
+        try:
+            response, backend, hedged = future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+        # 현재 LLM 스팬에 응답한 배포와 헤징 여부 기록
+        from utils.tracing import tracer
+
+        span = tracer.current_span()
+        if span is not None:
+            span.set(backend=backend.name, deployment=backend.deployment, hedged=hedged)
+        return response
+
+    def _candidates(self, exclude: set) -> List[Backend]:
+        """사용 가능한 배포 목록 (첫 배포는 부하 점수 역수 비례 가중 무작위, 나머지는 점수 순)
+
+        항상 최저 점수 배포만 고르면 한 번 느렸던 배포는 다시 측정되지 않아 요청이 한 배포에 몰리므로,
+        빠른 배포에 더 많이 보내되 서킷이 닫힌 모든 배포에 요청을 나눕니다.
+        """
+        available = sorted(
+            (b for b in self.backends if b.name not in exclude and b.breaker.available()),
+            key=lambda b: b.load_score()
+        )
+        if len(available) > 1:
+            first = self._random.choices(available, weights=[1.0 / b.load_score() for b in available])[0]
+            available.remove(first)
+            available.insert(0, first)
+        return available
+
+    async def _call(self, backend: Backend, messages: List, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+        if not backend.breaker.acquire():
+            raise CircuitOpenError(backend.name)
+        backend.in_flight += 1
+        backend.stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            response = await backend.client.ainvoke(messages, **kwargs)
+        except asyncio.CancelledError:
+            backend.stats["cancelled"] += 1
+            backend.breaker.release()
+            raise
+        except Exception:
+            backend.stats["failures"] += 1
+            backend.breaker.record_failure()
+            raise
+        finally:
+            backend.in_flight -= 1
+        latency = time.perf_counter() - start
+        backend.breaker.record_success()
+        backend.record_latency(latency)
+        return response, latency
+
+    async def _dispatch(
+        self,
+        messages: List,
+        latency_key: str,
+        context: contextvars.Context,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Any, Backend, bool]:
+        with self._lock:
+            self.stats["calls"] += 1
+        hedge_delay = self.latency.hedge_delay(latency_key) if dispatch_config.hedging_enabled else None
+
+        tried: set = set()
+        tasks: Dict[asyncio.Task, Backend] = {}
+        hedge_pending = hedge_delay is not None
+        hedge_task: Optional[asyncio.Task] = None
+        last_error: Optional[BaseException] = None
+
+        def launch(exclude: set) -> Optional[asyncio.Task]:
+            candidates = self._candidates(exclude)
+            if not candidates:
+                return None
+            backend = candidates[0]
+            tried.add(backend.name)
+            task = asyncio.get_running_loop().create_task(self._call(backend, messages, kwargs), context=context)
+            tasks[task] = backend
+            return task
+
+        if launch(tried) is None:
+            raise CircuitOpenError("사용 가능한 배포가 없습니다. (모든 서킷 열림)")
+
+        try:
+            while tasks:
+                timeout = hedge_delay if hedge_pending else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # p95 초과: 아직 안 쓴 배포로, 배포가 하나뿐이면 같은 배포로 중복 요청
+                    hedge_pending = False
+                    hedge_task = launch(tried) or (launch(set()) if len(self.backends) == 1 else None)
+                    if hedge_task is not None:
+                        with self._lock:
+                            self.stats["hedged"] += 1
+                    continue
+
+                for task in done:
+                    backend = tasks.pop(task)
+                    if task.exception() is None:
+                        response, latency = task.result()
+                        backend.stats["wins"] += 1
+                        self.latency.record(latency_key, latency)
+                        if task is hedge_task:
+                            with self._lock:
+                                self.stats["hedge_wins"] += 1
+                        return response, backend, hedge_task is not None
+                    last_error = task.exception()
+
+                # 진행 중인 요청이 없으면 남은 배포로 장애 조치
+                if not tasks and launch(tried) is not None:
+                    with self._lock:
+                        self.stats["failovers"] += 1
+            raise last_error or CircuitOpenError("사용 가능한 배포가 없습니다.")
+        finally:
+            # 늦은 요청 취소
+            for task in tasks:
+                task.cancel()
+
+    def summary(self) -> Dict[str, Any]:
+        """분산/헤징 통계와 배포별 상태"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["backends"] = [
+            {
+                "name": b.name,
+                "deployment": b.deployment,
+                "state": b.breaker.state,
+                "ewma_latency": round(b.current_latency(), 3),
+                **b.stats,
+            }
+            for b in self.backends
+        ]
+        return stats
@@ -0,0 +1,97 @@
+"""
+ContractGuard AI - LLM 사용량 모듈
+응답 토큰 사용량 추출 및 프롬프트 캐시 재사용률 집계
+"""
+import threading
+from typing import Any, Dict
+
+
+def extract_usage(response: Any) -> Dict[str, int]:
+    """LLM 응답에서 토큰 사용량 추출
+
+    Azure OpenAI는 `usage.prompt_tokens_details.cached_tokens`로
+    프롬프트 캐시에서 재사용된 토큰 수를 반환합니다.
+    """
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+
+    # langchain-core 표준 usage_metadata
+    metadata = getattr(response, "usage_metadata", None) or {}
+    if metadata:
+        usage["prompt_tokens"] = metadata.get("input_tokens", 0) or 0
+        usage["completion_tokens"] = metadata.get("output_tokens", 0) or 0
+        details = metadata.get("input_token_details") or {}
+        usage["cached_tokens"] = details.get("cache_read", 0) or 0
+
+    # 원본 API 응답의 token_usage (버전에 따라 usage_metadata에 캐시 정보가 없을 수 있음)
+    response_metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = response_metadata.get("token_usage") or {}
+    if token_usage:
+        usage["prompt_tokens"] = usage["prompt_tokens"] or token_usage.get("prompt_tokens", 0) or 0
+        usage["completion_tokens"] = usage["completion_tokens"] or token_usage.get("completion_tokens", 0) or 0
+        details = token_usage.get("prompt_tokens_details") or {}
+        usage["cached_tokens"] = usage["cached_tokens"] or details.get("cached_tokens", 0) or 0
+
+    return usage
+
+
+class PromptCacheStats:
+    """Agent별 프롬프트 캐시 재사용률 및 지연시간 집계기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, agent: str, usage: Dict[str, int], latency: float):
+        """LLM 호출 1건 기록"""
+        cached = usage.get("cached_tokens", 0)
+        with self._lock:
+            stats = self._stats.setdefault(agent, {
+                "calls": 0,
+                "cache_hit_calls": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+                "latency_hit": 0.0,
+                "latency_miss": 0.0,
+            })
+            stats["calls"] += 1
+            stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+            stats["cached_tokens"] += cached
+            stats["completion_tokens"] += usage.get("completion_tokens", 0)
+            if cached:
+                stats["cache_hit_calls"] += 1
+                stats["latency_hit"] += latency
+            else:
+                stats["latency_miss"] += latency
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Agent별 재사용률 및 평균 지연시간 요약"""
+        with self._lock:
+            snapshot = {agent: dict(stats) for agent, stats in self._stats.items()}
+
+        result = {}
+        for agent, stats in snapshot.items():
+            hit_calls = stats["cache_hit_calls"]
+            miss_calls = stats["calls"] - hit_calls
+            result[agent] = {
+                "calls": stats["calls"],
+                "prompt_tokens": stats["prompt_tokens"],
+                "cached_tokens": stats["cached_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "reuse_rate": (
+                    stats["cached_tokens"] / stats["prompt_tokens"]
+                    if stats["prompt_tokens"] else 0.0
+                ),
+                "avg_latency_hit": stats["latency_hit"] / hit_calls if hit_calls else 0.0,
+                "avg_latency_miss": stats["latency_miss"] / miss_calls if miss_calls else 0.0,
+            }
+        return result
+
+    def reset(self):
+        """집계 초기화"""
+        with self._lock:
+            self._stats.clear()
+
+
+# 전역 집계 인스턴스
+prompt_cache_stats = PromptCacheStats()
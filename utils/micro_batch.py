@@ -0,0 +1,183 @@
+"""
+ContractGuard AI - 마이크로 배치 모듈
+여러 분석(요청)에서 동시에 들어오는 소형 LLM 작업(조항 단위 평가 등)을 짧은 시간 창 동안 모아
+항목 ID를 붙인 한 번의 요청으로 묶고, 구조화 응답을 호출자별로 다시 나눔 (RPM 한도 대비 처리량 향상)
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from config.settings import micro_batch_config
+
+
+# 배치 실행 함수: (항목 텍스트 목록, 제한 시간) → (항목별 결과, 배치 응답 전체, 토큰 사용량)
+BatchExecutor = Callable[[List[str], Optional[float]], Tuple[List[Any], Dict[str, Any], Dict[str, int]]]
+
+
+class _Caller:
+    """배치에 합류한 호출자 하나의 작업 묶음"""
+
+    def __init__(self, texts: List[str], execute: BatchExecutor, timeout: Optional[float] = None):
+        self.texts = texts
+        self.execute = execute
+        self.future: Future = Future()
+        # 호출자가 결과를 기다리는 마감 시각 (없으면 None)
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+
+
+class _PendingGroup:
+    """같은 그룹(호환 가능한 작업)의 대기열"""
+
+    def __init__(self, flush_at: float):
+        self.flush_at = flush_at
+        self.callers: List[_Caller] = []
+
+    @property
+    def item_count(self) -> int:
+        return sum(len(caller.texts) for caller in self.callers)
+
+
+class MicroBatcher:
+    """그룹별 마이크로 배치 스케줄러
+
+    - 그룹의 첫 작업이 들어오면 window_ms 뒤에 배치를 보냄 (max_items가 차면 즉시)
+    - 한 호출자의 작업은 나누지 않고 같은 배치에 넣음
+    - 배치는 첫 호출자의 실행 함수로 실행하고, 결과와 토큰 사용량은 항목 수 비율로 나눔
+    - 배치 요청의 제한 시간은 남은 호출자 중 가장 이른 마감까지 (이미 마감이 지난 호출자는 제외)
+    """
+
+    def __init__(
+        self,
+        window_ms: Optional[float] = None,
+        max_items: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        self.window_sec = (micro_batch_config.window_ms if window_ms is None else window_ms) / 1000
+        self.max_items = max_items or micro_batch_config.max_items
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or micro_batch_config.workers,
+            thread_name_prefix="micro-batch"
+        )
+        self._pending: Dict[Hashable, _PendingGroup] = {}
+        self._condition = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self.stats = {"batches": 0, "callers": 0, "items": 0, "requests_saved": 0}
+
+    def submit(
+        self,
+        group: Hashable,
+        texts: List[str],
+        execute: BatchExecutor,
+        timeout: Optional[float] = None
+    ) -> Tuple[List[Any], Dict[str, Any]]:
+        """작업 묶음을 배치에 합류시키고 결과를 기다림
+
+        Args:
+            group: 호환 그룹 키 (같은 템플릿/모델/고정 변수)
+            texts: 항목 텍스트 목록 (ID는 배치에서 부여)
+            execute: 배치 실행 함수 (그룹의 첫 호출자 것이 사용됨)
+            timeout: 최대 대기 시간 (초과 시 concurrent.futures.TimeoutError)
+
+        Returns:
+            (항목별 결과, 배치 정보 {"batch_size", "callers", "usage", "response"})
+        """
+        caller = _Caller(texts, execute, timeout)
+        with self._condition:
+            self._ensure_flusher()
+            pending = self._pending.get(group)
+            if pending is None:
+                pending = self._pending[group] = _PendingGroup(time.monotonic() + self.window_sec)
+            pending.callers.append(caller)
+            if pending.item_count >= self.max_items:
+                pending.flush_at = 0.0
+            self._condition.notify()
+        return caller.future.result(timeout=timeout)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="micro-batch-flusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                now = time.monotonic()
+                due = [group for group, pending in self._pending.items() if pending.flush_at <= now]
+                if not due:
+                    next_flush = min(pending.flush_at for pending in self._pending.values())
+                    self._condition.wait(timeout=max(0.0, next_flush - now))
+                    continue
+                batches = []
+                for group in due:
+                    batches.extend(self._split(self._pending.pop(group).callers))
+            for callers in batches:
+                self._executor.submit(self._run_batch, callers)
+
+    def _split(self, callers: List[_Caller]) -> List[List[_Caller]]:
+        """호출자 단위로 max_items 이하 배치 구성 (한 호출자가 넘치면 단독 배치)"""
+        batches: List[List[_Caller]] = []
+        current: List[_Caller] = []
+        count = 0
+        for caller in callers:
+            if current and count + len(caller.texts) > self.max_items:
+                batches.append(current)
+                current, count = [], 0
+            current.append(caller)
+            count += len(caller.texts)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batch(self, callers: List[_Caller]):
+        # 기다리다 포기한 호출자의 항목은 보내지 않음
+        now = time.monotonic()
+        expired = [caller for caller in callers if caller.deadline is not None and caller.deadline <= now]
+        for caller in expired:
+            caller.future.set_exception(FutureTimeoutError("배치 실행 전에 마감 시간이 지났습니다."))
+        callers = [caller for caller in callers if caller not in expired]
+        if not callers:
+            return
+        deadlines = [caller.deadline for caller in callers if caller.deadline is not None]
+        timeout = min(deadlines) - now if deadlines else None
+
+        texts = [text for caller in callers for text in caller.texts]
+        try:
+            results, response, usage = callers[0].execute(texts, timeout)
+        except Exception as e:
+            for caller in callers:
+                caller.future.set_exception(e)
+            return
+
+        with self._condition:
+            self.stats["batches"] += 1
+            self.stats["callers"] += len(callers)
+            self.stats["items"] += len(texts)
+            self.stats["requests_saved"] += len(callers) - 1
+
+        offset = 0
+        for caller in callers:
+            size = len(caller.texts)
+            share = size / len(texts) if texts else 0.0
+            caller.future.set_result((results[offset:offset + size], {
+                "batch_size": len(texts),
+                "callers": len(callers),
+                "usage": {key: round(value * share) for key, value in usage.items()},
+                # 배치 전체 응답(요약 등)은 호출자가 혼자인 경우에만 해당 호출자의 것
+                "response": response if len(callers) == 1 else {},
+            }))
+            offset += size
+
+    def summary(self) -> Dict[str, Any]:
+        """배치 통계 (배치당 평균 호출자 수 = 절약한 요청 비율)"""
+        with self._condition:
+            stats = dict(self.stats)
+        stats["avg_callers"] = stats["callers"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+
+# 전역 인스턴스 (모든 Agent와 분석 요청이 공유)
+micro_batcher = MicroBatcher()
@@ -0,0 +1,242 @@
+"""
+ContractGuard AI - LLM/임베딩 호출 스케줄러 모듈
+모든 Azure OpenAI 호출을 우선순위 등급(상담 > 분석 > 일괄 처리)과 사용자별 가중 공정 큐(WFQ)로
+동시 실행 슬롯에 배정하고, 대기열 길이 기반 수용 제어와 대기 시간 지표를 제공
+"""
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from config.settings import scheduler_config
+from utils.deadline import time_left
+
+
+# 우선순위 등급 (앞일수록 먼저 배정)
+PRIORITY_CLASSES = ("chat", "analysis", "batch")
+DEFAULT_CLASS = "analysis"
+DEFAULT_TENANT = "default"
+
+# 현재 작업의 (우선순위 등급, 사용자/테넌트) - 스레드·비동기 컨텍스트별로 분리
+_current_workload: contextvars.ContextVar = contextvars.ContextVar(
+    "current_workload", default=(DEFAULT_CLASS, DEFAULT_TENANT)
+)
+
+
+class SchedulerOverloaded(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음 (호출자가 나중에 재시도)"""
+
+
+@contextmanager
+def workload(priority: str, tenant: Optional[str] = None) -> Iterator[None]:
+    """이 블록 안의 LLM/임베딩 호출에 우선순위 등급과 테넌트 지정"""
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"알 수 없는 우선순위 등급: {priority}")
+    token = _current_workload.set((priority, tenant or DEFAULT_TENANT))
+    try:
+        yield
+    finally:
+        _current_workload.reset(token)
+
+
+def current_workload() -> Tuple[str, str]:
+    """현재 (우선순위 등급, 테넌트)"""
+    return _current_workload.get()
+
+
+class _Waiter:
+    """슬롯을 기다리는 호출 하나"""
+
+    def __init__(self, priority: str, tenant: str, start_tag: float, finish_tag: float):
+        self.priority = priority
+        self.tenant = tenant
+        self.start_tag = start_tag
+        self.finish_tag = finish_tag
+        self.enqueued_at = time.perf_counter()
+        self.granted = threading.Event()
+        self.cancelled = False
+
+
+class _ClassQueue:
+    """우선순위 등급 하나의 WFQ 대기열 (가상 완료 시각이 가장 이른 호출부터)"""
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, _Waiter]] = []
+        self.depth = 0
+        self.virtual_time = 0.0
+        self.last_finish: Dict[str, float] = {}
+
+
+class PriorityScheduler:
+    """우선순위 + 가중 공정 큐 기반 동시 실행 슬롯 배정기
+
+    - 빈 슬롯은 항상 높은 등급의 대기 호출부터 배정 (같은 등급 안에서는 테넌트별 WFQ)
+    - 일괄 처리 등급은 전체 슬롯 중 batch_max_share 이하만 사용 (대화형 요청용 여유 확보)
+    - 등급별 대기열이 queue_limits에 도달하면 즉시 SchedulerOverloaded (역압)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        batch_max_share: Optional[float] = None,
+        queue_limits: Optional[Dict[str, int]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None
+    ):
+        self.max_concurrent = max_concurrent or scheduler_config.max_concurrent
+        share = scheduler_config.batch_max_share if batch_max_share is None else batch_max_share
+        self.batch_limit = max(1, int(self.max_concurrent * share))
+        self.queue_limits = queue_limits or dict(scheduler_config.queue_limits)
+        self.tenant_weights = tenant_weights or dict(scheduler_config.tenant_weights)
+
+        self._lock = threading.Lock()
+        self._queues = {priority: _ClassQueue() for priority in PRIORITY_CLASSES}
+        self._in_flight = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._seq = itertools.count()
+        self._waits = {priority: deque(maxlen=scheduler_config.metrics_window) for priority in PRIORITY_CLASSES}
+        self._counters = {
+            priority: {"granted": 0, "rejected": 0, "timed_out": 0} for priority in PRIORITY_CLASSES
+        }
+        self._resources: Dict[str, int] = {}
+
+    @contextmanager
+    def slot(self, resource: str = "llm", cost: float = 1.0, timeout: Optional[float] = None) -> Iterator[float]:
+        """호출 슬롯 확보 (블록 동안 점유, 대기 시간(초)을 반환)
+
+        Args:
+            resource: 지표용 호출 종류 ("llm", "embedding")
+            cost: WFQ 비용 (같은 등급 안에서 테넌트 간 공정성 계산에 사용)
+            timeout: 최대 대기 시간 (초과 시 TimeoutError)
+        """
+        if not scheduler_config.enabled:
+            yield 0.0
+            return
+
+        priority, tenant = current_workload()
+        waiter = self._enqueue(priority, tenant, cost)
+        if not waiter.granted.wait(timeout=None if timeout is None else max(0.0, timeout)):
+            with self._lock:
+                if not waiter.granted.is_set():
+                    waiter.cancelled = True
+                    self._queues[priority].depth -= 1
+                    self._counters[priority]["timed_out"] += 1
+                    raise TimeoutError(f"LLM 호출 슬롯 대기 시간 초과 ({priority})")
+
+        wait = time.perf_counter() - waiter.enqueued_at
+        with self._lock:
+            self._waits[priority].append(wait)
+            self._resources[resource] = self._resources.get(resource, 0) + 1
+        try:
+            yield wait
+        finally:
+            self._release(priority)
+
+    def _enqueue(self, priority: str, tenant: str, cost: float) -> _Waiter:
+        with self._lock:
+            queue = self._queues[priority]
+            if queue.depth >= self.queue_limits.get(priority, 0):
+                self._counters[priority]["rejected"] += 1
+                raise SchedulerOverloaded(
+                    f"요청이 많아 잠시 후 다시 시도해 주세요. ({priority} 대기열 {queue.depth}건)"
+                )
+            # 테넌트별 가상 시작/완료 시각 (가중치가 클수록 더 자주 배정)
+            start = max(queue.virtual_time, queue.last_finish.get(tenant, 0.0))
+            finish = start + cost / self.tenant_weights.get(tenant, 1.0)
+            queue.last_finish[tenant] = finish
+
+            waiter = _Waiter(priority, tenant, start, finish)
+            heapq.heappush(queue.heap, (finish, next(self._seq), waiter))
+            queue.depth += 1
+            self._dispatch_locked()
+            return waiter
+
+    def _release(self, priority: str):
+        with self._lock:
+            self._in_flight[priority] -= 1
+            self._dispatch_locked()
+
+    def _dispatch_locked(self):
+        """빈 슬롯을 높은 등급부터 WFQ 순서로 배정"""
+        while sum(self._in_flight.values()) < self.max_concurrent:
+            waiter = self._next_waiter_locked()
+            if waiter is None:
+                return
+            queue = self._queues[waiter.priority]
+            queue.depth -= 1
+            queue.virtual_time = max(queue.virtual_time, waiter.start_tag)
+            self._in_flight[waiter.priority] += 1
+            self._counters[waiter.priority]["granted"] += 1
+            waiter.granted.set()
+
+    def _next_waiter_locked(self) -> Optional[_Waiter]:
+        for priority in PRIORITY_CLASSES:
+            if priority == "batch" and self._in_flight["batch"] >= self.batch_limit:
+                continue
+            heap = self._queues[priority].heap
+            while heap:
+                _, _, waiter = heapq.heappop(heap)
+                if not waiter.cancelled:
+                    return waiter
+        return None
+
+    def queue_depth(self, priority: str) -> int:
+        """등급별 현재 대기 호출 수 (일괄 작업 생산자의 역압 판단용)"""
+        with self._lock:
+            return self._queues[priority].depth
+
+    def wait_for_capacity(self, priority: str = "batch", max_depth: Optional[int] = None, poll_sec: float = 0.2):
+        """대기열이 max_depth(기본: 한도의 절반) 아래로 줄 때까지 대기 (일괄 작업 투입 속도 조절)"""
+        max_depth = self.queue_limits.get(priority, 0) // 2 if max_depth is None else max_depth
+        while self.queue_depth(priority) > max_depth:
+            time.sleep(poll_sec)
+
+    def summary(self) -> Dict[str, Any]:
+        """등급별 대기 시간(p50/p95), 대기열 길이, 실행 중, 배정/거절/시간 초과 수"""
+        with self._lock:
+            classes = {}
+            for priority in PRIORITY_CLASSES:
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    "queued": self._queues[priority].depth,
+                    "in_flight": self._in_flight[priority],
+                    **self._counters[priority],
+                    "wait_p50_ms": waits[len(waits) // 2] * 1000 if waits else 0.0,
+                    "wait_p95_ms": waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000 if waits else 0.0,
+                }
+            return {
+                "max_concurrent": self.max_concurrent,
+                "batch_limit": self.batch_limit,
+                "classes": classes,
+                "resources": dict(self._resources),
+            }
+
+
+# 전역 인스턴스 (프로세스 내 모든 Agent/임베딩 호출이 공유)
+llm_scheduler = PriorityScheduler()
+
+
+class ScheduledEmbeddings(Embeddings):
+    """임베딩 호출을 스케줄러 슬롯 안에서 실행하는 래퍼"""
+
+    def __init__(self, embeddings: Embeddings, scheduler: Optional[PriorityScheduler] = None):
+        self.embeddings = embeddings
+        self.scheduler = scheduler or llm_scheduler
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self.scheduler.slot("embedding", cost=max(1.0, len(texts) / 16), timeout=time_left()):
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self.scheduler.slot("embedding", timeout=time_left()):
+            return self.embeddings.embed_query(text)
+
+    def __getattr__(self, name: str) -> Any:
+        # 래핑한 클라이언트의 나머지 속성은 그대로 노출
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
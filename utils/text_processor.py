@@ -6,6 +6,35 @@ import re
 from typing import List, Dict
 
 
+# 리스크 심각도별 점수 가중치
+SEVERITY_WEIGHTS = {"상": 30, "중": 15, "하": 5}
+
+# 결정적 리스크 지표 (지표 문자열, 설명, 심각도) - 리스크 평가 도구와 일괄 스크리닝이 공유
+DAMAGE_RISK_INDICATORS = [
+    ("무제한", "손해배상 한도 없음 - 고위험", "상"),
+    ("간접손해", "간접손해 포함 - 주의 필요", "중"),
+    ("특별손해", "특별손해 포함 - 주의 필요", "중"),
+    ("예정액", "위약금 예정액 확인 필요", "하"),
+]
+TERMINATION_RISK_INDICATORS = [
+    ("일방적", "일방적 해지권 - 주의 필요", "중"),
+    ("즉시", "즉시 해지 가능 - 고위험", "상"),
+    ("사전 통지 없이", "사전 통지 없는 해지 - 고위험", "상"),
+]
+
+# 계약 유형 식별 키워드 (먼저 나온 유형 우선)
+CONTRACT_TYPE_KEYWORDS = {
+    "용역계약": ["용역", "서비스 제공", "업무 수행"],
+    "임대차계약": ["임대", "임차", "보증금", "월세", "전세"],
+    "비밀유지계약(NDA)": ["비밀유지", "기밀", "confidential", "nda"],
+    "근로계약": ["근로", "급여", "연봉", "고용"],
+    "매매계약": ["매매", "매도", "매수", "대금"],
+    "도급계약": ["도급", "시공", "공사"],
+    "라이선스계약": ["라이선스", "license", "사용권", "저작권"],
+    "투자계약": ["투자", "지분", "주식", "출자"],
+}
+
+
 class TextProcessor:
     """텍스트 전처리기"""
     
@@ -65,18 +94,7 @@ class TextProcessor:
         """계약서 유형 식별"""
         text_lower = text.lower()
         
-        type_keywords = {
-            "용역계약": ["용역", "서비스 제공", "업무 수행"],
-            "임대차계약": ["임대", "임차", "보증금", "월세", "전세"],
-            "비밀유지계약(NDA)": ["비밀유지", "기밀", "confidential", "nda"],
-            "근로계약": ["근로", "급여", "연봉", "고용"],
-            "매매계약": ["매매", "매도", "매수", "대금"],
-            "도급계약": ["도급", "시공", "공사"],
-            "라이선스계약": ["라이선스", "license", "사용권", "저작권"],
-            "투자계약": ["투자", "지분", "주식", "출자"],
-        }
-        
-        for contract_type, keywords in type_keywords.items():
+        for contract_type, keywords in CONTRACT_TYPE_KEYWORDS.items():
             for keyword in keywords:
                 if keyword in text_lower:
                     return contract_type
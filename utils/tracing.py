@@ -0,0 +1,224 @@
+"""
+ContractGuard AI - 트레이싱 모듈
+워크플로우 노드, LLM 호출, 검색, 문서 로드 구간별 지연시간/토큰/비용 기록
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import trace_config
+
+
+# 현재 실행 중인 트레이스/스팬 (스레드·비동기 컨텍스트별로 분리)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """토큰 사용량 기반 예상 비용(USD) 계산"""
+    price = trace_config.pricing.get(model)
+    if not price:
+        return 0.0
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * price["input"]
+        + cached_tokens * price.get("cached_input", price["input"])
+        + completion_tokens * price.get("output", 0.0)
+    ) / 1_000_000
+
+
+class Span:
+    """트레이스 구간"""
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = {}
+
+    @property
+    def duration(self) -> float:
+        """구간 소요시간(초)"""
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes):
+        """속성 기록"""
+        self.attributes.update(attributes)
+
+    def record_usage(self, model: str, usage: Dict[str, int]):
+        """LLM 토큰 사용량 및 예상 비용 기록"""
+        self.set(
+            model=model,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            cached_tokens=usage.get("cached_tokens", 0),
+            cost_usd=estimate_cost(
+                model,
+                usage.get("prompt_tokens", 0),
+                usage.get("completion_tokens", 0),
+                usage.get("cached_tokens", 0),
+            ),
+        )
+
+    def to_otel(self) -> Dict[str, Any]:
+        """OpenTelemetry(OTLP JSON) 호환 형식으로 변환"""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """단일 분석 요청의 스팬 모음"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.start_ns = time.time_ns()
+        self.spans: List[Span] = []
+        # 최상위 구간 (노드와 병렬로 실행되는 백그라운드 작업의 부모)
+        self.root: Optional[Span] = None
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Any]:
+        """성능 요약 (타임라인, 노드별 소요시간, 토큰, 비용)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+
+        llm_spans = [s for s in spans if s.kind == "llm"]
+        totals = {
+            key: sum(s.attributes.get(key, 0) for s in llm_spans)
+            for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "cost_usd")
+        }
+        end_ns = max((s.end_ns or time.time_ns() for s in spans), default=self.start_ns)
+
+        return {
+            "trace_id": self.trace_id,
+            "total_latency": (end_ns - self.start_ns) / 1e9,
+            "llm_calls": len(llm_spans),
+            "cache_hits": sum(1 for s in llm_spans if s.attributes.get("cached_tokens")),
+            # 공용 HTTP 풀에서 새로 연결한 횟수와 연결 수립(TCP+TLS) 누적 시간
+            "new_connections": sum(s.attributes.get("new_connections", 0) for s in spans),
+            "connect_ms": round(sum(s.attributes.get("connect_ms", 0.0) for s in spans), 2),
+            **totals,
+            "nodes": {s.name: round(s.duration, 3) for s in spans if s.kind == "node"},
+            "spans": [
+                {
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "name": s.name,
+                    "kind": s.kind,
+                    "start": round((s.start_ns - self.start_ns) / 1e9, 3),
+                    "duration": round(s.duration, 3),
+                    "status": s.status,
+                    "attributes": s.attributes,
+                }
+                for s in spans
+            ],
+        }
+
+
+class Tracer:
+    """스팬 생성 및 JSONL 내보내기"""
+
+    def __init__(self, export_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        self.export_dir = export_dir or trace_config.export_dir
+        self.enabled = trace_config.enabled if enabled is None else enabled
+        self._export_lock = threading.Lock()
+
+    @contextmanager
+    def start_trace(self, name: str) -> Iterator[Trace]:
+        """트레이스 시작 (이미 진행 중이면 기존 트레이스에 합류)"""
+        trace = _current_trace.get()
+        if trace is not None:
+            with self.span(name, kind="internal"):
+                yield trace
+            return
+
+        trace = Trace(name)
+        token = _current_trace.set(trace)
+        try:
+            with self.span(name, kind="root") as root:
+                trace.root = root
+                yield trace
+        finally:
+            _current_trace.reset(token)
+            self.export(trace)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", parent: Optional[Span] = None, **attributes) -> Iterator[Span]:
+        """구간 측정 (트레이스 밖에서는 기록만 하고 내보내지 않음)
+
+        parent: 부모 구간 (기본값: 현재 구간)
+        """
+        trace = _current_trace.get()
+        parent = parent or _current_span.get()
+        span = Span(
+            name,
+            kind,
+            trace.trace_id if trace else uuid.uuid4().hex,
+            parent.span_id if parent else None,
+        )
+        span.set(**attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.set(error=str(e))
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            if trace is not None:
+                trace.add(span)
+
+    def current_trace(self) -> Optional[Trace]:
+        """현재 트레이스 반환"""
+        return _current_trace.get()
+
+    def current_span(self) -> Optional[Span]:
+        """현재 스팬 반환 (스팬 밖이면 None)"""
+        return _current_span.get()
+
+    def export(self, trace: Trace):
+        """트레이스를 일자별 JSONL 파일로 내보내기"""
+        if not self.enabled or not trace.spans:
+            return
+        try:
+            os.makedirs(self.export_dir, exist_ok=True)
+            path = os.path.join(
+                self.export_dir, f"traces-{datetime.now().strftime('%Y%m%d')}.jsonl"
+            )
+            lines = [json.dumps(s.to_otel(), ensure_ascii=False) for s in trace.spans]
+            with self._export_lock, open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"⚠️ 트레이스 내보내기 실패: {e}")
+
+
+# 전역 트레이서 인스턴스
+tracer = Tracer()